@@ -0,0 +1,82 @@
+import argparse
+from time import perf_counter
+
+import numpy as np
+import polars as pl
+
+from bundestag.ml.vote_prediction import kfold_splitter, poll_splitter
+
+
+def make_votes(n_rows: int, n_polls: int, seed: int = 42) -> pl.DataFrame:
+    """Creates random vote rows, each belonging to one of `n_polls` polls.
+
+    Args:
+        n_rows (int): Number of rows.
+        n_polls (int): Number of distinct polls.
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        pl.DataFrame: Frame with a "poll_id" column.
+    """
+    rng = np.random.default_rng(seed)
+    return pl.DataFrame({"poll_id": rng.integers(0, n_polls, size=n_rows)})
+
+
+def list_poll_splitter(
+    df: pl.DataFrame, poll_col: str = "poll_id", valid_pct: float = 0.2, seed: int = 42
+) -> tuple[list[int], list[int]]:
+    """The previous `poll_splitter`, building Python index lists, for comparison."""
+    polls = df[poll_col].unique()
+    n = len(polls)
+    rng = np.random.RandomState(seed)
+    polls1 = rng.choice(polls, size=int(n * valid_pct))
+    df = df.with_columns(
+        **{"is validation set": pl.col(poll_col).is_in(list(polls1))}
+    ).with_row_index(name="index")
+    ix0 = df.filter(pl.col("is validation set").not_())["index"].to_list()
+    ix1 = df.filter(pl.col("is validation set"))["index"].to_list()
+    rng.shuffle(ix0)
+    rng.shuffle(ix1)
+    return (ix0, ix1)
+
+
+def main():
+    """Times `poll_splitter`, `kfold_splitter` and the previous list based splitter.
+
+    The list based splitter is only timed on a subsample and extrapolated, since
+    shuffling 50M element Python lists takes minutes and several GB of memory.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-rows", type=int, default=50_000_000)
+    parser.add_argument("--n-rows-lists", type=int, default=1_000_000)
+    parser.add_argument("--n-polls", type=int, default=5_000)
+    args = parser.parse_args()
+
+    df = make_votes(args.n_rows, args.n_polls)
+
+    t0 = perf_counter()
+    poll_splitter(df, seed=42)
+    dt_arrays = perf_counter() - t0
+    print(f"poll_splitter: {args.n_rows:_} rows in {dt_arrays:.2f} s")
+
+    t0 = perf_counter()
+    for _ in kfold_splitter(df, n_splits=5, seed=42):
+        pass
+    print(
+        f"kfold_splitter (5 folds): {args.n_rows:_} rows in {perf_counter() - t0:.2f} s"
+    )
+
+    sub = df.head(args.n_rows_lists)
+    t0 = perf_counter()
+    list_poll_splitter(sub)
+    dt_lists = perf_counter() - t0
+    dt_lists_full = dt_lists * args.n_rows / len(sub)
+    print(
+        f"list based: {len(sub):_} rows in {dt_lists:.2f} s, "
+        f"~{dt_lists_full:.0f} s extrapolated to {args.n_rows:_} rows "
+        f"(speedup ~{dt_lists_full / dt_arrays:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
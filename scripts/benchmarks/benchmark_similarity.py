@@ -0,0 +1,70 @@
+import argparse
+from time import perf_counter
+
+import numpy as np
+import polars as pl
+
+import bundestag.data.transform.bundestag_sheets as transform_bs
+from bundestag.ml.similarity import compute_similarity, cosine_similarity
+
+
+def make_aligned_votes(n_rows: int, seed: int = 42) -> pl.DataFrame:
+    """Creates random MdB one-hot votes aligned with random party vote fractions.
+
+    Args:
+        n_rows (int): Number of rows.
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        pl.DataFrame: Frame with the vote columns and their `_party` counterparts.
+    """
+    rng = np.random.default_rng(seed)
+    n_cols = len(transform_bs.VOTE_COLS)
+    one_hot = np.eye(n_cols, dtype=np.int64)[rng.integers(0, n_cols, size=n_rows)]
+    fractions = rng.dirichlet(np.ones(n_cols), size=n_rows)
+    return pl.DataFrame(
+        {
+            **{c: one_hot[:, i] for i, c in enumerate(transform_bs.VOTE_COLS)},
+            **{
+                f"{c}_party": fractions[:, i]
+                for i, c in enumerate(transform_bs.VOTE_COLS)
+            },
+        }
+    )
+
+
+def main():
+    """Times `compute_similarity` with the vectorised default and the scalar per-row metric.
+
+    The per-row metric is only timed on a subsample and extrapolated, since running it on
+    10M rows takes several minutes.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-rows", type=int, default=10_000_000)
+    parser.add_argument("--n-rows-scalar", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = make_aligned_votes(args.n_rows)
+
+    t0 = perf_counter()
+    compute_similarity(df, suffix="_party")
+    dt_vectorised = perf_counter() - t0
+    print(f"vectorised: {args.n_rows:_} rows in {dt_vectorised:.2f} s")
+
+    def scalar_cosine_similarity(a, b):
+        return cosine_similarity(a, b)
+
+    sub = df.head(args.n_rows_scalar)
+    t0 = perf_counter()
+    compute_similarity(sub, suffix="_party", similarity_metric=scalar_cosine_similarity)
+    dt_scalar = perf_counter() - t0
+    dt_scalar_full = dt_scalar * args.n_rows / len(sub)
+    print(
+        f"per row: {len(sub):_} rows in {dt_scalar:.2f} s, "
+        f"~{dt_scalar_full:.0f} s extrapolated to {args.n_rows:_} rows "
+        f"(speedup ~{dt_scalar_full / dt_vectorised:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
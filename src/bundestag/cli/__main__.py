@@ -8,6 +8,8 @@ The main purpose of this CLI is to provide tools for:
 
 1.  **Downloading**: Fetching raw data related to parliamentary proceedings.
 2.  **Transforming**: Processing the raw data into a clean, usable format.
+3.  **Similarity**: Computing voting similarity reports from the transformed data.
+4.  **Predicting**: Running trained models in batch, e.g. to predict votes.
 
 ## Structure
 
@@ -16,6 +18,8 @@ The main sub-commands are:
 
 -   `download`: Contains commands to download data from different sources like `abgeordnetenwatch.de` and `bundestag.de`.
 -   `transform`: Contains commands to transform the downloaded raw data into a structured format.
+-   `similarity`: Contains commands to compute voting similarity reports, e.g. of all MdBs with all parties.
+-   `predict`: Contains commands to run trained models in batch, e.g. to predict votes with an exported learner.
 
 ## Usage
 
@@ -37,6 +41,8 @@ import logging
 import typer
 
 from bundestag.cli.download import app as download_app
+from bundestag.cli.predict import app as predict_app
+from bundestag.cli.similarity import app as similarity_app
 from bundestag.cli.transform import app as transform_app
 from bundestag.fine_logging import setup_logging
 
@@ -45,6 +51,8 @@ logger = logging.getLogger(__name__)
 app = typer.Typer()
 app.add_typer(download_app, name="download")
 app.add_typer(transform_app, name="transform")
+app.add_typer(similarity_app, name="similarity")
+app.add_typer(predict_app, name="predict")
 
 
 @app.callback(invoke_without_command=True)
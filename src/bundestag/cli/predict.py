@@ -0,0 +1,67 @@
+"""
+# Predict CLI
+
+This module provides CLI commands to run trained models in batch, without a notebook.
+"""
+
+import logging
+from pathlib import Path
+
+import typer
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer()
+
+
+@app.command(help="Predict votes with an exported fastai learner.")
+def votes(
+    model: Path = typer.Option(..., help="Learner exported with `learn.export`."),
+    input_file: Path = typer.Option(
+        ..., "--input", help="Votes Parquet file with the learner's feature columns."
+    ),
+    output_file: Path = typer.Option(
+        ..., "--output", help="Parquet file to write the predictions to."
+    ),
+    chunk_size: int = typer.Option(
+        100_000, help="Number of rows read and predicted at a time."
+    ),
+    batch_size: int = typer.Option(1024, help="Number of rows per forward pass."),
+    n_threads: int | None = typer.Option(
+        None, help="Number of torch threads. Defaults to the torch default."
+    ),
+    y_col: str = typer.Option("vote", help="Name of the target variable."),
+    keep_col: list[str] | None = typer.Option(
+        None,
+        help="Input column copied to the output, can be passed multiple times. Defaults to all.",
+    ),
+):
+    """Stream a votes Parquet file through an exported learner on the CPU and write
+    the predicted votes and class probabilities to Parquet.
+
+    Args:
+        model (Path): The exported learner.
+        input_file (Path): The votes Parquet file.
+        output_file (Path): The predictions Parquet file.
+        chunk_size (int, optional): Number of rows read and predicted at a time. Defaults to 100_000.
+        batch_size (int, optional): Number of rows per forward pass. Defaults to 1024.
+        n_threads (int | None, optional): Number of torch threads. Defaults to None.
+        y_col (str, optional): Name of the target variable. Defaults to "vote".
+        keep_col (list[str] | None, optional): Input columns copied to the output. Defaults to None (all).
+
+    Examples:
+        `bundestag predict votes --model export.pkl --input votes.parquet --output predictions.parquet --n-threads 4`
+    """
+    # the ml dependencies are optional, only import them when needed
+    from bundestag.ml.vote_prediction import load_learner, predict_votes_parquet
+
+    learn = load_learner(model, n_threads=n_threads)
+    predict_votes_parquet(
+        learn,
+        input_file,
+        output_file,
+        chunk_size=chunk_size,
+        batch_size=batch_size,
+        y_col=y_col,
+        keep_cols=keep_col or None,
+    )
@@ -0,0 +1,95 @@
+"""
+# Similarity CLI
+
+This module provides CLI commands to compute voting similarity reports.
+"""
+
+import logging
+from pathlib import Path
+
+import polars as pl
+import typer
+
+import bundestag.paths as paths
+from bundestag.cli.utils import OPTION_DATA_PATH, OPTION_DRY
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer()
+
+
+@app.command(help="Compute the similarity of every MdB with every party.")
+def mdb_party(
+    dry: bool = OPTION_DRY,
+    data_path: str = OPTION_DATA_PATH,
+    output: Path | None = typer.Option(
+        None,
+        help="Output Parquet file. Defaults to mdb_party_similarity.parquet next to the transformed bundestag.de votes.",
+    ),
+):
+    """Compute the similarity of every MdB with every party from the transformed bundestag.de votes.
+
+    Args:
+        dry (bool, optional): If `True`, don't write the report. Defaults to False.
+        data_path (str, optional): The path to the data directory. Defaults to "data".
+        output (Path | None, optional): The output Parquet file. Defaults to None.
+
+    Examples:
+        `bundestag similarity mdb-party`
+    """
+    # the ml dependencies are optional, only import them when needed
+    from bundestag.ml.similarity import get_mdb_party_similarity
+
+    _paths = paths.get_paths(data_path)
+    file = _paths.preprocessed_bundestag / "bundestag.de_votes.parquet"
+    if output is None:
+        output = _paths.preprocessed_bundestag / "mdb_party_similarity.parquet"
+
+    logger.info(f"Reading {file}")
+    df = get_mdb_party_similarity(pl.read_parquet(file))
+
+    if not dry:
+        logger.info(f"Writing {len(df)} rows to {output}")
+        df.write_parquet(output)
+
+
+@app.command(help="Render similarity report images of MdBs with all parties.")
+def mdb_reports(
+    data_path: str = OPTION_DATA_PATH,
+    output_dir: Path | None = typer.Option(
+        None,
+        help="Image cache directory. Defaults to mdb_reports next to the transformed bundestag.de votes.",
+    ),
+    mdb: list[str] | None = typer.Option(
+        None, help="MdB to render, can be passed multiple times. Defaults to all."
+    ),
+    n_jobs: int | None = typer.Option(
+        None, help="Number of rendering processes. Defaults to the number of CPUs."
+    ),
+    dpi: int = typer.Option(100, help="Image resolution."),
+):
+    """Render one similarity report image per MdB, without a notebook.
+
+    Images which are already in the cache are not rendered again.
+
+    Args:
+        data_path (str, optional): The path to the data directory. Defaults to "data".
+        output_dir (Path | None, optional): The image cache directory. Defaults to None.
+        mdb (list[str] | None, optional): The MdBs to render. Defaults to None (all).
+        n_jobs (int | None, optional): Number of rendering processes. Defaults to None.
+        dpi (int, optional): Image resolution. Defaults to 100.
+
+    Examples:
+        `bundestag similarity mdb-reports --n-jobs 8`
+    """
+    # the ml dependencies are optional, only import them when needed
+    from bundestag.ml.render import get_mdb_render_jobs, render_jobs
+
+    _paths = paths.get_paths(data_path)
+    file = _paths.preprocessed_bundestag / "bundestag.de_votes.parquet"
+    if output_dir is None:
+        output_dir = _paths.preprocessed_bundestag / "mdb_reports"
+
+    logger.info(f"Reading {file}")
+    jobs = get_mdb_render_jobs(pl.read_parquet(file), mdbs=mdb or None)
+    render_jobs(jobs, output_dir, n_jobs=n_jobs, dpi=dpi)
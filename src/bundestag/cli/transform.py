@@ -10,6 +10,18 @@ import typer
 
 import bundestag.paths as paths
 from bundestag.cli.utils import ARGUMENT_LEGISLATURE_ID, OPTION_DATA_PATH, OPTION_DRY
+from bundestag.data.transform.abgeordnetenwatch.compact import (
+    OutputProfileEnum,
+    load_polls_data,
+)
+from bundestag.data.transform.abgeordnetenwatch.dimension import (
+    build_mandates_dimension as _build_mandates_dimension,
+)
+from bundestag.data.transform.abgeordnetenwatch.transform import (
+    DEFAULT_VOTES_FORMATS,
+    VotesFormatEnum,
+    get_polls_parquet_path,
+)
 from bundestag.data.transform.abgeordnetenwatch.transform import (
     run as _transform_abgeordnetenwatch,
 )
@@ -57,6 +69,18 @@ def abgeordnetenwatch_data(
     legislature_id: int = ARGUMENT_LEGISLATURE_ID,
     dry: bool = OPTION_DRY,
     data_path: str = OPTION_DATA_PATH,
+    force: bool = typer.Option(
+        False,
+        help="Re-run all transformation steps, even if their raw inputs did not change.",
+    ),
+    votes_format: list[VotesFormatEnum] = typer.Option(
+        list(DEFAULT_VOTES_FORMATS),
+        help=f"Output format(s) of the votes data, can be passed multiple times. Options: {[k.value for k in VotesFormatEnum]}",
+    ),
+    profile: OutputProfileEnum = typer.Option(
+        OutputProfileEnum.default,
+        help="Output profile. 'compact' stores Int32 ids, Date dates, Enum votes and Categorical labels.",
+    ),
 ):
     """Transform abgeordnetenwatch data.
 
@@ -64,10 +88,16 @@ def abgeordnetenwatch_data(
         legislature_id (int): The ID of the legislature to transform data for. Defaults to 111.
         dry (bool, optional): If `True`, don't actually perform the transformation. Defaults to False.
         data_path (str, optional): The path to the data directory. Defaults to "data".
+        force (bool, optional): If `True`, ignore the build state and re-run all steps. Defaults to False.
+        votes_format (list[VotesFormatEnum], optional): Output formats of the votes data. Defaults to parquet and csv.
+        profile (OutputProfileEnum, optional): Output profile of the preprocessed files. Defaults to OutputProfileEnum.default.
 
     Examples:
         To transform data for legislature 161:
         `bundestag transform abgeordnetenwatch-data 161`
+
+        To only write the votes as parquet:
+        `bundestag transform abgeordnetenwatch-data 161 --votes-format parquet`
     """
     _paths = paths.get_paths(data_path)
 
@@ -76,4 +106,77 @@ def abgeordnetenwatch_data(
         raw_path=_paths.raw_abgeordnetenwatch,
         preprocessed_path=_paths.preprocessed_abgeordnetenwatch,
         dry=dry,
+        force=force,
+        votes_formats=votes_format,
+        profile=profile,
     )
+
+
+@app.command(help="Rebuild the cross-legislature mandates dimension table.")
+def mandates_dimension(
+    dry: bool = OPTION_DRY,
+    data_path: str = OPTION_DATA_PATH,
+):
+    """Rebuild the cross-legislature mandates dimension table from all transformed abgeordnetenwatch mandates.
+
+    `abgeordnetenwatch-data` already upserts each transformed legislature, so this is only needed to rebuild the table from scratch.
+
+    Args:
+        dry (bool, optional): If `True`, don't write the table. Defaults to False.
+        data_path (str, optional): The path to the data directory. Defaults to "data".
+
+    Examples:
+        `bundestag transform mandates-dimension`
+    """
+    _paths = paths.get_paths(data_path)
+
+    _build_mandates_dimension(_paths.preprocessed_abgeordnetenwatch, dry=dry)
+
+
+@app.command(help="Clean abgeordnetenwatch poll texts with spaCy and cache them.")
+def poll_texts(
+    legislature_id: int = ARGUMENT_LEGISLATURE_ID,
+    data_path: str = OPTION_DATA_PATH,
+    column: list[str] = typer.Option(
+        ["poll_title", "poll_description"],
+        help="Text column(s) to clean, can be passed multiple times.",
+    ),
+    language: str = typer.Option("de_core_news_sm", help="spaCy model to use."),
+    batch_size: int = typer.Option(256, help="Number of texts per spaCy batch."),
+    n_process: int = typer.Option(1, help="Number of spaCy processes."),
+):
+    """Warm the cache of cleaned poll texts, so later `SpacyTransformer.clean_texts_cached` calls only process new or changed polls.
+
+    Args:
+        legislature_id (int): The ID of the legislature whose polls are cleaned. Defaults to 111.
+        data_path (str, optional): The path to the data directory. Defaults to "data".
+        column (list[str], optional): The text columns to clean. Defaults to poll_title and poll_description.
+        language (str, optional): The spaCy model. Defaults to "de_core_news_sm".
+        batch_size (int, optional): Number of texts per spaCy batch. Defaults to 256.
+        n_process (int, optional): Number of spaCy processes. Defaults to 1.
+
+    Examples:
+        `bundestag transform poll-texts 161`
+    """
+    # the ml dependencies are optional, only import them when needed
+    from bundestag.ml.poll_clustering import (
+        SpacyTransformer,
+        get_cleaned_texts_cache_path,
+    )
+
+    _paths = paths.get_paths(data_path)
+    preprocessed_path = _paths.preprocessed_abgeordnetenwatch
+    df = load_polls_data(
+        get_polls_parquet_path(legislature_id, preprocessed_path),
+        profile=OutputProfileEnum.default,
+    )
+
+    st = SpacyTransformer(language=language)
+    for col in column:
+        st.clean_texts_cached(
+            df,
+            col,
+            get_cleaned_texts_cache_path(preprocessed_path),
+            batch_size=batch_size,
+            n_process=n_process,
+        )
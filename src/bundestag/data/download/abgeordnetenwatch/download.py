@@ -4,7 +4,6 @@ from enum import StrEnum
 from pathlib import Path
 from time import perf_counter
 
-from scipy import stats
 from tqdm import tqdm
 
 from bundestag.data.download.abgeordnetenwatch.cli import get_user_download_decision
@@ -63,6 +62,9 @@ def request_and_store_poll_ids(
         timeout (float, optional): The timeout for the HTTP requests. Defaults to 42.0.
     """
 
+    # scipy is slow to import, only pay for it when downloading
+    from scipy import stats
+
     dt_rv = stats.norm(scale=dt_rv_scale)
 
     logger.info(
@@ -0,0 +1,165 @@
+import hashlib
+import logging
+from pathlib import Path
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class FileFingerprint(BaseModel):
+    mtime: float
+    size: int
+    sha256: str
+
+
+class ArtifactState(BaseModel):
+    inputs: dict[str, FileFingerprint] = {}
+
+
+class BuildState(BaseModel):
+    legislature_id: int
+    profile: str = "default"
+    artifacts: dict[str, ArtifactState] = {}
+
+
+def get_build_state_path(legislature_id: int, preprocessed_path: Path) -> Path:
+    """Constructs the file path for the build state JSON file.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        Path: The full path to the build state JSON file.
+    """
+    return preprocessed_path / f"build_state_{legislature_id}.json"
+
+
+def compute_sha256(file: Path, chunk_size: int = 1 << 20) -> str:
+    """Computes the sha256 hex digest of a file, reading it in chunks.
+
+    Args:
+        file (Path): The file to hash.
+        chunk_size (int, optional): Number of bytes read per chunk. Defaults to 1 MiB.
+
+    Returns:
+        str: The hex digest.
+    """
+    h = hashlib.sha256()
+    with open(file, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_file_fingerprint(
+    file: Path, previous: FileFingerprint | None = None
+) -> FileFingerprint:
+    """Computes the fingerprint of a file.
+
+    If `previous` has the same mtime and size as the file on disk, its hash is
+    re-used instead of reading the file again.
+
+    Args:
+        file (Path): The file to fingerprint.
+        previous (FileFingerprint | None, optional): The previously recorded fingerprint. Defaults to None.
+
+    Returns:
+        FileFingerprint: The fingerprint of the file.
+    """
+    stat = file.stat()
+    if (
+        previous is not None
+        and previous.mtime == stat.st_mtime
+        and previous.size == stat.st_size
+    ):
+        return previous
+    return FileFingerprint(
+        mtime=stat.st_mtime, size=stat.st_size, sha256=compute_sha256(file)
+    )
+
+
+def get_input_fingerprints(
+    files: list[Path], root: Path, previous: ArtifactState | None = None
+) -> dict[str, FileFingerprint]:
+    """Fingerprints input files, keyed by their path relative to `root`.
+
+    Args:
+        files (list[Path]): The input files.
+        root (Path): The directory the keys are made relative to.
+        previous (ArtifactState | None, optional): The previously recorded state, used to skip re-hashing unchanged files. Defaults to None.
+
+    Returns:
+        dict[str, FileFingerprint]: Mapping of relative path to fingerprint.
+    """
+    known = {} if previous is None else previous.inputs
+    fingerprints = {}
+    for file in files:
+        key = file.relative_to(root).as_posix()
+        fingerprints[key] = get_file_fingerprint(file, known.get(key))
+    return fingerprints
+
+
+def get_changed_inputs(
+    current: dict[str, FileFingerprint], previous: ArtifactState | None
+) -> tuple[set[str], set[str]]:
+    """Compares current input fingerprints against the recorded ones.
+
+    Files count as changed if they are new or their content hash differs.
+    A modified mtime alone does not count as a change.
+
+    Args:
+        current (dict[str, FileFingerprint]): The current input fingerprints.
+        previous (ArtifactState | None): The recorded state of the artifact.
+
+    Returns:
+        tuple[set[str], set[str]]: The changed (incl. new) and the removed input keys.
+    """
+    known = {} if previous is None else previous.inputs
+    changed = {
+        k for k, fp in current.items() if k not in known or known[k].sha256 != fp.sha256
+    }
+    removed = set(known) - set(current)
+    return changed, removed
+
+
+def load_build_state(legislature_id: int, preprocessed_path: Path) -> BuildState:
+    """Loads the build state, returning an empty state if none or an unreadable one exists.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        BuildState: The loaded build state.
+    """
+    file = get_build_state_path(legislature_id, preprocessed_path)
+    if not file.exists():
+        return BuildState(legislature_id=legislature_id)
+
+    logger.debug(f"Reading build state from {file}")
+    try:
+        state = BuildState.model_validate_json(file.read_text(encoding="utf8"))
+    except ValueError:
+        logger.warning(f"Could not parse {file}, ignoring it.")
+        return BuildState(legislature_id=legislature_id)
+
+    if state.legislature_id != legislature_id:
+        logger.warning(
+            f"{file} belongs to legislature_id={state.legislature_id}, ignoring it."
+        )
+        return BuildState(legislature_id=legislature_id)
+    return state
+
+
+def store_build_state(state: BuildState, preprocessed_path: Path):
+    """Writes the build state to file.
+
+    Args:
+        state (BuildState): The build state.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+    """
+    file = get_build_state_path(state.legislature_id, preprocessed_path)
+    logger.debug(f"Writing build state to {file}")
+    file.write_text(state.model_dump_json(indent=2), encoding="utf8")
@@ -0,0 +1,332 @@
+import logging
+from collections.abc import Callable
+from enum import StrEnum
+from pathlib import Path
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+
+class OutputProfileEnum(StrEnum):
+    default = "default"
+    compact = "compact"
+
+
+VOTE_VALUES = ["yes", "no", "abstain", "no_show"]
+VOTE_DTYPE = pl.Enum(VOTE_VALUES)
+DATE_FORMAT = "%Y-%m-%d"
+
+SCHEMA_COMPACT_POLLS_DATA = pl.Schema(
+    {
+        "poll_id": pl.Int32(),
+        "poll_title": pl.String(),
+        "poll_first_committee": pl.Categorical(),
+        "poll_description": pl.String(),
+        "legislature_id": pl.Int32(),
+        "legislature_period": pl.Categorical(),
+        "poll_date": pl.Date(),
+    }
+)
+
+SCHEMA_COMPACT_MANDATES_DATA = pl.Schema(
+    {
+        "legislature_id": pl.Int32(),
+        "legislature_period": pl.Categorical(),
+        "mandate_id": pl.Int32(),
+        "mandate": pl.String(),
+        "politician_id": pl.Int32(),
+        "politician": pl.String(),
+        "politician_url": pl.String(),
+        "start_date": pl.Date(),
+        "end_date": pl.Date(),
+        "constituency_id": pl.Int32(),
+        "constituency_name": pl.Categorical(),
+        "fraction_names": pl.List(pl.Categorical()),
+        "fraction_ids": pl.List(pl.Int32()),
+        "fraction_starts": pl.List(pl.Date()),
+        "fraction_ends": pl.List(pl.Date()),
+        "all_parties": pl.List(pl.Categorical()),
+        "party": pl.Categorical(),
+    }
+)
+
+SCHEMA_COMPACT_VOTES_DATA = pl.Schema(
+    {
+        "mandate_id": pl.Int32(),
+        "mandate": pl.Categorical(),
+        "poll_id": pl.Int32(),
+        "vote": VOTE_DTYPE,
+        "reason_no_show": pl.Categorical(),
+        "reason_no_show_other": pl.String(),
+        "politician name": pl.Categorical(),
+    }
+)
+
+# columns which use "" instead of null for missing dates in the default profile
+EMPTY_STRING_DATE_COLUMNS = ["end_date", "fraction_ends"]
+
+# placeholder of `parse_mandate_data` for mandates without fraction membership
+MISSING_FRACTION = "unknown"
+MISSING_FRACTION_DATE_COLUMNS = ["fraction_starts", "fraction_ends"]
+
+
+def to_date(col: str) -> pl.Expr:
+    """Parses a `%Y-%m-%d` string column to Date, mapping unparseable values like "" to null.
+
+    Args:
+        col (str): The column name.
+
+    Returns:
+        pl.Expr: The parsing expression.
+    """
+    return pl.col(col).str.to_date(DATE_FORMAT, strict=False)
+
+
+def list_to_date(col: str) -> pl.Expr:
+    """Same as `to_date` for a list of strings column.
+
+    Args:
+        col (str): The column name.
+
+    Returns:
+        pl.Expr: The parsing expression.
+    """
+    return pl.col(col).list.eval(pl.element().str.to_date(DATE_FORMAT, strict=False))
+
+
+def is_compact(df: pl.DataFrame, schema: pl.Schema) -> bool:
+    """Checks if the columns of `df` present in `schema` have the compact dtypes.
+
+    Args:
+        df (pl.DataFrame): The data frame.
+        schema (pl.Schema): One of the `SCHEMA_COMPACT_*` schemas.
+
+    Returns:
+        bool: True if all shared columns are of the compact dtype.
+    """
+    return all(df.schema[c] == dtype for c, dtype in schema.items() if c in df.columns)
+
+
+def cast_compact(
+    df: pl.DataFrame, schema: pl.Schema, date_cols: list[str], list_date_cols: list[str]
+) -> pl.DataFrame:
+    """Casts the columns of `df` present in `schema` to their compact dtypes.
+
+    Args:
+        df (pl.DataFrame): The data frame in the default profile.
+        schema (pl.Schema): One of the `SCHEMA_COMPACT_*` schemas.
+        date_cols (list[str]): String columns to parse to Date.
+        list_date_cols (list[str]): List of string columns to parse to list of Date.
+
+    Returns:
+        pl.DataFrame: The compacted data frame.
+    """
+    exprs = []
+    for c, dtype in schema.items():
+        if c not in df.columns:
+            continue
+        if c in date_cols:
+            exprs.append(to_date(c))
+        elif c in list_date_cols:
+            exprs.append(list_to_date(c))
+        else:
+            exprs.append(pl.col(c).cast(dtype))
+    return df.with_columns(exprs)
+
+
+def restore_default(df: pl.DataFrame, schema: pl.Schema) -> pl.DataFrame:
+    """Casts compact columns of `df` back to the dtypes of the default profile.
+
+    Dates become `%Y-%m-%d` strings, with null mapped to "" for the columns in
+    `EMPTY_STRING_DATE_COLUMNS`, categoricals and enums become strings and
+    Int32 ids become Int64.
+
+    Args:
+        df (pl.DataFrame): The data frame in the compact profile.
+        schema (pl.Schema): One of the `SCHEMA_COMPACT_*` schemas.
+
+    Returns:
+        pl.DataFrame: The data frame in the default profile.
+    """
+    exprs = []
+    for c, dtype in schema.items():
+        if c not in df.columns:
+            continue
+        if dtype == pl.Date:
+            expr = pl.col(c).dt.to_string(DATE_FORMAT)
+            if c in EMPTY_STRING_DATE_COLUMNS:
+                expr = expr.fill_null("")
+            exprs.append(expr)
+        elif dtype == pl.List(pl.Date):
+            expr = pl.element().dt.to_string(DATE_FORMAT)
+            if c in EMPTY_STRING_DATE_COLUMNS:
+                expr = expr.fill_null("")
+            exprs.append(pl.col(c).list.eval(expr))
+        elif dtype == pl.List(pl.Categorical):
+            exprs.append(pl.col(c).cast(pl.List(pl.String)))
+        elif dtype == pl.List(pl.Int32):
+            exprs.append(pl.col(c).cast(pl.List(pl.Int64)))
+        elif dtype == pl.Int32:
+            exprs.append(pl.col(c).cast(pl.Int64))
+        elif dtype in (pl.Categorical, VOTE_DTYPE):
+            exprs.append(pl.col(c).cast(pl.String))
+    return df.with_columns(exprs)
+
+
+def compact_polls_data(df: pl.DataFrame) -> pl.DataFrame:
+    """Converts polls data to the compact profile, see `SCHEMA_COMPACT_POLLS_DATA`.
+
+    Args:
+        df (pl.DataFrame): Polls data in the default profile.
+
+    Returns:
+        pl.DataFrame: Polls data in the compact profile.
+    """
+    return cast_compact(df, SCHEMA_COMPACT_POLLS_DATA, ["poll_date"], [])
+
+
+def compact_mandates_data(df: pl.DataFrame) -> pl.DataFrame:
+    """Converts mandates data to the compact profile, see `SCHEMA_COMPACT_MANDATES_DATA`.
+
+    Missing dates ("" or the "unknown" placeholder) become null. The placeholder
+    is restored by `restore_mandates_data` from "fraction_names", which keeps it.
+
+    Args:
+        df (pl.DataFrame): Mandates data in the default profile.
+
+    Returns:
+        pl.DataFrame: Mandates data in the compact profile.
+    """
+    return cast_compact(
+        df,
+        SCHEMA_COMPACT_MANDATES_DATA,
+        ["start_date", "end_date"],
+        ["fraction_starts", "fraction_ends"],
+    )
+
+
+def restore_mandates_data(df: pl.DataFrame) -> pl.DataFrame:
+    """Converts mandates data in the compact profile back to the default profile.
+
+    Same as `restore_default`, but mandates without fraction membership, i.e. with
+    `MISSING_FRACTION` as the only fraction name, get the placeholder back in
+    "fraction_starts" and "fraction_ends" instead of null or "".
+
+    Args:
+        df (pl.DataFrame): Mandates data in the compact profile.
+
+    Returns:
+        pl.DataFrame: Mandates data in the default profile.
+    """
+    df = restore_default(df, SCHEMA_COMPACT_MANDATES_DATA)
+    if "fraction_names" not in df.columns:
+        return df
+
+    is_missing = (pl.col("fraction_names").list.len() == 1) & (
+        pl.col("fraction_names").list.first() == MISSING_FRACTION
+    )
+    return df.with_columns(
+        pl.when(is_missing)
+        .then(pl.lit([MISSING_FRACTION]))
+        .otherwise(pl.col(c))
+        .alias(c)
+        for c in MISSING_FRACTION_DATE_COLUMNS
+        if c in df.columns
+    )
+
+
+def compact_votes_data(df: pl.DataFrame) -> pl.DataFrame:
+    """Converts votes data to the compact profile, see `SCHEMA_COMPACT_VOTES_DATA`.
+
+    Args:
+        df (pl.DataFrame): Votes data in the default profile.
+
+    Returns:
+        pl.DataFrame: Votes data in the compact profile.
+    """
+    return cast_compact(df, SCHEMA_COMPACT_VOTES_DATA, [], [])
+
+
+def load_data(
+    file: Path,
+    schema: pl.Schema,
+    compact_func,
+    profile: OutputProfileEnum = OutputProfileEnum.compact,
+    restore_func: Callable[[pl.DataFrame], pl.DataFrame] | None = None,
+) -> pl.DataFrame:
+    """Loads a preprocessed Parquet or IPC file, written in either profile, in the requested `profile`.
+
+    Args:
+        file (Path): The Parquet or IPC (`.feather`) file.
+        schema (pl.Schema): The matching `SCHEMA_COMPACT_*` schema.
+        compact_func (callable): The matching `compact_*_data` function.
+        profile (OutputProfileEnum, optional): The profile to return the data in. Defaults to OutputProfileEnum.compact.
+        restore_func (Callable[[pl.DataFrame], pl.DataFrame] | None, optional): Converts compact data
+            back to the default profile. Defaults to None, i.e. `restore_default` with `schema`.
+
+    Returns:
+        pl.DataFrame: The loaded data.
+    """
+    logger.debug(f"Reading {file} ({profile=})")
+    df = pl.read_ipc(file) if file.suffix == ".feather" else pl.read_parquet(file)
+    file_is_compact = is_compact(df, schema)
+
+    if profile == OutputProfileEnum.compact and not file_is_compact:
+        return compact_func(df)
+    elif profile == OutputProfileEnum.default and file_is_compact:
+        if restore_func is not None:
+            return restore_func(df)
+        return restore_default(df, schema)
+    return df
+
+
+def load_polls_data(
+    file: Path, profile: OutputProfileEnum = OutputProfileEnum.compact
+) -> pl.DataFrame:
+    """Loads a preprocessed polls file in the requested profile.
+
+    Args:
+        file (Path): The polls Parquet file.
+        profile (OutputProfileEnum, optional): The profile to return the data in. Defaults to OutputProfileEnum.compact.
+
+    Returns:
+        pl.DataFrame: The polls data.
+    """
+    return load_data(file, SCHEMA_COMPACT_POLLS_DATA, compact_polls_data, profile)
+
+
+def load_mandates_data(
+    file: Path, profile: OutputProfileEnum = OutputProfileEnum.compact
+) -> pl.DataFrame:
+    """Loads a preprocessed mandates file in the requested profile.
+
+    Args:
+        file (Path): The mandates Parquet file.
+        profile (OutputProfileEnum, optional): The profile to return the data in. Defaults to OutputProfileEnum.compact.
+
+    Returns:
+        pl.DataFrame: The mandates data.
+    """
+    return load_data(
+        file,
+        SCHEMA_COMPACT_MANDATES_DATA,
+        compact_mandates_data,
+        profile,
+        restore_func=restore_mandates_data,
+    )
+
+
+def load_votes_data(
+    file: Path, profile: OutputProfileEnum = OutputProfileEnum.compact
+) -> pl.DataFrame:
+    """Loads a preprocessed votes file in the requested profile.
+
+    Args:
+        file (Path): The votes Parquet or IPC file.
+        profile (OutputProfileEnum, optional): The profile to return the data in. Defaults to OutputProfileEnum.compact.
+
+    Returns:
+        pl.DataFrame: The votes data.
+    """
+    return load_data(file, SCHEMA_COMPACT_VOTES_DATA, compact_votes_data, profile)
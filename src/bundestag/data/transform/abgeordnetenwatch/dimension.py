@@ -0,0 +1,211 @@
+import logging
+import re
+from pathlib import Path
+
+import polars as pl
+
+from bundestag.data.transform.abgeordnetenwatch.compact import (
+    DATE_FORMAT,
+    OutputProfileEnum,
+    load_mandates_data,
+)
+
+logger = logging.getLogger(__name__)
+
+RE_MANDATES_FILE = re.compile(r"^mandates_(\d+)\.parquet$")
+
+SCHEMA_MANDATES_DIMENSION = pl.Schema(
+    {
+        "politician_id": pl.Int64(),
+        "politician": pl.String(),
+        "mandate_id": pl.Int64(),
+        "legislature_id": pl.Int64(),
+        "legislature_period": pl.String(),
+        "mandate_start": pl.Date(),
+        "mandate_end": pl.Date(),
+        "fraction_id": pl.Int64(),
+        "fraction_name": pl.String(),
+        "party": pl.String(),
+        "valid_from": pl.Date(),
+        "valid_to": pl.Date(),
+    }
+)
+
+
+def get_mandates_dimension_path(preprocessed_path: Path) -> Path:
+    """Constructs the file path for the cross-legislature mandates dimension Parquet file.
+
+    Args:
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        Path: The full path to the mandates dimension Parquet file.
+    """
+    return preprocessed_path / "mandates_dimension.parquet"
+
+
+def get_mandates_dimension_data(df_mandates: pl.DataFrame) -> pl.DataFrame:
+    """Turns mandates data into dimension rows with validity intervals.
+
+    Each fraction membership of a mandate becomes one row, valid from
+    `fraction_starts` until `fraction_ends`. A null `valid_to` marks a
+    membership which is still ongoing.
+
+    Args:
+        df_mandates (pl.DataFrame): Mandates data in the default profile, as produced by `transform_mandates_data`.
+
+    Returns:
+        pl.DataFrame: The dimension rows with schema `SCHEMA_MANDATES_DIMENSION`.
+    """
+    to_date = lambda c: pl.col(c).str.to_date(DATE_FORMAT, strict=False)
+
+    return (
+        df_mandates.lazy()
+        .explode(["fraction_names", "fraction_ids", "fraction_starts", "fraction_ends"])
+        .select(
+            pl.col("politician_id").cast(pl.Int64),
+            pl.col("politician"),
+            pl.col("mandate_id").cast(pl.Int64),
+            pl.col("legislature_id").cast(pl.Int64),
+            pl.col("legislature_period"),
+            to_date("start_date").alias("mandate_start"),
+            to_date("end_date").alias("mandate_end"),
+            pl.col("fraction_ids").cast(pl.Int64).alias("fraction_id"),
+            pl.col("fraction_names").alias("fraction_name"),
+            # vectorised version of helper.extract_party_from_string
+            pl.col("fraction_names")
+            .str.extract(r"^(.+)\sseit", 1)
+            .fill_null(pl.col("fraction_names"))
+            .alias("party"),
+            to_date("fraction_starts").alias("valid_from"),
+            to_date("fraction_ends").alias("valid_to"),
+        )
+        .collect()
+    )
+
+
+def upsert_mandates_dimension(
+    df_dimension: pl.DataFrame, df_new: pl.DataFrame
+) -> pl.DataFrame:
+    """Replaces all rows of the legislatures in `df_new` in the dimension table.
+
+    Args:
+        df_dimension (pl.DataFrame): The existing dimension table.
+        df_new (pl.DataFrame): Dimension rows of one or more legislatures, see `get_mandates_dimension_data`.
+
+    Returns:
+        pl.DataFrame: The updated dimension table, sorted by politician and validity.
+    """
+    legislature_ids = df_new["legislature_id"].unique().to_list()
+    return (
+        pl.concat(
+            [
+                df_dimension.filter(~pl.col("legislature_id").is_in(legislature_ids)),
+                df_new.select(df_dimension.columns),
+            ]
+        )
+        .sort(["politician_id", "valid_from", "mandate_id"], nulls_last=True)
+        .select(SCHEMA_MANDATES_DIMENSION.names())
+    )
+
+
+def load_mandates_dimension(preprocessed_path: Path) -> pl.DataFrame:
+    """Loads the mandates dimension table, or an empty one if none was written yet.
+
+    Args:
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        pl.DataFrame: The mandates dimension table.
+    """
+    file = get_mandates_dimension_path(preprocessed_path)
+    if not file.exists():
+        return pl.DataFrame(schema=SCHEMA_MANDATES_DIMENSION)
+    logger.debug(f"Reading {file}")
+    return pl.read_parquet(file)
+
+
+def dimension_has_legislature(legislature_id: int, preprocessed_path: Path) -> bool:
+    """Checks if the mandates dimension table contains the given legislature.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        bool: True if the dimension table exists and contains rows of the legislature.
+    """
+    file = get_mandates_dimension_path(preprocessed_path)
+    if not file.exists():
+        return False
+    n = (
+        pl.scan_parquet(file)
+        .filter(pl.col("legislature_id") == legislature_id)
+        .select(pl.len())
+        .collect()
+        .item()
+    )
+    return n > 0
+
+
+def update_mandates_dimension(
+    legislature_id: int,
+    preprocessed_path: Path,
+    df_mandates: pl.DataFrame | None = None,
+) -> pl.DataFrame:
+    """Upserts the mandates of one legislature into the dimension table and writes it.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+        df_mandates (pl.DataFrame | None, optional): The mandates data in the default profile. If None it is read from `mandates_{legislature_id}.parquet`. Defaults to None.
+
+    Returns:
+        pl.DataFrame: The updated dimension table.
+    """
+    if df_mandates is None:
+        df_mandates = load_mandates_data(
+            preprocessed_path / f"mandates_{legislature_id}.parquet",
+            profile=OutputProfileEnum.default,
+        )
+
+    df = upsert_mandates_dimension(
+        load_mandates_dimension(preprocessed_path),
+        get_mandates_dimension_data(df_mandates),
+    )
+
+    file = get_mandates_dimension_path(preprocessed_path)
+    logger.info(f"Writing to {file}")
+    df.write_parquet(file)
+    return df
+
+
+def build_mandates_dimension(
+    preprocessed_path: Path, dry: bool = False
+) -> pl.DataFrame:
+    """Builds the mandates dimension table from all `mandates_*.parquet` files.
+
+    Args:
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+        dry (bool, optional): If True, the table is not written. Defaults to False.
+
+    Returns:
+        pl.DataFrame: The dimension table.
+    """
+    files = sorted(
+        f
+        for f in preprocessed_path.glob("mandates_*.parquet")
+        if RE_MANDATES_FILE.match(f.name)
+    )
+    logger.info(f"Building mandates dimension from {len(files)} files")
+
+    df = pl.DataFrame(schema=SCHEMA_MANDATES_DIMENSION)
+    for file in files:
+        df_mandates = load_mandates_data(file, profile=OutputProfileEnum.default)
+        df = upsert_mandates_dimension(df, get_mandates_dimension_data(df_mandates))
+
+    if not dry:
+        file = get_mandates_dimension_path(preprocessed_path)
+        logger.info(f"Writing to {file}")
+        df.write_parquet(file)
+    return df
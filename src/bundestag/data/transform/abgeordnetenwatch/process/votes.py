@@ -107,7 +107,10 @@ def get_votes_data(
 
 
 def compile_votes_data(
-    legislature_id: int, path: Path, validate: bool = False
+    legislature_id: int,
+    path: Path,
+    validate: bool = False,
+    poll_ids: list[int] | None = None,
 ) -> pl.DataFrame:
     """Compiles the individual politicians' votes for a specific legislature period into a single DataFrame.
 
@@ -119,19 +122,24 @@ def compile_votes_data(
         legislature_id (int): The ID of the legislature for which to compile the votes.
         path (Path): The path to the directory containing the vote data files.
         validate (bool, optional): A flag for validation (currently unused). Defaults to False.
+        poll_ids (list[int] | None, optional): Restricts compilation to these poll ids, e.g. for incremental updates. If None all stored polls are compiled. Defaults to None.
 
     Returns:
         pl.DataFrame: A Polars DataFrame containing all the vote data for the specified legislature.
     """
 
-    known_id_combos = check_stored_vote_ids(legislature_id=legislature_id, path=path)
+    if poll_ids is None:
+        known_id_combos = check_stored_vote_ids(
+            legislature_id=legislature_id, path=path
+        )
+        poll_ids = list(known_id_combos[legislature_id])
 
     # TODO: figure out why some mandate_id entries are duplicate in vote_json files
 
     df_all_votes = []
     for poll_id in tqdm(
-        known_id_combos[legislature_id],
-        total=len(known_id_combos[legislature_id]),
+        poll_ids,
+        total=len(poll_ids),
         desc="poll_id",
     ):
         df = get_votes_data(legislature_id, poll_id, path=path, validate=False)
@@ -148,6 +156,9 @@ def compile_votes_data(
 
         df_all_votes.append(df)
 
+    if len(df_all_votes) == 0:
+        return pl.DataFrame(schema=SCHEMA_GET_VOTES_DATA)
+
     df_all_votes = pl.concat(df_all_votes)
 
     return df_all_votes
@@ -1,9 +1,33 @@
 import logging
+from enum import StrEnum
 from pathlib import Path
 from time import perf_counter
 
 import polars as pl
 
+from bundestag.data.download.abgeordnetenwatch.store import check_stored_vote_ids
+from bundestag.data.transform.abgeordnetenwatch.build_state import (
+    ArtifactState,
+    BuildState,
+    get_changed_inputs,
+    get_input_fingerprints,
+    load_build_state,
+    store_build_state,
+)
+from bundestag.data.transform.abgeordnetenwatch.compact import (
+    VOTE_DTYPE,
+    OutputProfileEnum,
+    compact_mandates_data,
+    compact_polls_data,
+    compact_votes_data,
+    load_mandates_data,
+    load_polls_data,
+    load_votes_data,
+)
+from bundestag.data.transform.abgeordnetenwatch.dimension import (
+    dimension_has_legislature,
+    update_mandates_dimension,
+)
 from bundestag.data.transform.abgeordnetenwatch.helper import (
     get_parties_from_col,
 )
@@ -12,7 +36,11 @@ from bundestag.data.transform.abgeordnetenwatch.process import (
     get_mandates_data,
     get_polls_data,
 )
-from bundestag.data.utils import ensure_path_exists
+from bundestag.data.utils import (
+    ensure_path_exists,
+    get_mandates_filename,
+    get_polls_filename,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +83,73 @@ def transform_votes_data(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
+SCHEMA_VOTES_FACT_DATA = pl.Schema(
+    {
+        "mandate_id": pl.Int64(),
+        "poll_id": pl.Int64(),
+        "politician_id": pl.Int64(),
+        "legislature_id": pl.Int64(),
+        "vote": VOTE_DTYPE,
+        "party": pl.Categorical(),
+        "poll_date": pl.Date(),
+    }
+)
+
+
+def get_votes_fact_data(
+    df_votes: pl.DataFrame, df_mandates: pl.DataFrame, df_polls: pl.DataFrame
+) -> pl.DataFrame:
+    """Builds a denormalised, integer keyed votes fact table.
+
+    Votes are joined to mandates on `mandate_id` and to polls on `poll_id`, so
+    analyses no longer need to join on the politician name extracted in
+    `transform_votes_data`. Votes of unknown mandates or polls are kept with
+    null party / poll date.
+
+    Args:
+        df_votes (pl.DataFrame): Votes data, as produced by `transform_votes_data`.
+        df_mandates (pl.DataFrame): Mandates data, as produced by `transform_mandates_data`.
+        df_polls (pl.DataFrame): Polls data.
+
+    Returns:
+        pl.DataFrame: The fact table with schema `SCHEMA_VOTES_FACT_DATA`.
+    """
+    mandates = df_mandates.select(
+        "mandate_id", "politician_id", "legislature_id", "party"
+    ).unique("mandate_id", keep="first")
+    polls = df_polls.select("poll_id", "poll_date").unique("poll_id", keep="first")
+
+    return (
+        df_votes.lazy()
+        .select("mandate_id", "poll_id", "vote")
+        .join(mandates.lazy(), on="mandate_id", how="left")
+        .join(polls.lazy(), on="poll_id", how="left")
+        .select(
+            pl.col("mandate_id").cast(pl.Int64),
+            pl.col("poll_id").cast(pl.Int64),
+            pl.col("politician_id").cast(pl.Int64),
+            pl.col("legislature_id").cast(pl.Int64),
+            pl.col("vote").cast(VOTE_DTYPE),
+            pl.col("party").cast(pl.Categorical),
+            pl.col("poll_date").str.to_date("%Y-%m-%d"),
+        )
+        .collect()
+    )
+
+
+def get_votes_fact_parquet_path(legislature_id: int, preprocessed_path: Path) -> Path:
+    """Constructs the file path for the votes fact table Parquet file.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        Path: The full path to the votes fact table Parquet file.
+    """
+    return preprocessed_path / f"votes_fact_{legislature_id}.parquet"
+
+
 def get_votes_parquet_path(legislature_id: int, preprocessed_path: Path) -> Path:
     """Constructs the file path for the votes Parquet file.
 
@@ -81,6 +176,115 @@ def get_votes_csv_path(legislature_id: int, preprocessed_path: Path) -> Path:
     return preprocessed_path / f"votes_{legislature_id}.csv"
 
 
+def get_votes_ipc_path(legislature_id: int, preprocessed_path: Path) -> Path:
+    """Constructs the file path for the votes Arrow IPC (feather) file.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        Path: The full path to the votes IPC file.
+    """
+    return preprocessed_path / f"votes_{legislature_id}.feather"
+
+
+class VotesFormatEnum(StrEnum):
+    parquet = "parquet"
+    csv = "csv"
+    ipc = "ipc"
+    none = "none"
+
+
+DEFAULT_VOTES_FORMATS = (VotesFormatEnum.parquet, VotesFormatEnum.csv)
+
+
+def get_votes_paths(
+    legislature_id: int,
+    preprocessed_path: Path,
+    formats: list[VotesFormatEnum] | tuple[VotesFormatEnum, ...],
+) -> dict[VotesFormatEnum, Path]:
+    """Constructs the file paths of the votes files for the requested formats.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+        formats (list[VotesFormatEnum] | tuple[VotesFormatEnum, ...]): The output formats. `none` is ignored.
+
+    Returns:
+        dict[VotesFormatEnum, Path]: Mapping of format to file path, in the order parquet, ipc, csv.
+    """
+    getters = {
+        VotesFormatEnum.parquet: get_votes_parquet_path,
+        VotesFormatEnum.ipc: get_votes_ipc_path,
+        VotesFormatEnum.csv: get_votes_csv_path,
+    }
+    return {
+        fmt: getter(legislature_id, preprocessed_path)
+        for fmt, getter in getters.items()
+        if fmt in formats
+    }
+
+
+def read_votes_data(file: Path) -> pl.DataFrame:
+    """Reads a votes Parquet or IPC file, written in either output profile, in the default profile.
+
+    Args:
+        file (Path): The votes file.
+
+    Raises:
+        ValueError: If the file suffix is not supported.
+
+    Returns:
+        pl.DataFrame: The votes data.
+    """
+    if file.suffix not in (".parquet", ".feather"):
+        raise ValueError(
+            f"Cannot read votes from {file=}, expected parquet or feather."
+        )
+    return load_votes_data(file, profile=OutputProfileEnum.default)
+
+
+def write_votes_data(
+    df: pl.DataFrame,
+    paths: dict[VotesFormatEnum, Path],
+    profile: OutputProfileEnum = OutputProfileEnum.default,
+):
+    """Writes the votes data in all requested formats.
+
+    CSV is written last. If a Parquet or IPC file is written as well, the CSV is
+    streamed from a lazy scan of that file with `sink_csv` instead of being
+    serialised from `df`.
+
+    Args:
+        df (pl.DataFrame): The votes data.
+        paths (dict[VotesFormatEnum, Path]): Mapping of format to file path, see `get_votes_paths`.
+        profile (OutputProfileEnum, optional): The output profile. Defaults to OutputProfileEnum.default.
+    """
+    if profile == OutputProfileEnum.compact:
+        df = compact_votes_data(df)
+
+    for fmt, file in paths.items():
+        if fmt == VotesFormatEnum.csv:
+            continue
+        logger.info(f"Writing to {file}")
+        if fmt == VotesFormatEnum.parquet:
+            df.write_parquet(file)
+        elif fmt == VotesFormatEnum.ipc:
+            df.write_ipc(file)
+
+    if VotesFormatEnum.csv not in paths:
+        return
+    file = paths[VotesFormatEnum.csv]
+    logger.info(f"Writing to {file}")
+    if VotesFormatEnum.parquet in paths:
+        pl.scan_parquet(paths[VotesFormatEnum.parquet]).sink_csv(file)
+    elif VotesFormatEnum.ipc in paths:
+        pl.scan_ipc(paths[VotesFormatEnum.ipc]).sink_csv(file)
+    else:
+        df.write_csv(file)
+
+
 def get_mandates_parquet_path(legislature_id: int, preprocessed_path: Path) -> Path:
     """Constructs the file path for the mandates Parquet file.
 
@@ -107,6 +311,126 @@ def get_polls_parquet_path(legislature_id: int, preprocessed_path: Path) -> Path
     return preprocessed_path / f"polls_{legislature_id}.parquet"
 
 
+def stage_is_up_to_date(
+    artifact: str,
+    inputs: list[Path],
+    outputs: list[Path],
+    raw_path: Path,
+    state: BuildState,
+) -> bool:
+    """Checks if an output artifact is up to date given its recorded input fingerprints.
+
+    Args:
+        artifact (str): The name of the artifact in the build state.
+        inputs (list[Path]): The input files of the stage.
+        outputs (list[Path]): The output files of the stage, all of which need to exist.
+        raw_path (Path): The path to the directory containing the raw data.
+        state (BuildState): The current build state.
+
+    Returns:
+        bool: True if all outputs exist and no input changed since the last run.
+    """
+    if not all(f.exists() for f in outputs):
+        return False
+    previous = state.artifacts.get(artifact)
+    current = get_input_fingerprints(inputs, raw_path, previous=previous)
+    changed, removed = get_changed_inputs(current, previous)
+    return len(changed) == 0 and len(removed) == 0
+
+
+def record_stage(
+    artifact: str,
+    inputs: list[Path],
+    raw_path: Path,
+    state: BuildState,
+    preprocessed_path: Path,
+):
+    """Records the input fingerprints of a finished stage and writes the build state.
+
+    Args:
+        artifact (str): The name of the artifact in the build state.
+        inputs (list[Path]): The input files of the stage.
+        raw_path (Path): The path to the directory containing the raw data.
+        state (BuildState): The current build state, updated in place.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+    """
+    previous = state.artifacts.get(artifact)
+    state.artifacts[artifact] = ArtifactState(
+        inputs=get_input_fingerprints(inputs, raw_path, previous=previous)
+    )
+    store_build_state(state, preprocessed_path)
+
+
+def get_votes_artifact_name(legislature_id: int) -> str:
+    """Name of the votes artifact in the build state, independent of the output formats.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+
+    Returns:
+        str: The artifact name.
+    """
+    return f"votes_{legislature_id}"
+
+
+def update_votes_data(
+    legislature_id: int,
+    raw_path: Path,
+    preprocessed_path: Path,
+    vote_files: dict[int, Path],
+    state: BuildState,
+    validate: bool = False,
+    base_file: Path | None = None,
+) -> pl.DataFrame | None:
+    """Incrementally updates the votes data using the recorded build state.
+
+    Only polls whose `poll_*_votes.json` file is new or changed are parsed. Their rows
+    replace any previous rows of the same poll in the existing votes file. Rows
+    of polls whose file disappeared are dropped.
+
+    Args:
+        legislature_id (int): The ID of the legislature.
+        raw_path (Path): The path to the directory containing the raw data.
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+        vote_files (dict[int, Path]): Mapping of poll id to the stored vote file.
+        state (BuildState): The current build state.
+        validate (bool, optional): A flag for validation during vote compilation. Defaults to False.
+        base_file (Path | None, optional): The existing Parquet or IPC votes file to update. Defaults to the votes Parquet file.
+
+    Returns:
+        pl.DataFrame | None: The updated votes data, or None if nothing changed.
+    """
+    if base_file is None:
+        base_file = get_votes_parquet_path(legislature_id, preprocessed_path)
+
+    artifact = get_votes_artifact_name(legislature_id)
+    previous = state.artifacts.get(artifact)
+    current = get_input_fingerprints(
+        list(vote_files.values()), raw_path, previous=previous
+    )
+    changed, removed = get_changed_inputs(current, previous)
+
+    if len(changed) == 0 and len(removed) == 0:
+        return None
+
+    file2poll_id = lambda x: int(Path(x).name.split("_")[-2])
+    changed_poll_ids = sorted(file2poll_id(k) for k in changed)
+    stale_poll_ids = changed_poll_ids + [file2poll_id(k) for k in removed]
+    logger.info(
+        f"Updating votes for {len(changed_poll_ids)} new or changed and {len(removed)} removed polls"
+    )
+
+    df_new = compile_votes_data(
+        legislature_id, raw_path, validate=validate, poll_ids=changed_poll_ids
+    )
+    df_new = transform_votes_data(df_new)
+
+    df_old = read_votes_data(base_file)
+    df_old = df_old.filter(~pl.col("poll_id").is_in(stale_poll_ids))
+
+    return pl.concat([df_old, df_new.select(df_old.columns)])
+
+
 def run(
     legislature_id: int,
     raw_path: Path,
@@ -114,13 +438,25 @@ def run(
     dry: bool,
     validate: bool = False,
     assume_yes: bool = False,
+    force: bool = False,
+    votes_formats: list[VotesFormatEnum] | tuple[VotesFormatEnum, ...] = (
+        DEFAULT_VOTES_FORMATS
+    ),
+    profile: OutputProfileEnum = OutputProfileEnum.default,
 ):
     """Runs the full data transformation pipeline for abgeordnetenwatch data for a given legislature.
 
     This function performs the following steps:
     1. Loads and processes polls data, then saves it as a Parquet file.
-    2. Loads, transforms, and processes mandates data, then saves it as a Parquet file.
-    3. Compiles and transforms votes data, then saves it as both CSV and Parquet files.
+    2. Loads, transforms, and processes mandates data, then saves it as a Parquet file and upserts
+       it into the cross-legislature mandates dimension table, see `dimension.update_mandates_dimension`.
+    3. Compiles and transforms votes data, then saves it in the formats given by `votes_formats`.
+    4. Joins votes with mandates and polls into an integer keyed votes fact table, see `get_votes_fact_data`.
+
+    Fingerprints (mtime, size and sha256) of the raw input files of each step are recorded
+    in a build state file in `preprocessed_path`. Steps whose inputs did not change since the
+    last run are skipped. Votes are updated per poll: only new or changed vote files are parsed
+    and merged into the existing votes Parquet (or IPC) file.
 
     Args:
         legislature_id (int): The ID of the legislature to process.
@@ -129,6 +465,9 @@ def run(
         dry (bool): If True, the function will only log the actions it would take without writing any files.
         validate (bool, optional): A flag for validation during vote compilation. Defaults to False.
         assume_yes (bool, optional): If True, it will automatically create the preprocessed path if it doesn't exist. Defaults to False.
+        force (bool, optional): If True, ignores the build state and re-runs all steps. Defaults to False.
+        votes_formats (list[VotesFormatEnum] | tuple[VotesFormatEnum, ...], optional): Output formats of the votes data. If only `none` is given the votes step is skipped. Defaults to parquet and csv.
+        profile (OutputProfileEnum, optional): Output profile of the polls, mandates and votes files. `compact` stores ids as Int32, dates as Date, vote values as Enum and labels as Categorical, see `bundestag.data.transform.abgeordnetenwatch.compact`. Changing the profile re-runs all steps. Defaults to OutputProfileEnum.default.
 
     Raises:
         ValueError: If `dry` is False and either `raw_path` or `preprocessed_path` is not provided.
@@ -148,35 +487,151 @@ def run(
     if not dry and not preprocessed_path.exists():
         ensure_path_exists(preprocessed_path, assume_yes=assume_yes)
 
+    # in dry mode nothing is written, hence all steps are run
+    incremental = not dry and not force
+    state = (
+        load_build_state(legislature_id, preprocessed_path)
+        if incremental
+        else BuildState(legislature_id=legislature_id, profile=profile)
+    )
+    if state.profile != profile:
+        if len(state.artifacts) > 0:
+            logger.info(f"Output profile changed from {state.profile} to {profile}")
+        state = BuildState(legislature_id=legislature_id, profile=profile)
+
+    # data frames of the steps that were (re-)run
+    df_polls = df_mandates = df_all_votes = None
+
     # polls
-    df = get_polls_data(legislature_id, path=raw_path)
-    if not dry:
-        file = get_polls_parquet_path(legislature_id, preprocessed_path)
-        logger.info(f"writing to {file}")
-        df.write_parquet(file)
+    polls_file = get_polls_parquet_path(legislature_id, preprocessed_path)
+    polls_inputs = [raw_path / get_polls_filename(legislature_id)]
+    if incremental and stage_is_up_to_date(
+        polls_file.name, polls_inputs, [polls_file], raw_path, state
+    ):
+        logger.info(f"{polls_file} is up to date, skipping")
+    else:
+        df_polls = get_polls_data(legislature_id, path=raw_path)
+        if not dry:
+            logger.info(f"writing to {polls_file}")
+            if profile == OutputProfileEnum.compact:
+                compact_polls_data(df_polls).write_parquet(polls_file)
+            else:
+                df_polls.write_parquet(polls_file)
+            record_stage(
+                polls_file.name, polls_inputs, raw_path, state, preprocessed_path
+            )
 
     # mandates
-    df = get_mandates_data(legislature_id, path=raw_path)
-    df = transform_mandates_data(df)
-
-    if not dry:
-        file = get_mandates_parquet_path(legislature_id, preprocessed_path)
-        logger.info(f"Writing to {file}")
-        df.write_parquet(file)
+    mandates_file = get_mandates_parquet_path(legislature_id, preprocessed_path)
+    mandates_inputs = [raw_path / get_mandates_filename(legislature_id)]
+    if incremental and stage_is_up_to_date(
+        mandates_file.name, mandates_inputs, [mandates_file], raw_path, state
+    ):
+        logger.info(f"{mandates_file} is up to date, skipping")
+        if not dimension_has_legislature(legislature_id, preprocessed_path):
+            update_mandates_dimension(legislature_id, preprocessed_path)
+    else:
+        df_mandates = get_mandates_data(legislature_id, path=raw_path)
+        df_mandates = transform_mandates_data(df_mandates)
+
+        if not dry:
+            logger.info(f"Writing to {mandates_file}")
+            if profile == OutputProfileEnum.compact:
+                compact_mandates_data(df_mandates).write_parquet(mandates_file)
+            else:
+                df_mandates.write_parquet(mandates_file)
+            record_stage(
+                mandates_file.name, mandates_inputs, raw_path, state, preprocessed_path
+            )
+            update_mandates_dimension(legislature_id, preprocessed_path, df_mandates)
 
     # votes
-    df_all_votes = compile_votes_data(legislature_id, raw_path, validate=validate)
-    df_all_votes = transform_votes_data(df_all_votes)
-
-    if not dry:
-        all_votes_path = get_votes_csv_path(legislature_id, preprocessed_path)
-        logger.info(f"Writing to {all_votes_path}")
-
-        df_all_votes.write_csv(all_votes_path)
-
-        file = get_votes_parquet_path(legislature_id, preprocessed_path)
-        logger.info(f"Writing to {file}")
-        df_all_votes.write_parquet(file)
+    votes_paths = get_votes_paths(legislature_id, preprocessed_path, votes_formats)
+    # parquet or ipc output can be read back and updated incrementally
+    base_file = votes_paths.get(
+        VotesFormatEnum.parquet, votes_paths.get(VotesFormatEnum.ipc)
+    )
+    if len(votes_paths) == 0:
+        logger.info(f"No votes output format requested ({votes_formats=}), skipping")
+    else:
+        vote_files = check_stored_vote_ids(
+            legislature_id=legislature_id, path=raw_path
+        )[legislature_id]
+        votes_outputs_exist = all(f.exists() for f in votes_paths.values())
+
+        if incremental and votes_outputs_exist and base_file is not None:
+            df_all_votes = update_votes_data(
+                legislature_id,
+                raw_path,
+                preprocessed_path,
+                vote_files,
+                state,
+                validate=validate,
+                base_file=base_file,
+            )
+            if df_all_votes is None:
+                logger.info(f"{base_file} is up to date, skipping")
+        elif (
+            incremental
+            and votes_outputs_exist
+            and stage_is_up_to_date(
+                get_votes_artifact_name(legislature_id),
+                list(vote_files.values()),
+                list(votes_paths.values()),
+                raw_path,
+                state,
+            )
+        ):
+            df_all_votes = None
+            logger.info(f"{list(votes_paths.values())} up to date, skipping")
+        else:
+            df_all_votes = compile_votes_data(
+                legislature_id,
+                raw_path,
+                validate=validate,
+                poll_ids=list(vote_files),
+            )
+            df_all_votes = transform_votes_data(df_all_votes)
+
+        if not dry and df_all_votes is not None:
+            write_votes_data(df_all_votes, votes_paths, profile=profile)
+            record_stage(
+                get_votes_artifact_name(legislature_id),
+                list(vote_files.values()),
+                raw_path,
+                state,
+                preprocessed_path,
+            )
+
+    # votes fact table
+    fact_file = get_votes_fact_parquet_path(legislature_id, preprocessed_path)
+    inputs_updated = any(df is not None for df in [df_polls, df_mandates, df_all_votes])
+    if incremental and fact_file.exists() and not inputs_updated:
+        logger.info(f"{fact_file} is up to date, skipping")
+    elif df_all_votes is None and (base_file is None or not base_file.exists()):
+        logger.warning(
+            f"Cannot build {fact_file} without parquet or ipc votes output, skipping"
+        )
+    else:
+        df_polls = (
+            load_polls_data(polls_file, profile=OutputProfileEnum.default)
+            if df_polls is None
+            else df_polls
+        )
+        df_mandates = (
+            load_mandates_data(mandates_file, profile=OutputProfileEnum.default)
+            if df_mandates is None
+            else df_mandates
+        )
+        df_all_votes = (
+            read_votes_data(base_file)  # type: ignore
+            if df_all_votes is None
+            else df_all_votes
+        )
+        df_fact = get_votes_fact_data(df_all_votes, df_mandates, df_polls)
+        if not dry:
+            logger.info(f"Writing to {fact_file}")
+            df_fact.write_parquet(fact_file)
 
     dt = perf_counter() - start_time
     logger.info(
@@ -4,7 +4,6 @@ import logging
 from pathlib import Path
 from time import perf_counter
 
-import pandas as pd
 import polars as pl
 import tqdm
 import xlrd
@@ -154,6 +153,9 @@ def read_excel(file: Path) -> pl.DataFrame:
             df = dfs.with_columns(**{"sheet_name": pl.lit("")})
 
     except:
+        # pandas is only needed for the xlrd fallback
+        import pandas as pd
+
         try:
             df = pd.read_excel(file, engine="xlrd")
 
@@ -1,12 +1,69 @@
 import datetime
+from collections import OrderedDict
+from typing import Callable, Hashable
 
 import ipywidgets as widgets
-import matplotlib.pyplot as plt
 import polars as pl
 
+from bundestag.ml import render
 from bundestag.ml import similarity as sim
 
 
+class LRUCache:
+    """A bounded least recently used cache with hit and miss counters.
+
+    Attributes:
+        maxsize (int): Maximum number of entries, the least recently used is evicted first.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups which had to be computed.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        """Initializes an empty cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 32.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, pl.DataFrame] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], pl.DataFrame]
+    ) -> pl.DataFrame:
+        """Returns the cached value for `key`, calling `compute` to create it if missing.
+
+        Args:
+            key (Hashable): The cache key.
+            compute (Callable[[], pl.DataFrame]): Creates the value on a cache miss.
+
+        Returns:
+            pl.DataFrame: The cached or computed value.
+        """
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+        self.misses += 1
+        value = compute()
+        if self.maxsize > 0:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class GUI:
     """Base class for creating interactive GUIs in a Jupyter environment
     to explore voting similarity.
@@ -25,7 +82,9 @@ class GUI:
         df (pl.DataFrame): The main DataFrame with voting data.
         mdbs (pl.Series): A Series of unique MdB names.
         parties (pl.Series): A Series of unique party names.
-        party_votes (pl.DataFrame): A pre-processed DataFrame with votes aggregated by party.
+        party_votes (pl.DataFrame): A pre-processed DataFrame with votes aggregated by party, in the wide layout.
+        cube (sim.VoteCube): The date sorted votes used for date range selection.
+        cache (LRUCache): Similarity frames keyed by (entity, start_date, end_date).
     """
 
     name_widget: widgets.Combobox
@@ -38,17 +97,22 @@ class GUI:
     mdbs: pl.Series
     parties: pl.Series
     party_votes: pl.DataFrame
+    cube: sim.VoteCube
+    cache: LRUCache
 
-    def __init__(self, df: pl.DataFrame):
+    def __init__(self, df: pl.DataFrame, cache_size: int = 32):
         """Initializes the GUI with the voting data.
 
         Args:
             df (pl.DataFrame): The main DataFrame containing detailed voting records.
+            cache_size (int, optional): Number of similarity results kept for repeated queries. Defaults to 32.
         """
         self.df = df
         self.mdbs = df["Bezeichnung"].unique()
         self.parties = df["Fraktion/Gruppe"].unique()
-        self.party_votes = sim.get_votes_by_party(df)
+        self.cube = sim.build_vote_cube(df)
+        self.party_votes = self.cube.party_votes
+        self.cache = LRUCache(maxsize=cache_size)
         self.init_widgets()
 
     def init_widgets(self):
@@ -61,6 +125,87 @@ class GUI:
             "Not implemented in GUI, needs to be specified by child class"
         )
 
+    def compute_similarity(
+        self,
+        name: str,
+        start_date: datetime.date | None,
+        end_date: datetime.date | None,
+    ) -> pl.DataFrame:
+        """Computes the similarity frame for the selected entity and date range.
+
+        This method must be implemented by a subclass.
+
+        Args:
+            name (str): The selected entity (e.g., MdB or party).
+            start_date (datetime.date | None): The start date for the filter.
+            end_date (datetime.date | None): The end date for the filter.
+
+        Returns:
+            pl.DataFrame: The aligned votes with a "similarity" column.
+        """
+        raise NotImplementedError(
+            "Not implemented in GUI, needs to be specified by child class"
+        )
+
+    def get_similarity(
+        self,
+        name: str,
+        start_date: datetime.date | None,
+        end_date: datetime.date | None,
+    ) -> pl.DataFrame:
+        """Same as `compute_similarity`, but served from `cache` for repeated queries.
+
+        Args:
+            name (str): The selected entity (e.g., MdB or party).
+            start_date (datetime.date | None): The start date for the filter.
+            end_date (datetime.date | None): The end date for the filter.
+
+        Returns:
+            pl.DataFrame: The aligned votes with a "similarity" column.
+        """
+        # same as filter_dfs: no date filter unless both dates are set
+        if start_date is None or end_date is None:
+            start_date = end_date = None
+        return self.cache.get_or_compute(
+            (name, start_date, end_date),
+            lambda: self.compute_similarity(name, start_date, end_date),
+        )
+
+    def show_similarity(
+        self,
+        df: pl.DataFrame,
+        name: str,
+        party_col: str,
+        title_overall: str,
+        title_over_time: str,
+    ):
+        """Pre-aggregates the similarity frame and draws it into `display_widget`.
+
+        Uses `render.prepare_render_job` and `render.draw_similarity_figure`, so the
+        figure has one point per similarity bin and party instead of one per poll.
+
+        Args:
+            df (pl.DataFrame): The aligned votes with a "similarity" column, see `get_similarity`.
+            name (str): The selected entity (e.g., MdB or party).
+            party_col (str): The column containing the compared party.
+            title_overall (str): Title of the overall similarity panel.
+            title_over_time (str): Title of the similarity over time panel.
+        """
+        from IPython.display import display
+
+        job = render.prepare_render_job(
+            df,
+            name=name,
+            party_col=party_col,
+            title_overall=title_overall,
+            title_over_time=title_over_time,
+        )
+        fig = render.draw_similarity_figure(job)
+
+        self.display_widget.clear_output()
+        with self.display_widget:
+            display(fig)
+
     def render(self):
         """Renders the GUI widgets in a vertical box layout.
 
@@ -83,6 +228,8 @@ class GUI:
     ) -> tuple[pl.DataFrame, pl.DataFrame]:
         """Filters the main and party vote DataFrames based on a date range.
 
+        The selection is a binary search slice of the precomputed `cube`.
+
         Args:
             start_date (datetime.date | None): The start date for the filter.
             end_date (datetime.date | None): The end date for the filter.
@@ -96,11 +243,10 @@ class GUI:
         if start_date is None or end_date is None:
             return self.df, self.party_votes
 
-        df = self.df.filter(pl.col("date").is_between(start_date, end_date))
-        party_votes = self.party_votes.filter(
-            pl.col("date").is_between(start_date, end_date)
+        return (
+            self.cube.get_votes(start_date, end_date),
+            self.cube.get_party_votes(start_date, end_date),
         )
-        return df, party_votes
 
 
 class MdBGUI(GUI):
@@ -134,12 +280,34 @@ class MdBGUI(GUI):
         self.start_widget = widgets.DatePicker(description="Start date")
         self.end_widget = widgets.DatePicker(description="End date")
 
+    def compute_similarity(
+        self,
+        name: str,
+        start_date: datetime.date | None,
+        end_date: datetime.date | None,
+    ) -> pl.DataFrame:
+        """Computes the voting similarity between an MdB and all parties.
+
+        Args:
+            name (str): The MdB.
+            start_date (datetime.date | None): The start date for the filter.
+            end_date (datetime.date | None): The end date for the filter.
+
+        Returns:
+            pl.DataFrame: The MdB's votes aligned with the parties' votes, with a "similarity" column.
+        """
+        _, party_votes_pivoted = self.filter_dfs(start_date, end_date)
+        mdb_votes = self.cube.get_mdb_votes(name, start_date, end_date)
+
+        mdb_vs_parties = sim.align_mdb_with_parties(mdb_votes, party_votes_pivoted)
+        return sim.compute_similarity(mdb_vs_parties, suffix="_party")
+
     def on_click(self, change):
         """Callback function for the submit button click event.
 
-        This function retrieves the selected MdB and date range, filters the data,
-        computes the voting similarity between the MdB and all parties, and
-        displays the resulting plots.
+        This function retrieves the selected MdB and date range, computes (or
+        looks up) the voting similarity between the MdB and all parties, and
+        displays the pre-aggregated plots, see `show_similarity`.
 
         Args:
             change: The event object from the button click.
@@ -154,24 +322,14 @@ class MdBGUI(GUI):
             f"Selected: MdB = {mdb}, date range = {start_date} - {end_date}"
         )
 
-        df, party_votes = self.filter_dfs(start_date, end_date)
-        party_votes_pivoted = sim.pivot_party_votes_df(party_votes)
-
-        mdb_votes = sim.prepare_votes_of_mdb(df, mdb)
-
-        mdb_vs_parties = sim.align_mdb_with_parties(mdb_votes, party_votes_pivoted)
-        mdb_vs_parties = sim.compute_similarity(mdb_vs_parties, suffix="_party")
-
-        self.display_widget.clear_output()
-        with self.display_widget:
-            sim.plot(
-                mdb_vs_parties,
-                title_overall=f"Overall similarity of {mdb} with all parties",
-                title_over_time=f"{mdb} vs time",
-                party_col="Fraktion/Gruppe_party",
-            )
-            plt.tight_layout()
-            plt.show()
+        mdb_vs_parties = self.get_similarity(mdb, start_date, end_date)
+        self.show_similarity(
+            mdb_vs_parties,
+            name=mdb,
+            party_col="Fraktion/Gruppe_party",
+            title_overall=f"Overall similarity of {mdb} with all parties",
+            title_over_time=f"{mdb} vs time",
+        )
 
 
 class PartyGUI(GUI):
@@ -205,12 +363,34 @@ class PartyGUI(GUI):
         self.start_widget = widgets.DatePicker(description="Start date")
         self.end_widget = widgets.DatePicker(description="End date")
 
+    def compute_similarity(
+        self,
+        name: str,
+        start_date: datetime.date | None,
+        end_date: datetime.date | None,
+    ) -> pl.DataFrame:
+        """Computes the voting similarity between a party and all other parties.
+
+        Args:
+            name (str): The party.
+            start_date (datetime.date | None): The start date for the filter.
+            end_date (datetime.date | None): The end date for the filter.
+
+        Returns:
+            pl.DataFrame: The party's votes aligned with the other parties' votes, with a "similarity" column.
+        """
+        _, party_votes_pivoted = self.filter_dfs(start_date, end_date)
+
+        return sim.align_party_with_all_parties(party_votes_pivoted, name).pipe(
+            sim.compute_similarity, suffix="_b"
+        )
+
     def on_click(self, change):
         """Callback function for the submit button click event.
 
-        This function retrieves the selected party and date range, filters the data,
-        computes the voting similarity between the selected party and all others,
-        and displays the resulting plots.
+        This function retrieves the selected party and date range, computes (or
+        looks up) the voting similarity between the selected party and all others,
+        and displays the pre-aggregated plots, see `show_similarity`.
 
         Args:
             change: The event object from the button click.
@@ -225,20 +405,11 @@ class PartyGUI(GUI):
             f"Selected: Party = {party}, date range = {start_date} - {end_date}"
         )
 
-        _, party_votes = self.filter_dfs(start_date, end_date)
-        party_votes_pivoted = sim.pivot_party_votes_df(party_votes)
-
-        partyA_vs_rest = sim.align_party_with_all_parties(
-            party_votes_pivoted, party
-        ).pipe(sim.compute_similarity, suffix="_b")
-
-        self.display_widget.clear_output()
-        with self.display_widget:
-            sim.plot(
-                partyA_vs_rest,
-                title_overall=f"Overall similarity of {party} with all other parties",
-                title_over_time=f"{party} vs time",
-                party_col="Fraktion/Gruppe_b",
-            )
-            plt.tight_layout()
-            plt.show()
+        partyA_vs_rest = self.get_similarity(party, start_date, end_date)
+        self.show_similarity(
+            partyA_vs_rest,
+            name=party,
+            party_col="Fraktion/Gruppe_b",
+            title_overall=f"Overall similarity of {party} with all other parties",
+            title_over_time=f"{party} vs time",
+        )
@@ -0,0 +1,193 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from bundestag.ml.neighbours import get_blocks, get_top_k, neighbours_to_frame
+
+if TYPE_CHECKING:
+    from fastai.tabular.all import TabularLearner
+
+logger = logging.getLogger(__name__)
+
+# fastai's category for missing and unseen values, see `fastai.tabular.core.Categorify`
+NA_CATEGORY = "#na#"
+
+SCHEMA_EMBEDDING_NEIGHBOURS = pl.Schema(
+    {
+        "label": pl.String(),
+        "neighbour": pl.String(),
+        "rank": pl.UInt32(),
+        "similarity": pl.Float32(),
+    }
+)
+
+
+@dataclass
+class EmbeddingIndex:
+    """Exact cosine nearest neighbour index over the embeddings of one categorical variable.
+
+    Queries are a single matrix-vector product with the L2 normalised float32 vectors
+    and an `np.argpartition`, which takes well below a millisecond for the few
+    thousand politicians or polls of the data set.
+
+    Attributes:
+        name (str): The categorical variable, e.g. "politician name" or "poll_id".
+        labels (list[str]): The category labels, in row order of `vectors`.
+        vectors (np.ndarray): The raw float32 embeddings, shape (n_labels, n_dims).
+    """
+
+    name: str
+    labels: list[str]
+    vectors: np.ndarray
+    normalised: np.ndarray = field(init=False, repr=False)
+    positions: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.vectors = np.ascontiguousarray(self.vectors, dtype=np.float32)
+        norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.normalised = self.vectors / norms
+        self.positions = {label: i for i, label in enumerate(self.labels)}
+
+    def query(self, label: str, k: int = 10) -> pl.DataFrame:
+        """Looks up the `k` labels most similar to `label`, e.g. the polls most similar to a poll.
+
+        Args:
+            label (str): The query label.
+            k (int, optional): Number of neighbours. Defaults to 10.
+
+        Raises:
+            ValueError: If `label` is not in the index.
+
+        Returns:
+            pl.DataFrame: The neighbours with schema `SCHEMA_EMBEDDING_NEIGHBOURS`, sorted by rank.
+        """
+        if label not in self.positions:
+            raise ValueError(f"{label} not found in embeddings of {self.name}")
+        rows = np.array([self.positions[label]])
+        return self.get_neighbours(rows, k)
+
+    def get_all_neighbours(self, k: int = 10, block_size: int = 1024) -> pl.DataFrame:
+        """Computes the `k` most similar labels of every label.
+
+        Query rows are processed in blocks of `block_size`, so at most a
+        (block_size x n_labels) similarity block is held in memory.
+
+        Args:
+            k (int, optional): Number of neighbours per label. Defaults to 10.
+            block_size (int, optional): Number of query rows per block. Defaults to 1024.
+
+        Returns:
+            pl.DataFrame: The neighbours with schema `SCHEMA_EMBEDDING_NEIGHBOURS`.
+        """
+        n = len(self.labels)
+        if n < 2 or k < 1:
+            return pl.DataFrame(schema=SCHEMA_EMBEDDING_NEIGHBOURS)
+
+        return pl.concat(
+            [self.get_neighbours(rows, k) for rows in get_blocks(n, block_size)]
+        )
+
+    def get_neighbours(self, rows: np.ndarray, k: int) -> pl.DataFrame:
+        """Computes the `k` most similar labels of a block of rows, excluding each row itself.
+
+        Args:
+            rows (np.ndarray): Indices of the query rows.
+            k (int): Number of neighbours per query row.
+
+        Returns:
+            pl.DataFrame: The neighbours with schema `SCHEMA_EMBEDDING_NEIGHBOURS`.
+        """
+        similarity = self.normalised[rows] @ self.normalised.T
+        neighbours, similarities = get_top_k(similarity, k, exclude=rows)
+        return neighbours_to_frame(
+            self.labels, rows, neighbours, similarities, SCHEMA_EMBEDDING_NEIGHBOURS
+        )
+
+
+def get_embedding_indices(learn: "TabularLearner") -> dict[str, EmbeddingIndex]:
+    """Extracts the full, unreduced embeddings of every categorical variable of a learner.
+
+    Unlike `vote_prediction.get_embeddings` no dimensionality reduction is applied.
+    fastai's placeholder category `NA_CATEGORY` for missing and unseen values is
+    dropped, so it is never returned as a neighbour.
+
+    Args:
+        learn (TabularLearner): The trained fastai learner.
+
+    Returns:
+        dict[str, EmbeddingIndex]: One index per categorical variable.
+    """
+    indices = {}
+    for i, name in enumerate(learn.dls.classes):
+        weights = learn.model.embeds[i].weight.detach().cpu().numpy()  # type: ignore
+        labels = [str(c) for c in learn.dls.classes[name]]
+        keep = [j for j, label in enumerate(labels) if label != NA_CATEGORY]
+        indices[name] = EmbeddingIndex(
+            name=name, labels=[labels[j] for j in keep], vectors=weights[keep]
+        )
+    return indices
+
+
+def get_embeddings_path(path: Path, name: str) -> Path:
+    """Constructs the file path of the stored embeddings of one categorical variable.
+
+    Args:
+        path (Path): The embeddings directory.
+        name (str): The categorical variable.
+
+    Returns:
+        Path: The full path to the embeddings Parquet file.
+    """
+    return path / f"embeddings_{name.replace(' ', '_')}.parquet"
+
+
+def save_embeddings(indices: dict[str, EmbeddingIndex], path: Path) -> list[Path]:
+    """Writes the raw embeddings as float32 fixed size arrays to one Parquet file per variable.
+
+    Args:
+        indices (dict[str, EmbeddingIndex]): The embeddings, see `get_embedding_indices`.
+        path (Path): The embeddings directory, created if missing.
+
+    Returns:
+        list[Path]: The written files.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    files = []
+    for name, index in indices.items():
+        file = get_embeddings_path(path, name)
+        n_dims = index.vectors.shape[1]
+        logger.info(f"Writing {len(index.labels)} x {n_dims} embeddings to {file}")
+        pl.DataFrame(
+            {
+                "name": [name] * len(index.labels),
+                "label": index.labels,
+                "embedding": pl.Series(
+                    index.vectors, dtype=pl.Array(pl.Float32, n_dims)
+                ),
+            }
+        ).write_parquet(file)
+        files.append(file)
+    return files
+
+
+def load_embeddings(file: Path) -> EmbeddingIndex:
+    """Loads embeddings written by `save_embeddings` into an `EmbeddingIndex`.
+
+    Args:
+        file (Path): The embeddings Parquet file, see `get_embeddings_path`.
+
+    Returns:
+        EmbeddingIndex: The index.
+    """
+    logger.debug(f"Reading {file}")
+    df = pl.read_parquet(file)
+    return EmbeddingIndex(
+        name=df["name"].first(),
+        labels=df["label"].to_list(),
+        vectors=df["embedding"].to_numpy(),
+    )
@@ -0,0 +1,249 @@
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+import bundestag.data.transform.bundestag_sheets as transform_bs
+from bundestag.ml.neighbours import get_blocks, get_top_k, neighbours_to_frame
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_MDB_NEIGHBOURS = pl.Schema(
+    {
+        "Bezeichnung": pl.String(),
+        "Bezeichnung_b": pl.String(),
+        "rank": pl.UInt32(),
+        "similarity": pl.Float32(),
+    }
+)
+
+
+@dataclass
+class MdBVoteMatrix:
+    """Sparse one-hot encoded votes of all MdBs.
+
+    Attributes:
+        matrix (sparse.csr_matrix): Row normalised one-hot votes, shape (n_mdbs, n_polls * n_vote_cols).
+            Column `poll_index * n_vote_cols + vote_index` is set if the MdB cast vote
+            `transform_bs.VOTE_COLS[vote_index]` in poll `poll_index`.
+        mdbs (list[str]): MdB names, in row order.
+        polls (pl.DataFrame): The date sorted polls (`date`, `title`), in column block order.
+    """
+
+    matrix: "sparse.csr_matrix"
+    mdbs: list[str]
+    polls: pl.DataFrame
+
+
+def get_mdb_vote_matrix(df: pl.DataFrame) -> MdBVoteMatrix:
+    """Builds the sparse one-hot MdB x (poll, vote outcome) matrix.
+
+    Rows are L2 normalised, so the dot product of two rows is the cosine similarity
+    of the two MdBs' voting records, i.e. the number of polls in which both cast the
+    same vote divided by the geometric mean of the number of polls each took part in.
+
+    Args:
+        df (pl.DataFrame): The votes, with columns "Bezeichnung", "date", "title" and "vote".
+
+    Returns:
+        MdBVoteMatrix: The sparse vote matrix.
+    """
+    from scipy import sparse
+
+    n_vote_cols = len(transform_bs.VOTE_COLS)
+    mdbs = sorted(df["Bezeichnung"].unique().to_list())
+    polls = df.select(["date", "title"]).unique().sort(["date", "title"])
+
+    indexed = (
+        df.select(["Bezeichnung", "date", "title", "vote"])
+        .join(polls.with_row_index(name="poll_index"), on=["date", "title"])
+        .select(
+            pl.col("Bezeichnung")
+            .replace_strict(mdbs, list(range(len(mdbs))), return_dtype=pl.Int64)
+            .alias("row"),
+            (
+                pl.col("poll_index").cast(pl.Int64) * n_vote_cols
+                + pl.col("vote")
+                .cast(pl.Enum(transform_bs.VOTE_COLS))
+                .to_physical()
+                .cast(pl.Int64)
+            ).alias("col"),
+        )
+        .unique()
+    )
+    logger.info(
+        f"Building sparse vote matrix of {len(mdbs)} MdBs x {len(polls)} polls "
+        f"from {len(indexed)} votes"
+    )
+
+    matrix = sparse.csr_matrix(
+        (
+            np.ones(len(indexed), dtype=np.float32),
+            (indexed["row"].to_numpy(), indexed["col"].to_numpy()),
+        ),
+        shape=(len(mdbs), len(polls) * n_vote_cols),
+    )
+    norms = np.sqrt(np.asarray(matrix.sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix = sparse.csr_matrix(sparse.diags(1.0 / norms).dot(matrix), dtype=np.float32)
+
+    return MdBVoteMatrix(matrix=matrix, mdbs=mdbs, polls=polls)
+
+
+def get_top_k_block(
+    matrix: "sparse.csr_matrix", rows: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Computes the `k` most similar rows of `matrix` for a block of query rows.
+
+    The query rows themselves are excluded from their own results.
+
+    Args:
+        matrix (sparse.csr_matrix): The row normalised vote matrix.
+        rows (np.ndarray): Indices of the query rows.
+        k (int): Number of neighbours per query row.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Neighbour indices and similarities, both of shape
+            (len(rows), k), sorted by descending similarity.
+    """
+    similarity = (matrix[rows] @ matrix.T).toarray()
+    return get_top_k(similarity, k, exclude=rows)
+
+
+def get_mdb_neighbours(
+    vote_matrix: MdBVoteMatrix,
+    k: int = 10,
+    block_size: int = 256,
+    n_jobs: int | None = None,
+) -> pl.DataFrame:
+    """Computes the `k` most similar MdBs of every MdB.
+
+    Query rows are processed in blocks of `block_size`, so at most a
+    (block_size x n_mdbs) dense similarity block is held in memory per thread.
+
+    Args:
+        vote_matrix (MdBVoteMatrix): The sparse vote matrix, see `get_mdb_vote_matrix`.
+        k (int, optional): Number of neighbours per MdB. Defaults to 10.
+        block_size (int, optional): Number of query rows per block. Defaults to 256.
+        n_jobs (int | None, optional): Number of threads, None uses the `ThreadPoolExecutor` default. Defaults to None.
+
+    Returns:
+        pl.DataFrame: The neighbours with schema `SCHEMA_MDB_NEIGHBOURS`.
+    """
+    n_mdbs = len(vote_matrix.mdbs)
+    if n_mdbs < 2 or k < 1:
+        return pl.DataFrame(schema=SCHEMA_MDB_NEIGHBOURS)
+
+    blocks = get_blocks(n_mdbs, block_size)
+    logger.info(
+        f"Computing top {k} neighbours of {n_mdbs} MdBs in {len(blocks)} blocks"
+    )
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        results = list(
+            executor.map(
+                lambda rows: get_top_k_block(vote_matrix.matrix, rows, k), blocks
+            )
+        )
+
+    neighbours = np.concatenate([r[0] for r in results])
+    similarities = np.concatenate([r[1] for r in results])
+    return neighbours_to_frame(
+        vote_matrix.mdbs,
+        np.arange(n_mdbs),
+        neighbours,
+        similarities,
+        SCHEMA_MDB_NEIGHBOURS,
+    )
+
+
+def get_votes_fingerprint(df: pl.DataFrame) -> str:
+    """Computes a key identifying the votes data, used to name cache files.
+
+    The key does not depend on the row order. Row hashes are only stable within
+    one polars version, so updating polars invalidates the cache.
+
+    Args:
+        df (pl.DataFrame): The votes, with columns "Bezeichnung", "date", "title" and "vote".
+
+    Returns:
+        str: Hex key of the votes.
+    """
+    hashes = df.select(["Bezeichnung", "date", "title", "vote"]).hash_rows(seed=0)
+    return hashlib.sha256(hashes.sort().to_numpy().tobytes()).hexdigest()[:16]
+
+
+def get_mdb_neighbours_cache_path(cache_dir: Path, fingerprint: str, k: int) -> Path:
+    """Constructs the file path of cached MdB neighbours.
+
+    Args:
+        cache_dir (Path): The cache directory.
+        fingerprint (str): The votes key, see `get_votes_fingerprint`.
+        k (int): Number of neighbours per MdB.
+
+    Returns:
+        Path: The full path to the neighbours Parquet file.
+    """
+    return cache_dir / f"mdb_neighbours_{fingerprint}_k{k}.parquet"
+
+
+def load_or_compute_mdb_neighbours(
+    df: pl.DataFrame,
+    cache_dir: Path,
+    k: int = 10,
+    block_size: int = 256,
+    n_jobs: int | None = None,
+) -> pl.DataFrame:
+    """Returns the `k` most similar MdBs of every MdB, reading them from `cache_dir` if computed before.
+
+    Args:
+        df (pl.DataFrame): The votes, with columns "Bezeichnung", "date", "title" and "vote".
+        cache_dir (Path): The cache directory, created if missing.
+        k (int, optional): Number of neighbours per MdB. Defaults to 10.
+        block_size (int, optional): Number of query rows per block. Defaults to 256.
+        n_jobs (int | None, optional): Number of threads. Defaults to None.
+
+    Returns:
+        pl.DataFrame: The neighbours with schema `SCHEMA_MDB_NEIGHBOURS`.
+    """
+    file = get_mdb_neighbours_cache_path(cache_dir, get_votes_fingerprint(df), k)
+    if file.exists():
+        logger.debug(f"Reading cached MdB neighbours from {file}")
+        return pl.read_parquet(file)
+
+    neighbours = get_mdb_neighbours(
+        get_mdb_vote_matrix(df), k=k, block_size=block_size, n_jobs=n_jobs
+    )
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Writing MdB neighbours to {file}")
+    neighbours.write_parquet(file)
+    return neighbours
+
+
+def get_most_similar_mdbs(
+    neighbours: pl.DataFrame, mdb: str, k: int | None = None
+) -> pl.DataFrame:
+    """Looks up the most similar MdBs of `mdb`.
+
+    Args:
+        neighbours (pl.DataFrame): The precomputed neighbours, see `get_mdb_neighbours`.
+        mdb (str): The MdB name.
+        k (int | None, optional): Number of neighbours to return, None returns all stored ones. Defaults to None.
+
+    Raises:
+        ValueError: If `mdb` is not found in `neighbours`.
+
+    Returns:
+        pl.DataFrame: The neighbours of `mdb`, sorted by rank.
+    """
+    res = neighbours.filter(pl.col("Bezeichnung") == mdb).sort("rank")
+    if len(res) == 0:
+        raise ValueError(f"{mdb} not found in column 'Bezeichnung'")
+    return res if k is None else res.head(k)
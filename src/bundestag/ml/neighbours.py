@@ -0,0 +1,79 @@
+import numpy as np
+import polars as pl
+
+
+def get_blocks(n: int, block_size: int) -> list[np.ndarray]:
+    """Splits the row indices `0..n-1` into consecutive blocks of at most `block_size` rows.
+
+    Args:
+        n (int): Number of rows.
+        block_size (int): Number of rows per block.
+
+    Returns:
+        list[np.ndarray]: The row indices of each block.
+    """
+    return [
+        np.arange(start, min(start + block_size, n))
+        for start in range(0, n, block_size)
+    ]
+
+
+def get_top_k(
+    similarity: np.ndarray, k: int, exclude: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Selects the `k` most similar columns of each row of a dense similarity block.
+
+    Args:
+        similarity (np.ndarray): The similarities, shape (n_queries, n_candidates). Modified in place if `exclude` is given.
+        k (int): Number of neighbours per query, capped at the number of candidates.
+        exclude (np.ndarray | None, optional): Per query row the column to exclude, e.g. the query itself. Defaults to None.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Neighbour indices and similarities, both of shape
+            (n_queries, k), sorted by descending similarity.
+    """
+    n_queries, n_candidates = similarity.shape
+    if exclude is not None:
+        similarity[np.arange(n_queries), exclude] = -np.inf
+        n_candidates -= 1
+
+    k = min(k, n_candidates)
+    top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    top_similarity = np.take_along_axis(similarity, top, axis=1)
+    order = np.argsort(-top_similarity, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(
+        top_similarity, order, axis=1
+    )
+
+
+def neighbours_to_frame(
+    labels: list[str],
+    rows: np.ndarray,
+    neighbours: np.ndarray,
+    similarities: np.ndarray,
+    schema: pl.Schema,
+) -> pl.DataFrame:
+    """Turns top k results into one row per (query, neighbour) pair.
+
+    Args:
+        labels (list[str]): The labels of all rows.
+        rows (np.ndarray): The query row indices, shape (n_queries,).
+        neighbours (np.ndarray): The neighbour row indices, shape (n_queries, k), see `get_top_k`.
+        similarities (np.ndarray): The neighbour similarities, shape (n_queries, k).
+        schema (pl.Schema): The output schema, with the columns query label, neighbour label, rank and similarity in that order.
+
+    Returns:
+        pl.DataFrame: The neighbours with `schema`, ranked from 1 per query.
+    """
+    label_col, neighbour_col, rank_col, similarity_col = schema.names()
+    labels_arr = np.asarray(labels, dtype=object)
+    n_neighbours = neighbours.shape[1]
+    return pl.DataFrame(
+        {
+            label_col: np.repeat(labels_arr[rows], n_neighbours).tolist(),
+            neighbour_col: labels_arr[neighbours.ravel()].tolist(),
+            rank_col: np.tile(np.arange(1, n_neighbours + 1), len(rows)),
+            similarity_col: similarities.ravel(),
+        },
+        schema=schema,
+    )
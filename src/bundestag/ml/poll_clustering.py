@@ -1,19 +1,36 @@
+import hashlib
 import itertools
+import json
 import logging
-from typing import Any
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
 
-import gensim
-import gensim.corpora as corpora
 import numpy as np
 import polars as pl
-import spacy
-from plotnine import aes, geom_histogram, ggplot, labs, scale_fill_manual
+
+if TYPE_CHECKING:
+    # spacy, gensim and plotnine are only imported when used, see `tests/test_importtime.py`
+    import gensim.corpora as corpora
+    import scipy.sparse
+    import spacy
+    from plotnine import ggplot
 
 logger = logging.getLogger(__name__)
 
+SCHEMA_CLEANED_TEXTS_CACHE = pl.Schema(
+    {
+        "poll_id": pl.Int64(),
+        "column": pl.String(),
+        "text_hash": pl.String(),
+        "model": pl.String(),
+        "tokens": pl.List(pl.String()),
+    }
+)
+
 
 def remove_stopwords_and_punctuation(
-    text: str, nlp: spacy.language.Language
+    text: str, nlp: "spacy.language.Language"
 ) -> list[str]:
     """Removes stopwords and punctuation from a text using a spaCy model.
 
@@ -39,45 +56,71 @@ def remove_numeric_and_empty(text: list[str]) -> list[str]:
     return [w for w in text if not (w.isnumeric() or w.isspace())]
 
 
-def make_topic_scores_dense(scores: list[list[tuple[int, Any]]]) -> np.ndarray:
+def make_topic_scores_dense(
+    scores: list[list[tuple[int, Any]]],
+    num_topics: int | None = None,
+    sparse: bool = False,
+) -> "np.ndarray | scipy.sparse.csr_matrix":
     """Transforms a sparse list of topic scores into a dense numpy array.
 
     The input is typically the output of a gensim LDA model, which is a list of lists of (topic_id, score) tuples.
     This function converts it into a 2D numpy array of shape (num_documents, num_topics).
+    The tuples are read into index and value arrays in one `np.fromiter` pass and scattered
+    in a single numpy assignment, or passed to scipy as coordinates if `sparse` is set.
 
     Args:
         scores (list[list[tuple[int, Any]]]): A list of documents, where each document is a list of (topic_id, score) tuples.
+        num_topics (int | None, optional): Number of columns. None uses the largest topic id + 1. Defaults to None.
+        sparse (bool, optional): If True, returns a `scipy.sparse.csr_matrix`, which avoids allocating the zeros of documents with few topics among many. Defaults to False.
 
     Raises:
-        ValueError: If any topic ID is not an integer.
+        ValueError: If any topic ID is not an integer, e.g. a float like 1.0.
 
     Returns:
-        np.ndarray: A dense numpy array of topic scores.
+        np.ndarray | scipy.sparse.csr_matrix: A dense numpy array, or sparse matrix, of topic scores.
     """
 
-    topic_ids = [v for (v, _) in itertools.chain(*scores)]
-    non_int_topic_ids = [v for v in topic_ids if not isinstance(v, int)]
+    non_int_topic_ids = [
+        v
+        for v, _ in itertools.chain.from_iterable(scores)
+        if not isinstance(v, (int, np.integer))
+    ]
     if len(non_int_topic_ids) > 0:
         raise ValueError(
             f"Unexpectedly received non-int topic ids: {non_int_topic_ids}"
         )
 
-    ntopic = int(max(topic_ids))  # type: ignore
+    lengths = np.fromiter(
+        (len(doc) for doc in scores), dtype=np.int64, count=len(scores)
+    )
+    pairs = np.fromiter(
+        itertools.chain.from_iterable(scores),
+        dtype=[("topic_id", np.int64), ("score", np.float64)],
+        count=int(lengths.sum()),
+    )
+    topic_ids, values = pairs["topic_id"], pairs["score"]
+
     ndoc = len(scores)
+    if num_topics is None:
+        num_topics = int(topic_ids.max()) + 1 if len(topic_ids) > 0 else 0
+    rows = np.repeat(np.arange(ndoc), lengths)
 
     logger.debug(
-        f"Densifying list of {ntopic} topic scores to {ndoc}-by-{ntopic} array"
+        f"Densifying list of {len(pairs)} topic scores to {ndoc}-by-{num_topics} "
+        f"{'sparse' if sparse else 'dense'} array"
     )
 
-    dense = np.zeros(shape=(ndoc, ntopic + 1))
+    if sparse:
+        from scipy import sparse as sp
+
+        return sp.csr_matrix((values, (rows, topic_ids)), shape=(ndoc, num_topics))
 
-    for i, doc in enumerate(scores):
-        for topic_id, score in doc:
-            dense[i, topic_id] = score
+    dense = np.zeros(shape=(ndoc, num_topics))
+    dense[rows, topic_ids] = values
     return dense
 
 
-def clean_text(s: str, nlp: spacy.language.Language) -> list[str]:
+def clean_text(s: str, nlp: "spacy.language.Language") -> list[str]:
     """Performs a series of cleaning steps on a raw text string.
 
     The cleaning process includes:
@@ -93,12 +136,264 @@ def clean_text(s: str, nlp: spacy.language.Language) -> list[str]:
         list[str]: A list of cleaned tokens.
     """
     logger.debug("Cleaning texts")
-    _s = " ".join(s.split("\n")).replace("\xa0", " ")
+    _s = normalize_whitespace(s)
     _texts = remove_stopwords_and_punctuation(_s, nlp)
     _texts = remove_numeric_and_empty(_texts)
     return _texts
 
 
+def normalize_whitespace(s: str) -> str:
+    """Replaces newlines and non-breaking spaces with plain spaces.
+
+    Args:
+        s (str): The raw input string.
+
+    Returns:
+        str: The normalized string.
+    """
+    return " ".join(s.split("\n")).replace("\xa0", " ")
+
+
+def clean_texts(
+    texts: Iterable[str],
+    nlp: "spacy.language.Language",
+    batch_size: int = 256,
+    n_process: int = 1,
+) -> list[list[str]]:
+    """Same as `clean_text` for many texts, streamed through `nlp.pipe` in batches.
+
+    Stopwords and punctuation are lexical attributes, so all pipeline components
+    (tagger, parser, NER, ...) are disabled and only the tokenizer runs.
+
+    Args:
+        texts (Iterable[str]): The raw input strings.
+        nlp (spacy.language.Language): The spaCy language model to use for cleaning.
+        batch_size (int, optional): Number of texts per batch. Defaults to 256.
+        n_process (int, optional): Number of processes, see `spacy.language.Language.pipe`. Defaults to 1.
+
+    Returns:
+        list[list[str]]: The cleaned tokens of each text, in input order.
+    """
+    docs = nlp.pipe(
+        (normalize_whitespace(s) for s in texts),
+        batch_size=batch_size,
+        n_process=n_process,
+        disable=nlp.pipe_names,
+    )
+    return [
+        remove_numeric_and_empty([str(w) for w in doc if not (w.is_stop or w.is_punct)])
+        for doc in docs
+    ]
+
+
+def get_model_id(nlp: "spacy.language.Language") -> str:
+    """Identifies a spaCy model and version, used as part of the cleaned texts cache key.
+
+    Args:
+        nlp (spacy.language.Language): The spaCy language model.
+
+    Returns:
+        str: The model identifier, e.g. "de_core_news_sm-3.8.0+spacy3.8.7".
+    """
+    import spacy
+
+    meta = nlp.meta
+    return f"{meta['lang']}_{meta['name']}-{meta['version']}+spacy{spacy.__version__}"
+
+
+def get_text_hashes(texts: pl.Series) -> pl.Series:
+    """Computes the sha256 hex digest of each text, stable across runs and library versions.
+
+    Args:
+        texts (pl.Series): The raw texts.
+
+    Returns:
+        pl.Series: The hex digests, null for null texts.
+    """
+    return texts.map_elements(
+        lambda t: hashlib.sha256(t.encode("utf8")).hexdigest(),
+        return_dtype=pl.String,
+    )
+
+
+def get_cleaned_texts_cache_path(preprocessed_path: Path) -> Path:
+    """Constructs the file path of the cleaned poll texts cache.
+
+    Args:
+        preprocessed_path (Path): The path to the directory for preprocessed data.
+
+    Returns:
+        Path: The full path to the cache Parquet file.
+    """
+    return preprocessed_path / "cleaned_poll_texts.parquet"
+
+
+def load_cleaned_texts_cache(cache_file: Path) -> pl.DataFrame:
+    """Loads the cleaned texts cache, or an empty one if none was written yet.
+
+    Args:
+        cache_file (Path): The cache Parquet file.
+
+    Returns:
+        pl.DataFrame: The cache with schema `SCHEMA_CLEANED_TEXTS_CACHE`.
+    """
+    if not cache_file.exists():
+        return pl.DataFrame(schema=SCHEMA_CLEANED_TEXTS_CACHE)
+    logger.debug(f"Reading {cache_file}")
+    return pl.read_parquet(cache_file)
+
+
+def clean_texts_cached(
+    df: pl.DataFrame,
+    col: str,
+    nlp: "spacy.language.Language",
+    cache_file: Path,
+    id_col: str = "poll_id",
+    batch_size: int = 256,
+    n_process: int = 1,
+) -> pl.Series:
+    """Same as `clean_texts` for a column of `df`, re-using previously cleaned texts from `cache_file`.
+
+    Cache entries are keyed by poll id, column name, text hash and spaCy model (see
+    `get_model_id`). Only new or changed texts are cleaned, and their entries replace
+    the previous ones of the same poll, column and model in the cache.
+
+    Args:
+        df (pl.DataFrame): The polls.
+        col (str): The column containing the raw texts.
+        nlp (spacy.language.Language): The spaCy language model to use for cleaning.
+        cache_file (Path): The cache Parquet file, created if missing.
+        id_col (str, optional): The column identifying a poll. Defaults to "poll_id".
+        batch_size (int, optional): Number of texts per batch, see `clean_texts`. Defaults to 256.
+        n_process (int, optional): Number of processes, see `clean_texts`. Defaults to 1.
+
+    Returns:
+        pl.Series: The cleaned tokens, aligned with `df`.
+    """
+    key = ["poll_id", "column", "text_hash", "model"]
+    model = get_model_id(nlp)
+    texts = df.select(
+        pl.col(id_col).cast(pl.Int64).alias("poll_id"),
+        pl.lit(col).alias("column"),
+        get_text_hashes(df[col]).alias("text_hash"),
+        pl.lit(model).alias("model"),
+        pl.col(col).alias("text"),
+    )
+
+    cache = load_cleaned_texts_cache(cache_file)
+    texts = texts.join(
+        cache, on=key, how="left", nulls_equal=True, maintain_order="left"
+    )
+
+    missing = texts.filter(pl.col("tokens").is_null() & pl.col("text").is_not_null())
+    missing = missing.unique(subset=key, maintain_order=True)
+    logger.info(
+        f"Cleaning {len(missing)} of {len(texts)} texts of '{col}', "
+        f"the rest is cached in {cache_file}"
+    )
+    if len(missing) > 0:
+        new = missing.select(key).with_columns(
+            tokens=pl.Series(
+                clean_texts(
+                    missing["text"], nlp, batch_size=batch_size, n_process=n_process
+                ),
+                dtype=pl.List(pl.String),
+            )
+        )
+        replaced = cache.join(
+            new.select(["poll_id", "column", "model"]),
+            on=["poll_id", "column", "model"],
+            how="anti",
+        )
+        cache = pl.concat([replaced, new])
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        logger.debug(f"Writing {len(cache)} entries to {cache_file}")
+        cache.write_parquet(cache_file)
+
+        texts = texts.drop("tokens").join(
+            cache, on=key, how="left", nulls_equal=True, maintain_order="left"
+        )
+
+    return texts["tokens"].alias(col)
+
+
+# bump when the files written by `SpacyTransformer.save` change
+TOPIC_MODEL_FORMAT_VERSION = 1
+RE_TOPIC_MODEL_VERSION = re.compile(r"^v(\d+)$")
+
+
+def get_topic_model_versions(path: Path) -> list[int]:
+    """Lists the versions saved by `SpacyTransformer.save` under `path`.
+
+    Args:
+        path (Path): The topic model directory.
+
+    Returns:
+        list[int]: The saved versions, ascending.
+    """
+    if not path.exists():
+        return []
+    return sorted(
+        int(m.group(1))
+        for d in path.iterdir()
+        if d.is_dir() and (m := RE_TOPIC_MODEL_VERSION.match(d.name))
+    )
+
+
+class ParquetDocuments:
+    """Re-iterable tokenized documents, streamed from a list column of one or more Parquet files.
+
+    Only `batch_size` rows are held in memory at a time, so the documents can be
+    passed to `SpacyTransformer.fit_lda` with a `corpus_file`, which iterates them twice.
+
+    Args:
+        files (Path | list[Path]): The Parquet files, e.g. `get_cleaned_texts_cache_path`.
+        col (str): The column containing the lists of tokens.
+        batch_size (int, optional): Number of rows read per batch. Defaults to 10_000.
+    """
+
+    def __init__(self, files: Path | list[Path], col: str, batch_size: int = 10_000):
+        self.files = [files] if isinstance(files, Path) else files
+        self.col = col
+        self.batch_size = batch_size
+
+    def __iter__(self):
+        for file in self.files:
+            logger.debug(f"Streaming documents from {file}")
+            batches = (
+                pl.scan_parquet(file)
+                .select(pl.col(self.col).fill_null([]))
+                .collect_batches(chunk_size=self.batch_size)
+            )
+            for batch in batches:
+                yield from batch[self.col].to_list()
+
+
+def serialize_bow_corpus(
+    dictionary: "corpora.Dictionary",
+    documents: Iterable[list[str]],
+    corpus_file: Path,
+) -> "corpora.MmCorpus":
+    """Writes the bag-of-words vectors of `documents` to a Matrix Market file.
+
+    Args:
+        dictionary (corpora.Dictionary): The gensim dictionary.
+        documents (Iterable[list[str]]): The tokenized documents, consumed once.
+        corpus_file (Path): The `.mm` file, its parent directory is created if missing.
+
+    Returns:
+        corpora.MmCorpus: The corpus, which streams the vectors from `corpus_file` on each iteration.
+    """
+    import gensim.corpora as corpora
+
+    corpus_file.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Serializing bag-of-words corpus to {corpus_file}")
+    corpora.MmCorpus.serialize(
+        str(corpus_file), (dictionary.doc2bow(doc) for doc in documents)
+    )
+    return corpora.MmCorpus(str(corpus_file))
+
+
 class SpacyTransformer:
     nlp_cols: list[str]
 
@@ -110,49 +405,313 @@ class SpacyTransformer:
         Args:
             language (str, optional): The name of the spaCy language model to load. Defaults to "de_core_news_sm".
         """
-        self.nlp: spacy.language.Language = spacy.load(language)
+        self.language = language
+        self._nlp = None
+
+    @property
+    def nlp(self) -> "spacy.language.Language":
+        """The spaCy language model, loaded on first use.
+
+        Only cleaning needs it, so a transformer restored with `load` can `transform`
+        without paying the spaCy start-up cost.
+
+        Returns:
+            spacy.language.Language: The spaCy language model.
+        """
+        if self._nlp is None:
+            import spacy
+
+            logger.debug(f"Loading spaCy model {self.language}")
+            self._nlp = spacy.load(self.language)
+        return self._nlp
+
+    def clean_texts(
+        self, texts: pl.Series, batch_size: int = 256, n_process: int = 1
+    ) -> pl.Series:
+        """Cleans a column of raw texts in batches, see `clean_texts`.
+
+        Args:
+            texts (pl.Series): The raw texts, nulls are kept as nulls.
+            batch_size (int, optional): Number of texts per batch. Defaults to 256.
+            n_process (int, optional): Number of processes. Defaults to 1.
+
+        Returns:
+            pl.Series: The cleaned tokens, aligned with `texts`.
+        """
+        logger.debug(f"Cleaning {len(texts)} texts in batches of {batch_size}")
+        is_null = texts.is_null().to_list()
+        cleaned = iter(
+            clean_texts(
+                texts.drop_nulls(),
+                self.nlp,
+                batch_size=batch_size,
+                n_process=n_process,
+            )
+        )
+        return pl.Series(
+            texts.name,
+            [None if null else next(cleaned) for null in is_null],
+            dtype=pl.List(pl.String),
+        )
+
+    def clean_texts_cached(
+        self,
+        df: pl.DataFrame,
+        col: str,
+        cache_file: Path,
+        id_col: str = "poll_id",
+        batch_size: int = 256,
+        n_process: int = 1,
+    ) -> pl.Series:
+        """Cleans a column of raw texts, re-using previously cleaned texts, see `clean_texts_cached`.
+
+        Args:
+            df (pl.DataFrame): The polls.
+            col (str): The column containing the raw texts.
+            cache_file (Path): The cache Parquet file, created if missing.
+            id_col (str, optional): The column identifying a poll. Defaults to "poll_id".
+            batch_size (int, optional): Number of texts per batch. Defaults to 256.
+            n_process (int, optional): Number of processes. Defaults to 1.
 
-    def model_preprocessing(self, documents: list[list[str]]):
+        Returns:
+            pl.Series: The cleaned tokens, aligned with `df`.
+        """
+        return clean_texts_cached(
+            df,
+            col,
+            self.nlp,
+            cache_file,
+            id_col=id_col,
+            batch_size=batch_size,
+            n_process=n_process,
+        )
+
+    def model_preprocessing(
+        self, documents: Iterable[list[str]], corpus_file: Path | None = None
+    ):
         """Performs basic preprocessing required for gensim models.
 
         This method creates a gensim dictionary and a bag-of-words corpus from the documents.
+        With a `corpus_file` the corpus is serialized to disk instead of being kept in memory,
+        see `serialize_bow_corpus`.
 
         Args:
-            documents (list[list[str]]): A list of documents, where each document is a list of tokens.
+            documents (Iterable[list[str]]): The documents, where each document is a list of tokens.
+                Iterated twice, once for the dictionary and once for the corpus, so it must be
+                re-iterable, e.g. a list or `ParquetDocuments`, not a generator.
+            corpus_file (Path | None, optional): Matrix Market file to stream the corpus from. Defaults to None.
+
+        Raises:
+            TypeError: If `documents` is a one-shot iterator, e.g. a generator.
         """
 
+        import gensim.corpora as corpora
+
+        if iter(documents) is documents:
+            raise TypeError(
+                "`documents` is iterated twice and must be re-iterable, e.g. a list or "
+                f"`ParquetDocuments`, got one-shot iterator {type(documents).__name__}"
+            )
+
         logger.debug("Performing basic model preprocessing steps")
         self.dictionary = corpora.Dictionary(documents)
-        self.corpus = [self.dictionary.doc2bow(doc) for doc in documents]
+        if corpus_file is None:
+            self.corpus = [self.dictionary.doc2bow(doc) for doc in documents]
+        else:
+            self.corpus = serialize_bow_corpus(self.dictionary, documents, corpus_file)
 
     def fit_lda(
-        self, documents: list[list[str]], num_topics: int = 10, random_state: int = 42
+        self,
+        documents: Iterable[list[str]],
+        num_topics: int = 10,
+        random_state: int = 42,
+        corpus_file: Path | None = None,
+        workers: int | None = None,
+        chunksize: int = 2000,
+        passes: int = 1,
     ):
         """Fits a Latent Dirichlet Allocation (LDA) model to the documents.
 
         This method first performs preprocessing and then fits the LDA model.
 
         Args:
-            documents (list[list[str]]): A list of documents, where each document is a list of tokens.
+            documents (Iterable[list[str]]): The documents, where each document is a list of tokens, re-iterable, see `model_preprocessing`.
             num_topics (int, optional): The number of topics for the LDA model. Defaults to 10.
+            random_state (int, optional): Seed of the LDA model. Defaults to 42.
+            corpus_file (Path | None, optional): If given, the bag-of-words corpus is streamed from this file instead of being held in memory. Defaults to None.
+            workers (int | None, optional): Number of worker processes, None uses all but one core. Defaults to None.
+            chunksize (int, optional): Number of documents per training chunk. Defaults to 2000.
+            passes (int, optional): Number of passes over the corpus. Defaults to 1.
         """
 
-        self.model_preprocessing(documents)
+        import gensim
+
+        self.model_preprocessing(documents, corpus_file=corpus_file)
 
-        logger.debug(f"Fitting LDA topics for {len(documents)}")
+        logger.debug(
+            f"Fitting {num_topics} LDA topics for {self.dictionary.num_docs} documents "
+            f"({workers=}, {chunksize=}, {passes=})"
+        )
         self.lda_model = gensim.models.LdaMulticore(
             corpus=self.corpus,
             id2word=self.dictionary,
             num_topics=num_topics,
             random_state=random_state,
+            workers=workers,
+            chunksize=chunksize,
+            passes=passes,
         )
         self.lda_topics = {
             i: descr
             for (i, descr) in self.lda_model.print_topics(num_topics=num_topics)
         }
 
+    def save(self, path: Path) -> Path:
+        """Saves the fitted dictionary, LDA model and topic labels as a new version under `path`.
+
+        Each call writes a new `v{n}` directory, previous versions are kept.
+
+        Args:
+            path (Path): The topic model directory, created if missing.
+
+        Raises:
+            ValueError: If no LDA model was fitted yet.
+
+        Returns:
+            Path: The directory of the saved version.
+        """
+        import gensim
+
+        if getattr(self, "lda_model", None) is None:
+            raise ValueError("No LDA model to save, call `fit_lda` first")
+
+        versions = get_topic_model_versions(path)
+        version = versions[-1] + 1 if len(versions) > 0 else 1
+        version_path = path / f"v{version}"
+        version_path.mkdir(parents=True)
+
+        logger.info(f"Saving topic model to {version_path}")
+        self.dictionary.save(str(version_path / "dictionary.gensim"))
+        self.lda_model.save(str(version_path / "lda.gensim"))
+        meta = {
+            "format_version": TOPIC_MODEL_FORMAT_VERSION,
+            "version": version,
+            "language": self.language,
+            "num_topics": self.lda_model.num_topics,
+            "lda_topics": self.lda_topics,
+            "gensim": gensim.__version__,
+        }
+        with (version_path / "meta.json").open("w") as f:
+            json.dump(meta, f, indent=4)
+        return version_path
+
+    @classmethod
+    def load(cls, path: Path, version: int | None = None) -> "SpacyTransformer":
+        """Loads a transformer saved with `save`.
+
+        The spaCy model is only loaded once `nlp` is used, see `SpacyTransformer.nlp`.
+
+        Args:
+            path (Path): The topic model directory.
+            version (int | None, optional): The version to load, None loads the latest. Defaults to None.
+
+        Raises:
+            FileNotFoundError: If no (matching) version is saved under `path`.
+            ValueError: If the version was written in an unsupported format.
+
+        Returns:
+            SpacyTransformer: The fitted transformer.
+        """
+        import gensim
+        import gensim.corpora as corpora
+
+        versions = get_topic_model_versions(path)
+        if version is None and len(versions) > 0:
+            version = versions[-1]
+        if version not in versions:
+            raise FileNotFoundError(f"No topic model version {version} in {path}")
+
+        version_path = path / f"v{version}"
+        with (version_path / "meta.json").open("r") as f:
+            meta = json.load(f)
+        if meta["format_version"] != TOPIC_MODEL_FORMAT_VERSION:
+            raise ValueError(
+                f"Topic model format {meta['format_version']} of {version_path} is not "
+                f"supported, expected {TOPIC_MODEL_FORMAT_VERSION}"
+            )
+
+        logger.info(f"Loading topic model from {version_path}")
+        transformer = cls(language=meta["language"])
+        transformer.dictionary = corpora.Dictionary.load(
+            str(version_path / "dictionary.gensim")
+        )
+        transformer.lda_model = gensim.models.LdaMulticore.load(
+            str(version_path / "lda.gensim")
+        )
+        transformer.lda_topics = {int(i): d for i, d in meta["lda_topics"].items()}
+        return transformer
+
+    def get_topic_scores(
+        self, documents: Iterable[list[str]], chunksize: int = 2000
+    ) -> np.ndarray:
+        """Infers the LDA topic scores of documents, `chunksize` documents at a time.
+
+        Only the bag-of-words vectors of one chunk are held in memory.
+
+        Args:
+            documents (Iterable[list[str]]): The tokenized documents.
+            chunksize (int, optional): Number of documents per inference chunk. Defaults to 2000.
+
+        Returns:
+            np.ndarray: The topic scores, shape (n_documents, num_topics).
+        """
+        num_topics = self.lda_model.num_topics
+        chunks = []
+        documents = iter(documents)
+        while batch := list(itertools.islice(documents, chunksize)):
+            corpus = [self.dictionary.doc2bow(doc) for doc in batch]
+            chunks.append(
+                make_topic_scores_dense(
+                    list(self.lda_model[corpus]),  # type: ignore
+                    num_topics=num_topics,
+                )
+            )
+        if len(chunks) == 0:
+            return np.zeros(shape=(0, num_topics))
+        return np.concatenate(chunks)
+
+    def get_topic_frame(
+        self, tokens: pl.Series, label: str = "topic", chunksize: int = 2000
+    ) -> pl.DataFrame:
+        """Infers the LDA topic scores of a column of tokenized documents as a DataFrame.
+
+        Also sets `nlp_cols` to the names of the topic columns.
+
+        Args:
+            tokens (pl.Series): The tokenized documents.
+            label (str, optional): A prefix for the topic score columns. Defaults to "topic".
+            chunksize (int, optional): Number of documents per inference chunk, see `get_topic_scores`. Defaults to 2000.
+
+        Returns:
+            pl.DataFrame: One column per topic, aligned with `tokens`.
+        """
+        dense = self.get_topic_scores(
+            (
+                doc
+                for offset in range(0, len(tokens), chunksize)
+                for doc in tokens.slice(offset, chunksize).to_list()
+            ),
+            chunksize=chunksize,
+        )
+        self.nlp_cols = [f"{label}_{i}" for i in range(dense.shape[1])]
+        return pl.from_numpy(dense, schema=self.nlp_cols)
+
     def transform_documents(
-        self, documents: pl.DataFrame, col: str, label: str = "topic"
+        self,
+        documents: pl.DataFrame,
+        col: str,
+        label: str = "topic",
+        chunksize: int = 2000,
     ) -> pl.DataFrame:
         """Transforms documents into a dense matrix of LDA topic scores.
 
@@ -160,47 +719,55 @@ class SpacyTransformer:
             documents (pl.DataFrame): A DataFrame containing the documents to be transformed.
             col (str): The name of the column containing the tokenized documents.
             label (str, optional): A prefix for the new topic score columns. Defaults to "topic".
+            chunksize (int, optional): Number of documents per inference chunk, see `get_topic_scores`. Defaults to 2000.
 
         Returns:
             pl.DataFrame: A new DataFrame with columns for each topic's score.
         """
 
         logger.debug("Transforming `documents` to a dense real matrix")
-        corpus = [self.dictionary.doc2bow(doc) for doc in documents[col]]
-        scores = list(self.lda_model[corpus])
-        dense = make_topic_scores_dense(scores)  # type: ignore
-        self.nlp_cols = [f"{label}_{i}" for i in range(dense.shape[1])]
-        return documents.with_columns(
-            **{c: pl.Series(dense[:, i]) for i, c in enumerate(self.nlp_cols)}
-        ).drop(col)
+        topics = self.get_topic_frame(documents[col], label=label, chunksize=chunksize)
+        return documents.hstack(topics).drop(col)
 
     def transform(
         self,
         df: pl.DataFrame,
         col: str = "poll_title_nlp_processed",
         label: str = "topic",
+        chunksize: int | None = None,
     ) -> pl.DataFrame:
         """Applies the fitted LDA model to a DataFrame to get topic scores.
 
-        This method joins the topic scores back to the original DataFrame.
+        The topic score columns are appended to `df` directly, without a join.
+        With a `chunksize`, `df` is processed in slices of that many rows, so only
+        the scores of one slice are held as a dense array at a time.
 
         Args:
             df (pl.DataFrame): The DataFrame to transform.
             col (str, optional): The column containing the tokenized documents. Defaults to "poll_title_nlp_processed".
             label (str, optional): The prefix for the new topic score columns. Defaults to "topic".
-            return_new_cols (bool, optional): If True, returns the transformed DataFrame and a list of the new column names. Defaults to False.
+            chunksize (int | None, optional): Number of rows per slice, None processes `df` at once. Defaults to None.
 
         Returns:
-            pl.DataFrame | tuple[pl.DataFrame, list[str]]: The transformed DataFrame, or a tuple of the DataFrame and new column names.
+            pl.DataFrame: `df` with one column per topic, named in `nlp_cols`.
         """
-        df = df.with_row_index(name="index")
-        df_lda = self.transform_documents(df.select(["index", col]), col, label=label)
-        tmp = df.join(df_lda, on="index")
-
-        new_cols = [c for c in df_lda.columns if c.startswith(label)]
-        logger.debug(f"Adding nlp features: {new_cols}")
-
-        return tmp
+        if chunksize is None or df.height <= chunksize:
+            res = df.hstack(self.get_topic_frame(df[col], label=label))
+        else:
+            res = pl.concat(
+                [
+                    chunk.hstack(
+                        self.get_topic_frame(
+                            chunk[col], label=label, chunksize=chunksize
+                        )
+                    )
+                    for chunk in df.iter_slices(chunksize)
+                ],
+                rechunk=False,
+            )
+
+        logger.debug(f"Adding nlp features: {self.nlp_cols}")
+        return res
 
 
 def get_word_frequencies(df: pl.DataFrame, col: str) -> pl.DataFrame:
@@ -222,7 +789,7 @@ def compare_word_frequencies(
     col0: str,
     col1: str,
     topn: int = 5,
-) -> ggplot:
+) -> "ggplot":
     """Compare word frequency distributions for two text columns and return a plot.
 
     The function prints the top `topn` most frequent tokens for both `col0` and `col1`.
@@ -256,6 +823,8 @@ def compare_word_frequencies(
         f"\nTop {topn} word frequencies for {col1}: \n{get_word_frequencies(df, col1).head(topn)}"
     )
 
+    from plotnine import aes, geom_histogram, ggplot, labs, scale_fill_manual
+
     wc_col0 = f"before spacy"
     wc_col1 = f"after spacy"
     df = df.with_columns(
@@ -0,0 +1,312 @@
+import hashlib
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from bundestag.ml import similarity as sim
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+RE_UNSAFE_FILENAME = re.compile(r"[^\w.-]+")
+
+
+@dataclass
+class RenderJob:
+    """Pre-aggregated data of one similarity figure.
+
+    Attributes:
+        name (str): Name of the figure, used for the image file name.
+        party_col (str): The column containing the compared party.
+        overall (pl.DataFrame): Binned similarities, see `bin_overall_similarity`.
+        over_time (pl.DataFrame): Similarities per time bin, see `aggregate_similarity_over_time`.
+        title_overall (str): Title of the overall similarity panel.
+        title_over_time (str): Title of the similarity over time panel.
+    """
+
+    name: str
+    party_col: str
+    overall: pl.DataFrame
+    over_time: pl.DataFrame
+    title_overall: str = ""
+    title_over_time: str = ""
+
+
+def bin_overall_similarity(
+    df: pl.DataFrame, party_col: str, n_bins: int = 50
+) -> pl.DataFrame:
+    """Bins the per-poll similarities of each party into `n_bins` equally wide bins.
+
+    Replaces the one point per poll and party of `sim.plot_overall_similarity`
+    with at most `n_bins` points per party.
+
+    Args:
+        df (pl.DataFrame): The per-poll similarities, see `sim.compute_similarity`.
+        party_col (str): The column containing the compared party.
+        n_bins (int, optional): Number of bins on [0, 1]. Defaults to 50.
+
+    Returns:
+        pl.DataFrame: Columns `party_col`, "similarity" (bin center) and "count".
+    """
+    bin_index = (pl.col("similarity") * n_bins).floor().clip(0, n_bins - 1)
+    return (
+        df.filter(pl.col("similarity").is_not_nan())
+        .group_by(party_col, bin_index.cast(pl.Int32).alias("bin"))
+        .agg(pl.len().alias("count"))
+        .select(
+            party_col,
+            ((pl.col("bin") + 0.5) / n_bins).alias("similarity"),
+            "count",
+        )
+        .sort([party_col, "similarity"])
+    )
+
+
+def aggregate_similarity_over_time(
+    df: pl.DataFrame, party_col: str, every: str = "1y"
+) -> pl.DataFrame:
+    """Averages the per-poll similarities of each party per time bin.
+
+    Args:
+        df (pl.DataFrame): The per-poll similarities with a "date" column.
+        party_col (str): The column containing the compared party.
+        every (str, optional): Polars duration string of the time bins. Defaults to "1y".
+
+    Returns:
+        pl.DataFrame: Columns `party_col`, "date" (start of the bin), "similarity" (mean) and "count".
+    """
+    date = pl.col("date")
+    if df.schema["date"] == pl.String:
+        date = date.str.to_date()
+    return (
+        df.group_by(party_col, date.dt.truncate(every).alias("date"))
+        .agg(pl.col("similarity").mean(), pl.len().alias("count"))
+        .sort([party_col, "date"])
+    )
+
+
+def prepare_render_job(
+    df: pl.DataFrame,
+    name: str,
+    party_col: str,
+    title_overall: str = "",
+    title_over_time: str = "",
+    n_bins: int = 50,
+    every: str = "1y",
+) -> RenderJob:
+    """Pre-aggregates per-poll similarities into a `RenderJob`.
+
+    Args:
+        df (pl.DataFrame): The per-poll similarities, see `sim.compute_similarity`.
+        name (str): Name of the figure.
+        party_col (str): The column containing the compared party.
+        title_overall (str, optional): Title of the overall similarity panel. Defaults to "".
+        title_over_time (str, optional): Title of the similarity over time panel. Defaults to "".
+        n_bins (int, optional): Number of similarity bins, see `bin_overall_similarity`. Defaults to 50.
+        every (str, optional): Time bin duration, see `aggregate_similarity_over_time`. Defaults to "1y".
+
+    Returns:
+        RenderJob: The pre-aggregated figure data.
+    """
+    return RenderJob(
+        name=name,
+        party_col=party_col,
+        overall=bin_overall_similarity(df, party_col, n_bins=n_bins),
+        over_time=aggregate_similarity_over_time(df, party_col, every=every),
+        title_overall=title_overall,
+        title_over_time=title_over_time,
+    )
+
+
+def draw_similarity_figure(
+    job: RenderJob, palette: dict[str, str] | None = None
+) -> "Figure":
+    """Draws the overall and over time similarity panels of a `RenderJob`.
+
+    Uses the object oriented matplotlib API with an Agg canvas, so no pyplot state
+    is involved and figures can be drawn in worker processes.
+
+    Args:
+        job (RenderJob): The pre-aggregated figure data.
+        palette (dict[str, str] | None, optional): Party colors. Defaults to `sim.PALETTE`, unknown parties are grey.
+
+    Returns:
+        Figure: The figure.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    palette = sim.PALETTE if palette is None else palette
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    ax_overall, ax_time = fig.subplots(nrows=2)
+
+    parties = job.overall[job.party_col].unique(maintain_order=True).to_list()
+    for i, party in enumerate(parties):
+        color = palette.get(party, "grey")
+        bins = job.overall.filter(pl.col(job.party_col) == party)
+        count = bins["count"].to_numpy()
+        ax_overall.scatter(
+            np.full(len(bins), i),
+            bins["similarity"].to_numpy(),
+            s=20 + 200 * count / count.max(),
+            color=color,
+            alpha=0.5,
+        )
+
+        over_time = job.over_time.filter(pl.col(job.party_col) == party)
+        ax_time.plot(
+            over_time["date"].to_numpy(),
+            over_time["similarity"].to_numpy(),
+            color=color,
+            label=party,
+        )
+
+    ax_overall.set_xticks(range(len(parties)), parties)
+    ax_overall.set(
+        title=job.title_overall,
+        xlabel=job.party_col,
+        ylabel="Similarity (1 = identical, 0 = dissimilar)",
+    )
+    ax_time.set(
+        title=job.title_over_time,
+        xlabel="Date",
+        ylabel="avg. similarity (0 = dissimilar, 1 = identical)",
+    )
+    if len(parties) > 0:
+        ax_time.legend(title=job.party_col)
+    fig.tight_layout()
+    return fig
+
+
+def get_render_job_key(job: RenderJob, dpi: int) -> str:
+    """Computes a key of the content of a `RenderJob`, used to name cached images.
+
+    Args:
+        job (RenderJob): The pre-aggregated figure data.
+        dpi (int): The image resolution.
+
+    Returns:
+        str: Hex key of the job.
+    """
+    h = hashlib.sha256()
+    for part in [job.party_col, job.title_overall, job.title_over_time, str(dpi)]:
+        h.update(part.encode("utf8"))
+    for df in [job.overall, job.over_time]:
+        h.update(df.hash_rows(seed=0).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def get_image_path(job: RenderJob, cache_dir: Path, dpi: int) -> Path:
+    """Constructs the path of the cached image of a `RenderJob`.
+
+    Args:
+        job (RenderJob): The pre-aggregated figure data.
+        cache_dir (Path): The image cache directory.
+        dpi (int): The image resolution.
+
+    Returns:
+        Path: The full path to the PNG file.
+    """
+    name = RE_UNSAFE_FILENAME.sub("_", job.name)
+    return cache_dir / f"{name}_{get_render_job_key(job, dpi)}.png"
+
+
+def render_job(job: RenderJob, cache_dir: Path, dpi: int = 100) -> Path:
+    """Renders a `RenderJob` to a PNG file, unless it is already cached.
+
+    Args:
+        job (RenderJob): The pre-aggregated figure data.
+        cache_dir (Path): The image cache directory.
+        dpi (int, optional): The image resolution. Defaults to 100.
+
+    Returns:
+        Path: The path of the rendered image.
+    """
+    file = get_image_path(job, cache_dir, dpi)
+    if file.exists():
+        logger.debug(f"Using cached image {file}")
+        return file
+
+    fig = draw_similarity_figure(job)
+    fig.savefig(file, dpi=dpi)
+    logger.debug(f"Rendered {file}")
+    return file
+
+
+def render_jobs(
+    jobs: list[RenderJob],
+    cache_dir: Path,
+    n_jobs: int | None = None,
+    dpi: int = 100,
+) -> list[Path]:
+    """Renders many `RenderJob`s into the image cache, in parallel worker processes.
+
+    Args:
+        jobs (list[RenderJob]): The pre-aggregated figure data.
+        cache_dir (Path): The image cache directory, created if missing.
+        n_jobs (int | None, optional): Number of worker processes, 1 renders in the current process, None uses the `ProcessPoolExecutor` default. Defaults to None.
+        dpi (int, optional): The image resolution. Defaults to 100.
+
+    Returns:
+        list[Path]: The image paths, in the order of `jobs`.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    render = partial(render_job, cache_dir=cache_dir, dpi=dpi)
+    logger.info(f"Rendering {len(jobs)} figures to {cache_dir}")
+    if n_jobs == 1 or len(jobs) < 2:
+        return [render(job) for job in jobs]
+    # polars is multi-threaded, forking it can deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context) as executor:
+        return list(executor.map(render, jobs))
+
+
+def get_mdb_render_jobs(
+    df: pl.DataFrame,
+    mdbs: list[str] | None = None,
+    n_bins: int = 50,
+    every: str = "1y",
+) -> list[RenderJob]:
+    """Computes the similarity of MdBs with all parties and pre-aggregates it for rendering.
+
+    Args:
+        df (pl.DataFrame): The main DataFrame containing all votes.
+        mdbs (list[str] | None, optional): The MdBs to prepare, None prepares all. Defaults to None.
+        n_bins (int, optional): Number of similarity bins, see `bin_overall_similarity`. Defaults to 50.
+        every (str, optional): Time bin duration, see `aggregate_similarity_over_time`. Defaults to "1y".
+
+    Returns:
+        list[RenderJob]: One job per MdB.
+    """
+    index = sim.build_mdb_index(df)
+    party_votes_pivoted = sim.get_pivoted_votes_by_party(df)
+    mdbs = sorted(index.offsets) if mdbs is None else mdbs
+
+    jobs = []
+    for mdb in mdbs:
+        mdb_vs_parties = sim.align_mdb_with_parties(
+            index.get(mdb), party_votes_pivoted
+        ).pipe(sim.compute_similarity, suffix="_party")
+        jobs.append(
+            prepare_render_job(
+                mdb_vs_parties,
+                name=mdb,
+                party_col="Fraktion/Gruppe_party",
+                title_overall=f"Overall similarity of {mdb} with all parties",
+                title_over_time=f"{mdb} vs time",
+                n_bins=n_bins,
+                every=every,
+            )
+        )
+    return jobs
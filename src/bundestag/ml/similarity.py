@@ -1,15 +1,17 @@
+import datetime
 import logging
-from typing import Any, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import polars as pl
-import seaborn as sns
-from scipy import spatial
 
 import bundestag.data.transform.bundestag_sheets as transform_bs
 
+# plotting and scipy are only imported when used, see `tests/test_importtime.py`
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -112,6 +114,147 @@ def pivot_party_votes_df(df: pl.DataFrame) -> pl.DataFrame:
     return pivoted
 
 
+def get_pivoted_votes_by_party(df: pl.DataFrame) -> pl.DataFrame:
+    """Computes the vote fractions and counts by party for each poll in the wide layout.
+
+    Same result as `pivot_party_votes_df(get_votes_by_party(df))`, but computed with a
+    single group by. Besides the fraction columns (`transform_bs.VOTE_COLS`) the result
+    contains the count of each vote type ("# ja", ...) and the total ("# votes").
+
+    Args:
+        df (pl.DataFrame): The input DataFrame containing individual vote records.
+
+    Returns:
+        pl.DataFrame: A DataFrame with one row per party and poll.
+    """
+    logger.info("Computing pivoted votes by party and poll")
+    counts = [
+        pl.col("vote").eq(pl.lit(v)).sum().cast(pl.UInt32).alias(f"# {v}")
+        for v in transform_bs.VOTE_COLS
+    ]
+    return (
+        df.lazy()
+        .group_by(["Fraktion/Gruppe", "date", "title"])
+        .agg(*counts, pl.len().alias("# votes"))
+        .with_columns(
+            **{v: pl.col(f"# {v}") / pl.col("# votes") for v in transform_bs.VOTE_COLS}
+        )
+        .select(
+            "Fraktion/Gruppe",
+            "date",
+            "title",
+            *transform_bs.VOTE_COLS,
+            *[f"# {v}" for v in transform_bs.VOTE_COLS],
+            "# votes",
+        )
+        .collect()
+    )
+
+
+@dataclass
+class MdBIndex:
+    """One-hot encoded votes of all MdBs, grouped by MdB, with a row range per MdB.
+
+    Build with `build_mdb_index`. Extracting the votes of an MdB is a slice, with the
+    same rows, row order and vote values as `prepare_votes_of_mdb`. Unlike there, all
+    `transform_bs.VOTE_COLS` columns are UInt8 and replace 'vote' in place in that
+    order, whichever votes the MdB cast.
+
+    Attributes:
+        votes (pl.DataFrame): The one-hot encoded votes, see `one_hot_encode_votes`.
+        offsets (dict[str, tuple[int, int]]): Offset and number of rows of each MdB in `votes`.
+    """
+
+    votes: pl.DataFrame
+    offsets: dict[str, tuple[int, int]]
+
+    def get(self, mdb: str) -> pl.DataFrame:
+        """Extracts the one-hot encoded votes of a single MdB.
+
+        Args:
+            mdb (str): The identifier for the Member of Parliament.
+
+        Raises:
+            ValueError: If the specified `mdb` is not found.
+
+        Returns:
+            pl.DataFrame: The votes of the MdB, sorted by date.
+        """
+        if mdb not in self.offsets:
+            raise ValueError(f"{mdb} not found in column 'Bezeichnung'")
+        offset, length = self.offsets[mdb]
+        return self.votes.slice(offset, length)
+
+    def get_many(self, mdbs: list[str]) -> pl.DataFrame:
+        """Extracts the one-hot encoded votes of several MdBs.
+
+        Args:
+            mdbs (list[str]): The identifiers of the Members of Parliament.
+
+        Raises:
+            ValueError: If any of `mdbs` is not found.
+
+        Returns:
+            pl.DataFrame: The votes of the MdBs, in the order of `mdbs`.
+        """
+        if len(mdbs) == 0:
+            return self.votes.clear()
+        return pl.concat([self.get(mdb) for mdb in mdbs], rechunk=False)
+
+
+def one_hot_encode_votes(df: pl.DataFrame) -> pl.DataFrame:
+    """Replaces the 'vote' column in place with one UInt8 column per vote type in `transform_bs.VOTE_COLS`.
+
+    Args:
+        df (pl.DataFrame): The DataFrame containing individual vote records.
+
+    Raises:
+        InvalidOperationError: If a vote is not in `transform_bs.VOTE_COLS`, same as `prepare_votes_of_mdb`.
+
+    Returns:
+        pl.DataFrame: The one-hot encoded votes.
+    """
+    df = df.with_columns(
+        **{"vote": pl.col("vote").cast(pl.Enum(transform_bs.VOTE_COLS))}
+    )
+    exprs = []
+    for c in df.columns:
+        if c == "vote":
+            exprs.extend(
+                pl.col("vote").eq(pl.lit(v)).cast(pl.UInt8).alias(v)
+                for v in transform_bs.VOTE_COLS
+            )
+        else:
+            exprs.append(pl.col(c))
+    return df.select(exprs)
+
+
+def build_mdb_index(df: pl.DataFrame) -> MdBIndex:
+    """One-hot encodes the votes of all MdBs once and indexes them by MdB.
+
+    The votes of each MdB keep their row order in `df`.
+
+    Args:
+        df (pl.DataFrame): The main DataFrame containing all votes.
+
+    Returns:
+        MdBIndex: The indexed votes.
+    """
+    votes = one_hot_encode_votes(df).sort("Bezeichnung", maintain_order=True)
+    index = (
+        votes.with_row_index(name="offset")
+        .group_by("Bezeichnung")
+        .agg(pl.col("offset").first(), pl.len())
+    )
+    offsets = {
+        mdb: (offset, length)
+        for mdb, offset, length in index.select(
+            ["Bezeichnung", "offset", "len"]
+        ).iter_rows()
+    }
+    return MdBIndex(votes=votes, offsets=offsets)
+
+
 def prepare_votes_of_mdb(df: pl.DataFrame, mdb: str) -> pl.DataFrame:
     """Prepares the voting data for a single Member of Parliament (MdB).
 
@@ -119,6 +262,9 @@ def prepare_votes_of_mdb(df: pl.DataFrame, mdb: str) -> pl.DataFrame:
     converts their single 'vote' column into a one-hot encoded format (dummy variables),
     and ensures all standard vote columns are present and filled.
 
+    To prepare the votes of many MdBs, build an `MdBIndex` once with `build_mdb_index`
+    and use `MdBIndex.get` or `MdBIndex.get_many`, which avoids scanning `df` per MdB.
+
     Args:
         df (pl.DataFrame): The main DataFrame containing all votes.
         mdb (str): The identifier for the Member of Parliament.
@@ -129,15 +275,13 @@ def prepare_votes_of_mdb(df: pl.DataFrame, mdb: str) -> pl.DataFrame:
     Returns:
         pl.DataFrame: A DataFrame containing the one-hot encoded votes for the specified MdB.
     """
-    mdbs = df["Bezeichnung"].unique().to_list()
-    if not mdb in mdbs:
+    mdb_votes = df.filter(pl.col("Bezeichnung").eq(pl.lit(mdb)))
+    if mdb_votes.height == 0:
         raise ValueError(f"{mdb} not found in column 'Bezeichnung'")
 
-    mdb_votes = (
-        df.filter(pl.col("Bezeichnung").eq(pl.lit(mdb)))
-        .with_columns(**{"vote": pl.col("vote").cast(pl.Enum(transform_bs.VOTE_COLS))})
-        .to_dummies(["vote"])
-    )
+    mdb_votes = mdb_votes.with_columns(
+        **{"vote": pl.col("vote").cast(pl.Enum(transform_bs.VOTE_COLS))}
+    ).to_dummies(["vote"])
 
     cols_map = {c: c.split("_")[1] for c in mdb_votes.columns if c.startswith("vote_")}
 
@@ -167,6 +311,121 @@ def align_mdb_with_parties(
     return mdb_votes.join(party_votes_pivoted, on=["date", "title"], suffix="_party")
 
 
+def get_date_slice(
+    dates: pl.Series,
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+) -> slice:
+    """Finds the rows of a sorted date column within [start_date, end_date] by binary search.
+
+    Args:
+        dates (pl.Series): The ascending sorted date column, of dtype Date or `%Y-%m-%d` String.
+        start_date (datetime.date | None): The first date to include, None for no lower bound.
+        end_date (datetime.date | None): The last date to include, None for no upper bound.
+
+    Returns:
+        slice: The slice of rows within the date range.
+    """
+    to_value = lambda d: d.isoformat() if dates.dtype == pl.String else d
+    start = 0 if start_date is None else dates.search_sorted(to_value(start_date))
+    end = (
+        len(dates)
+        if end_date is None
+        else dates.search_sorted(to_value(end_date), side="right")
+    )
+    return slice(int(start), int(max(start, end)))
+
+
+@dataclass
+class VoteCube:
+    """Precomputed, date sorted votes for interactive date range queries.
+
+    Build with `build_vote_cube`. All date range selections are binary search slices.
+
+    Attributes:
+        votes (pl.DataFrame): The individual votes, sorted by date.
+        party_votes (pl.DataFrame): The party x poll votes in the wide layout, see
+            `get_pivoted_votes_by_party`, sorted by date.
+        mdb_index (MdBIndex): The one-hot encoded votes of all MdBs, see `build_mdb_index`.
+    """
+
+    votes: pl.DataFrame
+    party_votes: pl.DataFrame
+    mdb_index: MdBIndex
+
+    def get_votes(
+        self, start_date: datetime.date | None, end_date: datetime.date | None
+    ) -> pl.DataFrame:
+        """Selects the individual votes within the date range (inclusive).
+
+        Args:
+            start_date (datetime.date | None): The start date, None for no lower bound.
+            end_date (datetime.date | None): The end date, None for no upper bound.
+
+        Returns:
+            pl.DataFrame: The selected votes.
+        """
+        return self.votes[get_date_slice(self.votes["date"], start_date, end_date)]
+
+    def get_party_votes(
+        self, start_date: datetime.date | None, end_date: datetime.date | None
+    ) -> pl.DataFrame:
+        """Selects the pivoted party votes within the date range (inclusive).
+
+        Args:
+            start_date (datetime.date | None): The start date, None for no lower bound.
+            end_date (datetime.date | None): The end date, None for no upper bound.
+
+        Returns:
+            pl.DataFrame: The selected party votes.
+        """
+        return self.party_votes[
+            get_date_slice(self.party_votes["date"], start_date, end_date)
+        ]
+
+    def get_mdb_votes(
+        self,
+        mdb: str,
+        start_date: datetime.date | None,
+        end_date: datetime.date | None,
+    ) -> pl.DataFrame:
+        """Selects the one-hot encoded votes of an MdB within the date range (inclusive).
+
+        Args:
+            mdb (str): The identifier for the Member of Parliament.
+            start_date (datetime.date | None): The start date, None for no lower bound.
+            end_date (datetime.date | None): The end date, None for no upper bound.
+
+        Raises:
+            ValueError: If the specified `mdb` is not found.
+
+        Returns:
+            pl.DataFrame: The selected votes of the MdB.
+        """
+        mdb_votes = self.mdb_index.get(mdb)
+        return mdb_votes[get_date_slice(mdb_votes["date"], start_date, end_date)]
+
+
+def build_vote_cube(df: pl.DataFrame) -> VoteCube:
+    """Precomputes the date sorted party and MdB votes used by the GUI.
+
+    Args:
+        df (pl.DataFrame): The main DataFrame containing all votes.
+
+    Returns:
+        VoteCube: The precomputed votes.
+    """
+    logger.info("Building vote cube")
+    votes = df.sort("date", maintain_order=True)
+    party_votes = get_pivoted_votes_by_party(votes).sort(
+        ["date", "title", "Fraktion/Gruppe"]
+    )
+
+    return VoteCube(
+        votes=votes, party_votes=party_votes, mdb_index=build_mdb_index(votes)
+    )
+
+
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     """Computes the cosine similarity between two vectors.
 
@@ -180,13 +439,61 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
         float: The cosine similarity between the two vectors.
     """
 
+    from scipy import spatial
+
     return float(1 - spatial.distance.cosine(a, b))
 
 
+def batched_metric(func: Callable) -> Callable:
+    """Marks a similarity metric as batch-aware for `compute_similarity`.
+
+    A batch-aware metric receives two 2D arrays of shape (n_rows, n_vote_cols) and
+    returns a 1D array of n_rows similarities, instead of being called once per row.
+
+    Args:
+        func (Callable): The batch-aware similarity metric.
+
+    Returns:
+        Callable: The same function, marked as batch-aware.
+    """
+    func.batched = True  # type: ignore
+    return func
+
+
+@batched_metric
+def batch_cosine_similarity(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Computes the row-wise cosine similarity between two matrices.
+
+    Equivalent to calling `cosine_similarity` on each pair of rows, including
+    nan for rows where either vector is zero.
+
+    Args:
+        A (np.ndarray): The first matrix, shape (n_rows, n_cols).
+        B (np.ndarray): The second matrix, shape (n_rows, n_cols).
+
+    Returns:
+        np.ndarray: The cosine similarity of each row pair, shape (n_rows,).
+    """
+    A = np.asarray(A, dtype=np.float64)
+    B = np.asarray(B, dtype=np.float64)
+    dot = np.einsum("ij,ij->i", A, B)
+    norms = np.sqrt(np.einsum("ij,ij->i", A, A) * np.einsum("ij,ij->i", B, B))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = dot / norms
+    # same clipping as scipy.spatial.distance.cosine
+    return np.clip(s, -1.0, 1.0)
+
+
+# scalar metrics which have a batch-aware equivalent
+BATCHED_EQUIVALENTS: dict[Callable, Callable] = {
+    cosine_similarity: batch_cosine_similarity,
+}
+
+
 def compute_similarity(
     df: pl.DataFrame,
     suffix: str,
-    similarity_metric: Callable = cosine_similarity,
+    similarity_metric: Callable = batch_cosine_similarity,
 ) -> pl.DataFrame:
     """Computes the similarity between two sets of vote vectors in a DataFrame.
 
@@ -194,22 +501,29 @@ def compute_similarity(
     from the base columns (`transform_bs.VOTE_COLS`) with the vectors from the columns
     identified by a suffix (e.g., 'ja_party', 'nein_party').
 
+    Batch-aware metrics (see `batched_metric`) are called once on all rows. Scalar metrics
+    are called once per row, unless a batch-aware equivalent is known, see `BATCHED_EQUIVALENTS`.
+
     Args:
         df (pl.DataFrame): The DataFrame containing the aligned vote vectors.
         suffix (str): The suffix used to identify the second set of vote columns (e.g., '_party').
-        similarity_metric (Callable, optional): The function to use for calculating similarity. Defaults to `cosine_similarity`.
+        similarity_metric (Callable, optional): The function to use for calculating similarity. Defaults to `batch_cosine_similarity`.
 
     Returns:
         pl.DataFrame: The input DataFrame with an added 'similarity' column.
     """
+    similarity_metric = BATCHED_EQUIVALENTS.get(similarity_metric, similarity_metric)
     logger.info(f"Computing similarities using metric = {similarity_metric}")
     lcols = transform_bs.VOTE_COLS
     rcols = [f"{v}{suffix}" for v in transform_bs.VOTE_COLS]
 
     A = df.select(lcols).to_numpy()
     B = df.select(rcols).to_numpy()
-    s = [similarity_metric(a, b) for a, b in zip(A, B, strict=True)]
-    df = df.with_columns(**{"similarity": pl.Series(s)})
+    if getattr(similarity_metric, "batched", False):
+        s = np.asarray(similarity_metric(A, B), dtype=np.float64)
+    else:
+        s = [similarity_metric(a, b) for a, b in zip(A, B, strict=True)]
+    df = df.with_columns(**{"similarity": pl.Series(s, dtype=pl.Float64)})
 
     return df
 
@@ -263,9 +577,199 @@ def align_party_with_all_parties(
     return partyA_vs_rest
 
 
+def get_party_vote_tensor(
+    party_votes: pl.DataFrame,
+) -> tuple[np.ndarray, np.ndarray, list[str], pl.DataFrame]:
+    """Builds a dense (party x poll x vote outcome) tensor from pivoted party votes.
+
+    Args:
+        party_votes (pl.DataFrame): The pivoted party votes, see `pivot_party_votes_df`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, list[str], pl.DataFrame]: The vote fraction tensor of
+            shape (n_parties, n_polls, n_vote_cols), a boolean (n_parties, n_polls) mask of
+            the party having voted in the poll, the sorted party names and the date sorted
+            polls (`date`, `title`) in tensor order.
+    """
+    col = "Fraktion/Gruppe"
+    parties = sorted(party_votes[col].unique().to_list())
+    polls = party_votes.select(["date", "title"]).unique().sort(["date", "title"])
+
+    indexed = party_votes.join(
+        polls.with_row_index(name="poll_index"), on=["date", "title"]
+    ).with_columns(
+        **{
+            "party_index": pl.col(col).replace_strict(
+                parties, list(range(len(parties))), return_dtype=pl.UInt32
+            )
+        }
+    )
+    party_index = indexed["party_index"].to_numpy()
+    poll_index = indexed["poll_index"].to_numpy()
+
+    tensor = np.zeros(
+        (len(parties), len(polls), len(transform_bs.VOTE_COLS)), dtype=np.float64
+    )
+    tensor[party_index, poll_index] = indexed.select(transform_bs.VOTE_COLS).to_numpy()
+
+    present = np.zeros((len(parties), len(polls)), dtype=bool)
+    present[party_index, poll_index] = True
+
+    return tensor, present, parties, polls
+
+
+@dataclass
+class PartySimilarity:
+    """All-pairs party similarity, optionally per date window.
+
+    Attributes:
+        parties (list[str]): Party names, in matrix order.
+        windows (list): Start of each date window, or `[None]` if not windowed.
+        matrix (np.ndarray): Mean cosine similarity over the polls both parties voted in,
+            shape (n_windows, n_parties, n_parties). nan if there is no such poll.
+        n_polls (np.ndarray): Number of polls each similarity is based on, same shape as `matrix`.
+        frame (pl.DataFrame): The tidy version of `matrix` and `n_polls`.
+    """
+
+    parties: list[str]
+    windows: list
+    matrix: np.ndarray
+    n_polls: np.ndarray
+    frame: pl.DataFrame
+
+
+def compute_party_similarity_matrix(
+    party_votes: pl.DataFrame, every: str | None = None
+) -> PartySimilarity:
+    """Computes the similarity of every party with every party in one batched matrix operation.
+
+    Per poll the cosine similarity of two parties' vote fraction vectors is computed, as in
+    `align_party_with_party` + `compute_similarity`, and averaged over all polls both parties
+    voted in. This is done for all pairs at once by normalising the vote vectors of the
+    (party x poll x vote outcome) tensor and multiplying it with itself.
+
+    Args:
+        party_votes (pl.DataFrame): The pivoted party votes, see `pivot_party_votes_df`.
+        every (str | None, optional): Polars duration string (e.g. "1y", "6mo") to compute the
+            matrix per date window, see `polars.Expr.dt.truncate`. Defaults to None (all polls).
+
+    Returns:
+        PartySimilarity: The similarity matrix and its tidy frame.
+    """
+    tensor, present, parties, polls = get_party_vote_tensor(party_votes)
+
+    norms = np.linalg.norm(tensor, axis=2)
+    valid = present & (norms > 0)
+    unit = np.divide(
+        tensor, norms[:, :, None], out=np.zeros_like(tensor), where=valid[:, :, None]
+    )
+
+    if every is None:
+        windows = [None]
+        window_index = np.zeros(len(polls), dtype=np.int64)
+    else:
+        date = pl.col("date")
+        if polls.schema["date"] == pl.String:
+            date = date.str.to_date()
+        window_start = polls.select(date.dt.truncate(every))["date"]
+        windows = window_start.unique(maintain_order=True).to_list()
+        window_index = window_start.rank("dense").cast(pl.Int64).to_numpy() - 1
+
+    n_parties = len(parties)
+    matrix = np.full((len(windows), n_parties, n_parties), np.nan)
+    n_polls = np.zeros((len(windows), n_parties, n_parties), dtype=np.int64)
+    for w in range(len(windows)):
+        mask = window_index == w
+        u = unit[:, mask].reshape(n_parties, -1)
+        v = valid[:, mask].astype(np.float64)
+        sim_sum = u @ u.T
+        counts = v @ v.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix[w] = np.where(counts > 0, sim_sum / counts, np.nan)
+        n_polls[w] = counts.astype(np.int64)
+
+    a, b = np.meshgrid(np.arange(n_parties), np.arange(n_parties), indexing="ij")
+    frame = pl.concat(
+        [
+            pl.DataFrame(
+                {
+                    "window": [window] * (n_parties * n_parties),
+                    "Fraktion/Gruppe": [parties[i] for i in a.ravel()],
+                    "Fraktion/Gruppe_b": [parties[i] for i in b.ravel()],
+                    "similarity": matrix[w].ravel(),
+                    "# polls": n_polls[w].ravel(),
+                }
+            )
+            for w, window in enumerate(windows)
+        ]
+    )
+    if every is None:
+        frame = frame.drop("window")
+
+    return PartySimilarity(
+        parties=parties,
+        windows=windows,
+        matrix=matrix,
+        n_polls=n_polls,
+        frame=frame,
+    )
+
+
+def get_mdb_party_similarity(
+    df: pl.DataFrame, party_votes_pivoted: pl.DataFrame | None = None
+) -> pl.DataFrame:
+    """Computes the similarity of every MdB with every party in one go.
+
+    All one-hot encoded MdB votes are joined once with the pivoted party votes on
+    date and title. The per-poll cosine similarity is computed as a Polars expression
+    and averaged per MdB and party. Same result as calling `prepare_votes_of_mdb`,
+    `align_mdb_with_parties` and `compute_similarity` for each MdB, followed by a mean
+    per party.
+
+    Args:
+        df (pl.DataFrame): The main DataFrame containing all votes.
+        party_votes_pivoted (pl.DataFrame | None, optional): The pivoted party votes, see
+            `get_pivoted_votes_by_party`. Computed from `df` if None. Defaults to None.
+
+    Returns:
+        pl.DataFrame: One row per MdB, MdB party and compared party ("Fraktion/Gruppe_party")
+            with the mean "similarity" and the number of shared polls ("# polls").
+    """
+    if party_votes_pivoted is None:
+        party_votes_pivoted = get_pivoted_votes_by_party(df)
+
+    vote_cols_party = [f"{c}_party" for c in transform_bs.VOTE_COLS]
+    dot = pl.sum_horizontal(
+        pl.col(c) * pl.col(c_party)
+        for c, c_party in zip(transform_bs.VOTE_COLS, vote_cols_party)
+    )
+    norm = lambda cols: pl.sum_horizontal(pl.col(c).pow(2) for c in cols).sqrt()
+    similarity = dot / (norm(transform_bs.VOTE_COLS) * norm(vote_cols_party))
+
+    logger.info("Computing similarity of all MdBs with all parties")
+    return (
+        one_hot_encode_votes(
+            df.select(["Bezeichnung", "Fraktion/Gruppe", "date", "title", "vote"])
+        )
+        .lazy()
+        .join(
+            party_votes_pivoted.lazy().select(
+                "Fraktion/Gruppe", "date", "title", *transform_bs.VOTE_COLS
+            ),
+            on=["date", "title"],
+            suffix="_party",
+        )
+        .with_columns(similarity.clip(-1.0, 1.0).alias("similarity"))
+        .group_by(["Bezeichnung", "Fraktion/Gruppe", "Fraktion/Gruppe_party"])
+        .agg(pl.col("similarity").mean(), pl.len().alias("# polls"))
+        .sort(["Bezeichnung", "Fraktion/Gruppe", "Fraktion/Gruppe_party"])
+        .collect()
+    )
+
+
 def get_party_party_similarity(
-    similarity_party_party: pd.DataFrame,
-) -> pd.DataFrame:
+    similarity_party_party: "pd.DataFrame",
+) -> "pd.DataFrame":
     """Calculates descriptive statistics for party-party similarity scores.
 
     Args:
@@ -294,6 +798,111 @@ PALETTE = {
 }
 
 
+def get_rolling_similarity(
+    df: pl.DataFrame,
+    party_col: str,
+    period: str | None = None,
+    n_polls: int | None = None,
+) -> pl.DataFrame:
+    """Computes the rolling mean similarity per party over the last `n_polls` polls or a trailing time `period`.
+
+    Works on the per-poll output of `compute_similarity`, e.g. with `party_col`
+    "Fraktion/Gruppe_b" for party vs party or "Fraktion/Gruppe_party" for MdB vs party.
+
+    Args:
+        df (pl.DataFrame): The per-poll similarities with columns "date", `party_col` and "similarity".
+        party_col (str): The column containing the compared party.
+        period (str | None, optional): Polars duration string (e.g. "1y", "90d"), the window
+            of a poll covers (date - period, date]. Defaults to None.
+        n_polls (int | None, optional): Number of polls per window, including the current one. Defaults to None.
+
+    Raises:
+        ValueError: If not exactly one of `period` and `n_polls` is given.
+
+    Returns:
+        pl.DataFrame: `df` sorted by date with "similarity" replaced by the rolling mean
+            and "# polls" the number of polls in the window.
+    """
+    if (period is None) == (n_polls is None):
+        raise ValueError("Pass exactly one of period and n_polls.")
+
+    df = df.sort("date", maintain_order=True)
+    if df.schema["date"] == pl.String:
+        df = df.with_columns(pl.col("date").str.to_date())
+
+    present = pl.col("similarity").is_not_null().cast(pl.UInt32)
+    if period is not None:
+        mean = pl.col("similarity").rolling_mean_by("date", window_size=period)
+        count = present.rolling_sum_by("date", window_size=period)
+    else:
+        mean = pl.col("similarity").rolling_mean(window_size=n_polls, min_samples=1)
+        count = present.rolling_sum(window_size=n_polls, min_samples=1)
+
+    return df.with_columns(
+        mean.over(party_col).alias("similarity"),
+        count.over(party_col).alias("# polls"),
+    )
+
+
+def update_rolling_similarity(
+    df_history: pl.DataFrame,
+    df_new: pl.DataFrame,
+    party_col: str,
+    period: str | None = None,
+    n_polls: int | None = None,
+) -> pl.DataFrame:
+    """Computes the rolling similarity of newly appended polls without recomputing the history.
+
+    Only the tail of `df_history` which falls into the windows of the new polls is
+    used, so the result equals the rows of `df_new` in
+    `get_rolling_similarity(pl.concat([df_history, df_new]), ...)`.
+
+    Args:
+        df_history (pl.DataFrame): The per-poll similarities already processed.
+        df_new (pl.DataFrame): The per-poll similarities of the new polls, none of them older than `df_history`.
+        party_col (str): The column containing the compared party.
+        period (str | None, optional): Polars duration string, see `get_rolling_similarity`. Defaults to None.
+        n_polls (int | None, optional): Number of polls per window, see `get_rolling_similarity`. Defaults to None.
+
+    Raises:
+        ValueError: If `df_new` contains polls older than the newest poll of `df_history`.
+
+    Returns:
+        pl.DataFrame: The rolling similarity of the rows of `df_new`.
+    """
+    if df_new.height == 0 or df_history.height == 0:
+        return get_rolling_similarity(df_new, party_col, period=period, n_polls=n_polls)
+    if df_new["date"].min() < df_history["date"].max():
+        raise ValueError("df_new contains polls older than the newest in df_history.")
+
+    if period is not None:
+        # windows of the new polls start after min(new date) - period
+        start, date = pl.lit(df_new["date"].min()), pl.col("date")
+        if df_history.schema["date"] == pl.String:
+            start, date = start.str.to_date(), date.str.to_date()
+        context = df_history.filter(date > start.dt.offset_by(f"-{period}"))
+    else:
+        # the last n_polls - 1 polls of each party
+        position = pl.int_range(pl.len()).over(party_col)
+        context = df_history.sort("date", maintain_order=True).filter(
+            position >= pl.len().over(party_col) - (n_polls - 1)
+        )
+
+    res = get_rolling_similarity(
+        pl.concat(
+            [
+                context.with_columns(_new=pl.lit(False)),
+                df_new.with_columns(_new=pl.lit(True)),
+            ],
+            how="vertical_relaxed",
+        ),
+        party_col,
+        period=period,
+        n_polls=n_polls,
+    )
+    return res.filter(pl.col("_new")).drop("_new")
+
+
 def plot_overall_similarity(
     df: pl.DataFrame,
     x: str,
@@ -313,6 +922,9 @@ def plot_overall_similarity(
     Returns:
         matplotlib.axes.Axes: The axes object with the plot.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     if ax is None:
         fig, ax = plt.subplots(figsize=(12, 4))
 
@@ -345,6 +957,9 @@ def plot_similarity_over_time(
     Returns:
         matplotlib.axes.Axes: The axes object with the plot.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     y = "avg. similarity"
     tmp = df.with_columns(**{"year": pl.col("date").dt.year()})
     tmp = tmp.group_by(["year", party_col]).agg(**{y: pl.col("similarity").mean()})
@@ -379,6 +994,8 @@ def plot(
     Returns:
         np.ndarray: An array of the matplotlib axes objects for the two subplots.
     """
+    import matplotlib.pyplot as plt
+
     fig, axs = plt.subplots(figsize=(12, 8), nrows=2)
     plot_overall_similarity(df, x=party_col, title=title_overall, ax=axs[0])
     plot_similarity_over_time(df, party_col, title=title_over_time, ax=axs[1])
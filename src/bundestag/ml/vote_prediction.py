@@ -1,12 +1,15 @@
 import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
 import numpy as np
 import pandas as pd
 import polars as pl
-import torch
-from fastai.tabular.all import TabularLearner
-from plotnine import aes, geom_point, ggplot, labs, scale_color_manual
-from sklearn import decomposition
+
+if TYPE_CHECKING:
+    # torch, fastai, sklearn and plotnine are only imported when used, see `tests/test_importtime.py`
+    from fastai.tabular.all import TabularLearner
+    from plotnine import ggplot, scale_color_manual
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +29,12 @@ def poll_splitter(
     valid_pct: float = 0.2,
     shuffle: bool = True,
     seed: int | None = None,
-) -> tuple[list[int], list[int]]:
+) -> tuple[np.ndarray, np.ndarray]:
     """Splits the DataFrame into training and validation sets based on poll IDs.
 
     This function ensures that all votes for a given poll are in the same set (either training or validation),
-    preventing data leakage between the sets.
+    preventing data leakage between the sets. The rows are assigned with a single vectorised
+    membership mask of the validation polls, without materialising Python lists.
 
     Args:
         df (pl.DataFrame): The DataFrame to be split.
@@ -40,30 +44,22 @@ def poll_splitter(
         seed (int | None, optional): A seed for the random number generator for reproducibility. Defaults to None.
 
     Returns:
-        tuple[list[int], list[int]]: A tuple containing two lists of indices: the first for the training set,
-                                     and the second for the validation set.
+        tuple[np.ndarray, np.ndarray]: The row indices of the training set and of the validation set.
+            fastai's `TabularPandas` expects lists, pass `[ix.tolist() for ix in splits]` there.
     """
 
+    rng = np.random.default_rng(seed)
     polls = df[poll_col].unique()
     n = len(polls)
-
-    if seed is None:
-        rng = np.random.RandomState()
-    else:
-        rng = np.random.RandomState(seed)
-
-    polls1 = rng.choice(polls, size=int(n * valid_pct))
+    polls1 = polls.gather(rng.permutation(n)[: int(n * valid_pct)])
 
     logger.debug(
         f"Splitting votes by polls (num train = {n - len(polls1)}, num valid = {len(polls1)})"
     )
 
-    df = df.with_columns(
-        **{"is validation set": pl.col(poll_col).is_in(list(polls1))}
-    ).with_row_index(name="index")
-
-    ix0 = df.filter(pl.col("is validation set").not_())["index"].to_list()
-    ix1 = df.filter(pl.col("is validation set"))["index"].to_list()
+    is_valid = df[poll_col].is_in(polls1.implode()).to_numpy()
+    ix0 = np.flatnonzero(~is_valid)
+    ix1 = np.flatnonzero(is_valid)
 
     if shuffle:
         rng.shuffle(ix0)
@@ -72,12 +68,66 @@ def poll_splitter(
     return (ix0, ix1)
 
 
+def kfold_splitter(
+    df: pl.DataFrame,
+    n_splits: int = 5,
+    group_col: str | None = "poll_id",
+    shuffle: bool = True,
+    seed: int | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Generates k-fold training and validation row indices.
+
+    With a `group_col` (group k-fold) each group, by default a poll, is assigned to one
+    fold, so all of its rows are validated together. Without, single rows are assigned.
+
+    Args:
+        df (pl.DataFrame): The DataFrame to be split.
+        n_splits (int, optional): Number of folds. Defaults to 5.
+        group_col (str | None, optional): The column containing the groups, None splits by row. Defaults to "poll_id".
+        shuffle (bool, optional): Whether to assign groups (rows) to folds randomly, otherwise in order of first appearance. Defaults to True.
+        seed (int | None, optional): A seed for the random number generator for reproducibility. Defaults to None.
+
+    Raises:
+        ValueError: If `n_splits` is less than 2 or there are fewer groups (rows) than `n_splits`.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: The row indices of the training set and of the validation set of each fold.
+    """
+    if n_splits < 2:
+        raise ValueError(f"Need at least 2 folds, got {n_splits=}")
+
+    rng = np.random.default_rng(seed)
+    groups = None if group_col is None else df[group_col].unique(maintain_order=True)
+    n = df.height if groups is None else len(groups)
+    if n < n_splits:
+        raise ValueError(f"Cannot split {n} groups into {n_splits} folds")
+
+    if groups is None:
+        order = rng.permutation(n) if shuffle else np.arange(n)
+        folds = np.empty(n, dtype=np.int64)
+        folds[order] = np.arange(n) % n_splits
+    else:
+        if shuffle:
+            groups = groups.gather(rng.permutation(n))
+        folds = (
+            df[group_col]
+            .replace_strict(groups, np.arange(n) % n_splits, return_dtype=pl.Int64)
+            .to_numpy()
+        )
+
+    logger.debug(f"Splitting {df.height} rows of {n} groups into {n_splits} folds")
+
+    for fold in range(n_splits):
+        is_valid = folds == fold
+        yield np.flatnonzero(~is_valid), np.flatnonzero(is_valid)
+
+
 def plot_predictions(
-    learn: TabularLearner,
+    learn: "TabularLearner",
     df_all_votes: pl.DataFrame,
     df_mandates: pl.DataFrame,
     df_polls: pl.DataFrame,
-    splits: tuple[list[int], list[int]],
+    splits: tuple[np.ndarray, np.ndarray],
     y_col: str = "vote",
     n_worst_politicians: int = 20,
     n_worst_polls: int = 5,
@@ -95,7 +145,7 @@ def plot_predictions(
         df_all_votes (pl.DataFrame): The complete DataFrame of all votes.
         df_mandates (pl.DataFrame): The DataFrame containing mandate and politician information.
         df_polls (pl.DataFrame): The DataFrame containing poll information.
-        splits (tuple[list[int], list[int]]): The train/validation splits of indices.
+        splits (tuple[np.ndarray, np.ndarray]): The train/validation splits of indices, see `poll_splitter`.
         y_col (str, optional): The name of the target variable column. Defaults to "vote".
         n_worst_politicians (int, optional): The number of most inaccurately predicted politicians to display. Defaults to 20.
         n_worst_polls (int, optional): The number of most inaccurately predicted polls to display. Defaults to 5.
@@ -110,10 +160,10 @@ def plot_predictions(
     make_pred_readable = lambda x: [learn.dls.vocab[i] for i in x.argmax(axis=1)]
 
     pred_col = f"{y_col}_pred"
-    df_all_votes = df_all_votes.with_row_index(name="index")
     y_pred_reabale = make_pred_readable(y_pred)
 
-    df_valid = df_all_votes.filter(pl.col("index").is_in(pl.lit(list(splits[1]))))
+    # gathering keeps the order of the validation indices, which is the order of the predictions
+    df_valid = df_all_votes[np.asarray(splits[1])]
 
     df_valid = df_valid.with_columns(**{pred_col: pl.Series(y_pred_reabale)})
 
@@ -132,9 +182,8 @@ def plot_predictions(
     logger.info(f"Overall accuracy = {acc * 100:.2f} %")
 
     df_valid = df_valid.join(
-        df_mandates.select(["politician", "party"]),
-        left_on="politician name",
-        right_on="politician",
+        df_mandates.select(["mandate_id", "party"]),
+        on="mandate_id",
     ).join(df_polls.select(["poll_id", "poll_title"]), on="poll_id")
 
     print(f"\n{n_worst_politicians} most inaccurately predicted politicians:")
@@ -156,11 +205,157 @@ def plot_predictions(
     display(tmp)
 
 
+def load_learner(file: Path, n_threads: int | None = None) -> "TabularLearner":
+    """Loads a learner exported with `learn.export` for inference on the CPU.
+
+    Args:
+        file (Path): The exported learner, e.g. `export.pkl`.
+        n_threads (int | None, optional): Number of torch intra-op threads, None keeps the torch default. Defaults to None.
+
+    Returns:
+        TabularLearner: The learner.
+    """
+    import torch
+    from fastai.learner import load_learner as fastai_load_learner
+
+    if n_threads is not None:
+        torch.set_num_threads(n_threads)
+    logger.info(f"Loading learner from {file} ({torch.get_num_threads()} threads)")
+    return fastai_load_learner(file, cpu=True)
+
+
+def predict_votes(
+    learn: "TabularLearner",
+    df: pl.DataFrame,
+    batch_size: int = 1024,
+    y_col: str = "vote",
+) -> pl.DataFrame:
+    """Predicts the votes of `df` and their class probabilities.
+
+    Args:
+        learn (TabularLearner): The trained fastai learner.
+        df (pl.DataFrame): The votes to predict, with the learner's feature columns. `y_col` is not needed.
+        batch_size (int, optional): Number of rows per forward pass. Defaults to 1024.
+        y_col (str, optional): The name of the target variable column. Defaults to "vote".
+
+    Returns:
+        pl.DataFrame: Column `{y_col}_pred` with the most likely class and one `{y_col}_prob_{class}` column per class, aligned with `df`.
+    """
+    dl = learn.dls.test_dl(df.to_pandas(), bs=batch_size)
+    probs, _ = learn.get_preds(dl=dl)
+    probs = probs.detach().numpy()
+    vocab = [str(v) for v in learn.dls.vocab]
+    return pl.DataFrame(
+        {
+            f"{y_col}_pred": np.asarray(vocab, dtype=object)[probs.argmax(axis=1)],
+            **{f"{y_col}_prob_{v}": probs[:, i] for i, v in enumerate(vocab)},
+        },
+        schema=get_prediction_schema(learn, y_col=y_col),
+    )
+
+
+def get_prediction_schema(learn: "TabularLearner", y_col: str = "vote") -> pl.Schema:
+    """Returns the schema of the predictions of `predict_votes`.
+
+    Args:
+        learn (TabularLearner): The trained fastai learner.
+        y_col (str, optional): The name of the target variable column. Defaults to "vote".
+
+    Returns:
+        pl.Schema: Column `{y_col}_pred` and one `{y_col}_prob_{class}` column per class.
+    """
+    vocab = [str(v) for v in learn.dls.vocab]
+    return pl.Schema(
+        {
+            f"{y_col}_pred": pl.String(),
+            **{f"{y_col}_prob_{v}": pl.Float32() for v in vocab},
+        }
+    )
+
+
+def predict_votes_parquet(
+    learn: "TabularLearner",
+    input_file: Path,
+    output_file: Path,
+    chunk_size: int = 100_000,
+    batch_size: int = 1024,
+    y_col: str = "vote",
+    keep_cols: list[str] | None = None,
+) -> int:
+    """Streams a votes Parquet file through the learner and writes the predictions to Parquet.
+
+    The input is read with pyarrow and predicted `chunk_size` rows at a time and each
+    chunk is appended to `output_file`, so neither the votes nor the predictions are
+    ever fully held in memory. An empty input yields an empty `output_file` with the
+    output columns.
+
+    Args:
+        learn (TabularLearner): The trained fastai learner, see `load_learner`.
+        input_file (Path): The votes Parquet file.
+        output_file (Path): The predictions Parquet file, its parent directory is created if missing.
+        chunk_size (int, optional): Number of rows read and predicted at a time. Defaults to 100_000.
+        batch_size (int, optional): Number of rows per forward pass. Defaults to 1024.
+        y_col (str, optional): The name of the target variable column. Defaults to "vote".
+        keep_cols (list[str] | None, optional): Input columns copied to the output, None copies all. Defaults to None.
+
+    Returns:
+        int: The number of predicted rows.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    parquet_file = pq.ParquetFile(input_file)
+
+    n_rows = 0
+    writer = None
+    try:
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            chunk = pl.DataFrame(pa.Table.from_batches([batch]))
+            preds = predict_votes(learn, chunk, batch_size=batch_size, y_col=y_col)
+            if keep_cols is not None:
+                chunk = chunk.select(keep_cols)
+            table = chunk.hstack(preds).to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(output_file, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            n_rows += len(chunk)
+            logger.debug(f"Predicted {n_rows} rows")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        logger.warning(f"No rows in {input_file}, writing empty {output_file}")
+        empty = pl.DataFrame(parquet_file.schema_arrow.empty_table())
+        if keep_cols is not None:
+            empty = empty.select(keep_cols)
+        empty = empty.hstack(
+            pl.DataFrame(schema=get_prediction_schema(learn, y_col=y_col))
+        )
+        pq.write_table(empty.to_arrow(), output_file)
+    else:
+        logger.info(f"Wrote {n_rows} predictions to {output_file}")
+    return n_rows
+
+
+def reduce_embeddings_pca(x) -> np.ndarray:
+    """Reduces an embedding tensor to 2 dimensions using PCA.
+
+    Args:
+        x (torch.Tensor): The embedding weights, shape (n_categories, n_dims).
+
+    Returns:
+        np.ndarray: The reduced embeddings, shape (n_categories, 2).
+    """
+    from sklearn import decomposition
+
+    return decomposition.PCA(n_components=2).fit_transform(x.detach().numpy())
+
+
 def get_embeddings(
-    learn: TabularLearner,
-    transform_func=lambda x: decomposition.PCA(n_components=2).fit_transform(
-        x.detach().numpy()
-    ),
+    learn: "TabularLearner",
+    transform_func=reduce_embeddings_pca,
 ) -> dict[str, pd.DataFrame]:
     """Extracts and optionally transforms embeddings from a trained fastai TabularLearner.
 
@@ -171,7 +366,7 @@ def get_embeddings(
     Args:
         learn (TabularLearner): The trained fastai learner containing the model with embeddings.
         transform_func (callable, optional): A function to apply to the extracted embedding tensors.
-                                            Defaults to a lambda function that performs PCA to 2 components.
+                                            Defaults to `reduce_embeddings_pca`.
                                             If set to None or another non-callable, no transformation is applied.
 
     Returns:
@@ -180,6 +375,8 @@ def get_embeddings(
                                  Each DataFrame includes the original category labels.
     """
 
+    import torch
+
     embeddings = {}
 
     for i, name in enumerate(learn.dls.classes):
@@ -208,20 +405,19 @@ def get_poll_proponents(
 
     Args:
         df_all_votes (pl.DataFrame): DataFrame containing all vote records, including
-                                     'poll_id', 'vote', and 'politician name'.
+                                     'poll_id', 'vote', and 'mandate_id'.
         df_mandates (pl.DataFrame): DataFrame with mandate information, linking
-                                    'politician' names to their 'party'.
+                                    'mandate_id' to 'party'.
 
     Returns:
         pl.DataFrame: A DataFrame with one row per 'poll_id', indicating the
                       'strongest proponent' party for that poll.
     """
 
-    votes_slim = df_all_votes.select(["poll_id", "vote", "politician name"])
+    votes_slim = df_all_votes.select(["poll_id", "vote", "mandate_id"])
     politician_votes = votes_slim.join(
-        df_mandates.select(["politician", "party"]),
-        left_on="politician name",
-        right_on="politician",
+        df_mandates.select(["mandate_id", "party"]),
+        on="mandate_id",
     )
 
     poll_agreement = (
@@ -248,9 +444,9 @@ def plot_poll_embeddings(
     df_polls: pl.DataFrame,
     embeddings: dict[str, pl.DataFrame],
     df_mandates: pl.DataFrame,
-    colors: scale_color_manual,
+    colors: "scale_color_manual",
     col: str = "poll_id",
-) -> ggplot:
+) -> "ggplot":
     """Visualizes poll embeddings in a 2D scatter plot.
 
     This function takes poll embeddings (typically reduced to 2 dimensions via PCA),
@@ -283,6 +479,8 @@ def plot_poll_embeddings(
     proponents = get_poll_proponents(df_all_votes, df_mandates)
     tmp = tmp.join(proponents.select([col, "strongest proponent"]), on=col)
 
+    from plotnine import aes, geom_point, ggplot, labs
+
     x = f"{col}__emb_component_0"
     y = f"{col}__emb_component_1"
 
@@ -305,10 +503,10 @@ def plot_politician_embeddings(
     df_all_votes: pl.DataFrame,
     df_mandates: pl.DataFrame,
     embeddings: dict[str, pl.DataFrame],
-    colors: scale_color_manual,
+    colors: "scale_color_manual",
     col: str = "politician name",
     palette: dict[str, str] | None = None,
-) -> ggplot:
+) -> "ggplot":
     """Visualizes politician embeddings in a 2D scatter plot.
 
     This function takes politician embeddings (typically reduced to 2 dimensions),
@@ -341,6 +539,8 @@ def plot_politician_embeddings(
 
     palette = PALETTE if palette is None else palette
 
+    from plotnine import aes, geom_point, ggplot, labs
+
     x = f"{col}__emb_component_0"
     y = f"{col}__emb_component_1"
 
@@ -1,6 +1,8 @@
+import datetime
 import logging
 from unittest.mock import patch
 
+import polars as pl
 from typer.testing import CliRunner
 
 from bundestag.cli.__main__ import app
@@ -27,3 +29,68 @@ def test_logging_is_setup(mock_setup_logging):
     result = runner.invoke(app, ["download", "--help"])
     assert result.exit_code == 0
     mock_setup_logging.assert_called_once_with(logging.INFO)
+
+
+def test_similarity_mdb_party(tmp_path):
+    preprocessed = tmp_path / "preprocessed" / "bundestag"
+    preprocessed.mkdir(parents=True)
+    pl.DataFrame(
+        {
+            "Bezeichnung": ["Alice", "Bob", "Carol"],
+            "Fraktion/Gruppe": ["A", "A", "B"],
+            "date": [datetime.date(2020, 1, 1)] * 3,
+            "title": ["Poll X"] * 3,
+            "vote": ["ja", "nein", "ja"],
+        }
+    ).write_parquet(preprocessed / "bundestag.de_votes.parquet")
+
+    result = runner.invoke(
+        app, ["similarity", "mdb-party", "--data-path", str(tmp_path)]
+    )
+
+    assert result.exit_code == 0, result.output
+    df = pl.read_parquet(preprocessed / "mdb_party_similarity.parquet")
+    assert df.height == 3 * 2
+    assert set(df.columns) == {
+        "Bezeichnung",
+        "Fraktion/Gruppe",
+        "Fraktion/Gruppe_party",
+        "similarity",
+        "# polls",
+    }
+
+
+@patch("bundestag.ml.vote_prediction.predict_votes_parquet")
+@patch("bundestag.ml.vote_prediction.load_learner")
+def test_predict_votes(mock_load_learner, mock_predict_votes_parquet, tmp_path):
+    result = runner.invoke(
+        app,
+        [
+            "predict",
+            "votes",
+            "--model",
+            str(tmp_path / "export.pkl"),
+            "--input",
+            str(tmp_path / "votes.parquet"),
+            "--output",
+            str(tmp_path / "predictions.parquet"),
+            "--chunk-size",
+            "10",
+            "--n-threads",
+            "2",
+            "--keep-col",
+            "poll_id",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    mock_load_learner.assert_called_once_with(tmp_path / "export.pkl", n_threads=2)
+    mock_predict_votes_parquet.assert_called_once_with(
+        mock_load_learner.return_value,
+        tmp_path / "votes.parquet",
+        tmp_path / "predictions.parquet",
+        chunk_size=10,
+        batch_size=1024,
+        y_col="vote",
+        keep_cols=["poll_id"],
+    )
@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+
+from bundestag.data.transform.abgeordnetenwatch.build_state import (
+    ArtifactState,
+    BuildState,
+    get_build_state_path,
+    get_changed_inputs,
+    get_file_fingerprint,
+    get_input_fingerprints,
+    load_build_state,
+    store_build_state,
+)
+
+
+def test_get_file_fingerprint_reuses_hash(tmp_path: Path):
+    file = tmp_path / "a.json"
+    file.write_text("{}")
+
+    fp = get_file_fingerprint(file)
+    assert fp.size == 2
+
+    # unchanged mtime and size -> previous fingerprint is returned as is
+    fake = fp.model_copy(update={"sha256": "not-a-real-hash"})
+    assert get_file_fingerprint(file, previous=fake) == fake
+
+
+def test_get_changed_inputs(tmp_path: Path):
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    a.write_text("a")
+    b.write_text("b")
+
+    current = get_input_fingerprints([a, b], tmp_path)
+    assert get_changed_inputs(current, None) == ({"a.json", "b.json"}, set())
+
+    previous = ArtifactState(inputs=current)
+    assert get_changed_inputs(current, previous) == (set(), set())
+
+    # touching a file without changing its content is not a change
+    os.utime(a, (0, 0))
+    current = get_input_fingerprints([a], tmp_path, previous=previous)
+    assert get_changed_inputs(current, previous) == (set(), {"b.json"})
+
+    a.write_text("aa")
+    current = get_input_fingerprints([a, b], tmp_path, previous=previous)
+    assert get_changed_inputs(current, previous) == ({"a.json"}, set())
+
+
+def test_store_and_load_build_state(tmp_path: Path):
+    assert load_build_state(111, tmp_path) == BuildState(legislature_id=111)
+
+    file = tmp_path / "a.json"
+    file.write_text("{}")
+    state = BuildState(
+        legislature_id=111,
+        artifacts={"x": ArtifactState(inputs=get_input_fingerprints([file], tmp_path))},
+    )
+    store_build_state(state, tmp_path)
+
+    assert get_build_state_path(111, tmp_path).exists()
+    assert load_build_state(111, tmp_path) == state
+
+    # corrupt state files are ignored
+    get_build_state_path(111, tmp_path).write_text("not json")
+    assert load_build_state(111, tmp_path) == BuildState(legislature_id=111)
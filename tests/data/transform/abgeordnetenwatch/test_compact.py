@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+import bundestag.schemas as schemas
+from bundestag.data.transform.abgeordnetenwatch.compact import (
+    SCHEMA_COMPACT_MANDATES_DATA,
+    SCHEMA_COMPACT_POLLS_DATA,
+    SCHEMA_COMPACT_VOTES_DATA,
+    OutputProfileEnum,
+    compact_mandates_data,
+    compact_polls_data,
+    compact_votes_data,
+    load_mandates_data,
+    load_polls_data,
+    load_votes_data,
+)
+from bundestag.data.transform.abgeordnetenwatch.process import (
+    compile_votes_data,
+    get_mandates_data,
+    get_polls_data,
+)
+from bundestag.data.transform.abgeordnetenwatch.process.mandates import (
+    SCHEMA_GET_MANDATES_DATA,
+    load_mandate_json,
+    parse_mandate_data,
+)
+from bundestag.data.transform.abgeordnetenwatch.transform import (
+    transform_mandates_data,
+    transform_votes_data,
+)
+
+
+@pytest.fixture(scope="module")
+def raw_path() -> Path:
+    return Path("tests/data_for_testing")
+
+
+@pytest.fixture(scope="module")
+def frames(raw_path: Path) -> dict[str, pl.DataFrame]:
+    return {
+        "polls": get_polls_data(111, raw_path),
+        "mandates": transform_mandates_data(get_mandates_data(111, raw_path)),
+        "votes": transform_votes_data(compile_votes_data(111, raw_path)),
+    }
+
+
+@pytest.mark.parametrize(
+    "name,compact_func,load_func,schema",
+    [
+        ("polls", compact_polls_data, load_polls_data, SCHEMA_COMPACT_POLLS_DATA),
+        (
+            "mandates",
+            compact_mandates_data,
+            load_mandates_data,
+            SCHEMA_COMPACT_MANDATES_DATA,
+        ),
+        ("votes", compact_votes_data, load_votes_data, SCHEMA_COMPACT_VOTES_DATA),
+    ],
+)
+def test_compact_round_trip(
+    name: str,
+    compact_func,
+    load_func,
+    schema: pl.Schema,
+    frames: dict[str, pl.DataFrame],
+    tmp_path: Path,
+):
+    df = frames[name]
+    compact = compact_func(df)
+    assert compact.schema == schema
+    assert compact.estimated_size() < df.estimated_size()
+
+    file = tmp_path / f"{name}.parquet"
+    compact.write_parquet(file)
+
+    assert load_func(file).equals(compact)
+    assert load_func(file, profile=OutputProfileEnum.default).equals(df)
+
+    # files written in the default profile are compacted when loaded
+    df.write_parquet(file)
+    assert load_func(file).equals(compact)
+    assert load_func(file, profile=OutputProfileEnum.default).equals(df)
+
+
+def test_compact_mandates_data_missing_dates(frames: dict[str, pl.DataFrame]):
+    df = frames["mandates"].head(1).with_columns(pl.lit("").alias("end_date"))
+    res = compact_mandates_data(df)
+    assert res["end_date"].to_list() == [None]
+
+
+def test_compact_round_trip_mandate_without_fraction(raw_path: Path, tmp_path: Path):
+    mandate = schemas.MandatesResponse(**load_mandate_json(111, raw_path)).data[0]
+    mandate.fraction_membership = []
+    df = transform_mandates_data(
+        pl.DataFrame([parse_mandate_data(mandate)], schema=SCHEMA_GET_MANDATES_DATA)
+    )
+    assert df["fraction_starts"].to_list() == [["unknown"]]
+    assert df["fraction_ends"].to_list() == [["unknown"]]
+
+    file = tmp_path / "mandates.parquet"
+    compact_mandates_data(df).write_parquet(file)
+
+    # line to test
+    res = load_mandates_data(file, profile=OutputProfileEnum.default)
+
+    assert res.equals(df)
@@ -0,0 +1,85 @@
+import datetime
+from pathlib import Path
+
+import polars as pl
+from inline_snapshot import snapshot
+
+from bundestag.data.transform.abgeordnetenwatch.dimension import (
+    SCHEMA_MANDATES_DIMENSION,
+    build_mandates_dimension,
+    dimension_has_legislature,
+    get_mandates_dimension_data,
+    get_mandates_dimension_path,
+    load_mandates_dimension,
+    update_mandates_dimension,
+)
+from bundestag.data.transform.abgeordnetenwatch.transform import (
+    transform_mandates_data,
+)
+
+
+def make_mandates(legislature_id: int, mandate_ids: list[int]) -> pl.DataFrame:
+    n = len(mandate_ids)
+    return transform_mandates_data(
+        pl.DataFrame(
+            {
+                "legislature_id": [legislature_id] * n,
+                "legislature_period": [f"Bundestag {legislature_id}"] * n,
+                "mandate_id": mandate_ids,
+                "mandate": ["Zeki Gökhan"] * n,
+                "politician_id": [122163] * n,
+                "politician": ["Zeki Gökhan"] * n,
+                "politician_url": ["url"] * n,
+                "start_date": ["2021-08-19"] * n,
+                "end_date": [""] * n,
+                "constituency_id": [4215] * n,
+                "constituency_name": ["91 - Rhein-Erft-Kreis I"] * n,
+                "fraction_names": [
+                    ["DIE LINKE seit 19.08.2021", "fraktionslos seit 01.09.2021"]
+                ]
+                * n,
+                "fraction_ids": [[9233, 9234]] * n,
+                "fraction_starts": [["2021-08-19", "2021-09-01"]] * n,
+                "fraction_ends": [["2021-08-31", ""]] * n,
+            }
+        )
+    )
+
+
+def test_get_mandates_dimension_data():
+    res = get_mandates_dimension_data(make_mandates(111, [52657]))
+    assert res.schema == SCHEMA_MANDATES_DIMENSION
+    assert res.select("party", "valid_from", "valid_to").rows() == snapshot(
+        [
+            ("DIE LINKE", datetime.date(2021, 8, 19), datetime.date(2021, 8, 31)),
+            ("fraktionslos", datetime.date(2021, 9, 1), None),
+        ]
+    )
+
+
+def test_update_mandates_dimension(tmp_path: Path):
+    assert not dimension_has_legislature(111, tmp_path)
+
+    update_mandates_dimension(111, tmp_path, make_mandates(111, [1]))
+    update_mandates_dimension(132, tmp_path, make_mandates(132, [2, 3]))
+    assert dimension_has_legislature(111, tmp_path)
+    assert dimension_has_legislature(132, tmp_path)
+
+    # re-transforming a legislature replaces its rows
+    update_mandates_dimension(111, tmp_path, make_mandates(111, [4]))
+    res = load_mandates_dimension(tmp_path)
+    assert sorted(res["mandate_id"].unique().to_list()) == [2, 3, 4]
+    assert len(res) == 6
+
+
+def test_build_mandates_dimension(tmp_path: Path):
+    make_mandates(111, [1]).write_parquet(tmp_path / "mandates_111.parquet")
+    make_mandates(132, [2]).write_parquet(tmp_path / "mandates_132.parquet")
+
+    res = build_mandates_dimension(tmp_path, dry=True)
+    assert not get_mandates_dimension_path(tmp_path).exists()
+    assert sorted(res["legislature_id"].unique().to_list()) == [111, 132]
+
+    build_mandates_dimension(tmp_path)
+    # the dimension table itself is not picked up as mandates file
+    assert build_mandates_dimension(tmp_path).equals(res)
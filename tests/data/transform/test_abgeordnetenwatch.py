@@ -1,13 +1,31 @@
+import json
+import shutil
 from pathlib import Path
 
 import polars as pl
 import pytest
 from inline_snapshot import snapshot
 
+from bundestag.data.transform.abgeordnetenwatch.build_state import (
+    get_build_state_path,
+)
+from bundestag.data.transform.abgeordnetenwatch.compact import (
+    SCHEMA_COMPACT_VOTES_DATA,
+    OutputProfileEnum,
+    load_votes_data,
+)
+from bundestag.data.transform.abgeordnetenwatch.dimension import (
+    dimension_has_legislature,
+)
 from bundestag.data.transform.abgeordnetenwatch.transform import (
+    SCHEMA_VOTES_FACT_DATA,
+    VotesFormatEnum,
     get_mandates_parquet_path,
     get_polls_parquet_path,
     get_votes_csv_path,
+    get_votes_fact_data,
+    get_votes_fact_parquet_path,
+    get_votes_ipc_path,
     get_votes_parquet_path,
     run,
     transform_mandates_data,
@@ -96,6 +114,23 @@ def test_transform_votes_data(VOTES_DF: pl.DataFrame):
     )
 
 
+def test_get_votes_fact_data(MANDATES_DF: pl.DataFrame, VOTES_DF: pl.DataFrame):
+    df_mandates = transform_mandates_data(
+        MANDATES_DF.with_columns(pl.Series("mandate_id", [45467, 99999]))
+    )
+    df_polls = pl.DataFrame({"poll_id": [4217], "poll_date": ["2021-09-07"]})
+
+    res = get_votes_fact_data(VOTES_DF, df_mandates, df_polls)
+
+    assert res.schema == SCHEMA_VOTES_FACT_DATA
+    assert res["mandate_id"].to_list() == VOTES_DF["mandate_id"].to_list()
+    assert res["party"].cast(pl.String).to_list() == snapshot(["DIE LINKE", None])
+    assert res["vote"].cast(pl.String).to_list() == snapshot(["yes", "yes"])
+    assert res["poll_date"].cast(pl.String).to_list() == snapshot(
+        ["2021-09-07", "2021-09-07"]
+    )
+
+
 @pytest.mark.parametrize(
     "dry,validate",
     [
@@ -140,3 +175,134 @@ def test_run(
         assert votes_csv_path.exists()
         assert mandates_parquet_path.exists()
         assert polls_parquet_path.exists()
+
+        assert dimension_has_legislature(legislature_id, preprocessed_path)
+
+        fact_path = get_votes_fact_parquet_path(legislature_id, preprocessed_path)
+        df_fact = pl.read_parquet(fact_path)
+        assert df_fact.schema == SCHEMA_VOTES_FACT_DATA
+        assert len(df_fact) == len(pl.read_parquet(votes_parquet_path))
+
+
+def test_run_skips_unchanged_inputs(raw_path: Path, tmp_path: Path):
+    legislature_id = 111
+    raw_copy = tmp_path / "raw"
+    shutil.copytree(raw_path, raw_copy)
+    preprocessed_path = tmp_path / "preprocessed"
+
+    run(legislature_id, raw_copy, preprocessed_path, dry=False, assume_yes=True)
+    assert get_build_state_path(legislature_id, preprocessed_path).exists()
+
+    outputs = [
+        get_polls_parquet_path(legislature_id, preprocessed_path),
+        get_mandates_parquet_path(legislature_id, preprocessed_path),
+        get_votes_parquet_path(legislature_id, preprocessed_path),
+        get_votes_csv_path(legislature_id, preprocessed_path),
+    ]
+    mtimes = [f.stat().st_mtime_ns for f in outputs]
+    df_votes = pl.read_parquet(outputs[2])
+
+    # second run without changed inputs -> nothing is rewritten
+    run(legislature_id, raw_copy, preprocessed_path, dry=False, assume_yes=True)
+    assert [f.stat().st_mtime_ns for f in outputs] == mtimes
+
+    # a newly downloaded poll is appended to the existing votes
+    votes_dir = raw_copy / f"votes_legislature_{legislature_id}"
+    votes = json.loads((votes_dir / "poll_4217_votes.json").read_text())
+    for vote in votes["data"]["related_data"]["votes"]:
+        vote["poll"]["id"] = 1
+    (votes_dir / "poll_1_votes.json").write_text(json.dumps(votes))
+    run(legislature_id, raw_copy, preprocessed_path, dry=False, assume_yes=True)
+
+    assert outputs[0].stat().st_mtime_ns == mtimes[0]
+    assert outputs[1].stat().st_mtime_ns == mtimes[1]
+    df_updated = pl.read_parquet(outputs[2])
+    assert len(df_updated) == 2 * len(df_votes)
+    assert df_updated.filter(pl.col("poll_id") == 4217).equals(df_votes)
+
+    # a removed poll file drops its votes again
+    (votes_dir / "poll_1_votes.json").unlink()
+    run(legislature_id, raw_copy, preprocessed_path, dry=False, assume_yes=True)
+    assert pl.read_parquet(outputs[2]).equals(df_votes)
+
+
+@pytest.mark.parametrize(
+    "votes_formats",
+    [
+        [VotesFormatEnum.parquet],
+        [VotesFormatEnum.csv],
+        [VotesFormatEnum.ipc, VotesFormatEnum.csv],
+        [VotesFormatEnum.csv, VotesFormatEnum.parquet],
+        [VotesFormatEnum.none],
+    ],
+)
+def test_run_votes_formats(
+    votes_formats: list[VotesFormatEnum], raw_path: Path, tmp_path: Path
+):
+    legislature_id = 111
+    preprocessed_path = tmp_path / "preprocessed"
+    run(
+        legislature_id,
+        raw_path,
+        preprocessed_path,
+        dry=False,
+        assume_yes=True,
+        votes_formats=votes_formats,
+    )
+
+    files = {
+        VotesFormatEnum.parquet: get_votes_parquet_path(
+            legislature_id, preprocessed_path
+        ),
+        VotesFormatEnum.csv: get_votes_csv_path(legislature_id, preprocessed_path),
+        VotesFormatEnum.ipc: get_votes_ipc_path(legislature_id, preprocessed_path),
+    }
+    for fmt, file in files.items():
+        assert file.exists() == (fmt in votes_formats)
+
+    if VotesFormatEnum.csv in votes_formats:
+        df_csv = pl.read_csv(files[VotesFormatEnum.csv])
+        assert df_csv.height > 0
+        if VotesFormatEnum.ipc in votes_formats:
+            df_ipc = pl.read_ipc(files[VotesFormatEnum.ipc])
+            assert df_csv.cast(df_ipc.schema).equals(df_ipc)
+        if VotesFormatEnum.parquet in votes_formats:
+            df_parquet = pl.read_parquet(files[VotesFormatEnum.parquet])
+            assert df_csv.cast(df_parquet.schema).equals(df_parquet)
+
+    # re-running with unchanged inputs keeps the outputs
+    mtimes = {f: f.stat().st_mtime_ns for f in files.values() if f.exists()}
+    run(
+        legislature_id,
+        raw_path,
+        preprocessed_path,
+        dry=False,
+        assume_yes=True,
+        votes_formats=votes_formats,
+    )
+    assert {f: f.stat().st_mtime_ns for f in mtimes} == mtimes
+
+
+def test_run_compact_profile(raw_path: Path, tmp_path: Path):
+    legislature_id = 111
+    preprocessed_path = tmp_path / "preprocessed"
+    run(legislature_id, raw_path, preprocessed_path, dry=False, assume_yes=True)
+
+    votes_path = get_votes_parquet_path(legislature_id, preprocessed_path)
+    df_default = pl.read_parquet(votes_path)
+
+    # changing the profile rewrites the outputs despite unchanged inputs
+    run(
+        legislature_id,
+        raw_path,
+        preprocessed_path,
+        dry=False,
+        assume_yes=True,
+        profile=OutputProfileEnum.compact,
+    )
+    df_compact = pl.read_parquet(votes_path)
+    assert df_compact.schema == SCHEMA_COMPACT_VOTES_DATA
+    assert load_votes_data(votes_path, profile=OutputProfileEnum.default).equals(
+        df_default
+    )
+    assert get_votes_fact_parquet_path(legislature_id, preprocessed_path).exists()
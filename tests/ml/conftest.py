@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import polars as pl
 import pytest
@@ -26,7 +27,7 @@ def embeddings(learn: TabularLearner) -> dict[str, pd.DataFrame]:
 
 
 @pytest.fixture()
-def splits(df_all_votes: pl.DataFrame) -> tuple[list[int], list[int]]:
+def splits(df_all_votes: pl.DataFrame) -> tuple[np.ndarray, np.ndarray]:
     return poll_splitter(df_all_votes, valid_pct=0.2)
 
 
@@ -46,7 +47,7 @@ def data_loaders(tabular_object: TabularPandas) -> DataLoaders:
 @pytest.fixture()
 def tabular_object(
     df_all_votes: pl.DataFrame,
-    splits: tuple[list[int], list[int]],
+    splits: tuple[np.ndarray, np.ndarray],
     y_col: str,
 ) -> TabularPandas:
     return TabularPandas(
@@ -55,7 +56,8 @@ def tabular_object(
         y_names=[y_col],
         procs=[Categorify],
         y_block=CategoryBlock,
-        splits=splits,
+        # fastai concatenates the splits with `sum(splits, [])`
+        splits=[ix.tolist() for ix in splits],
     )
 
 
@@ -92,3 +94,27 @@ def df_all_votes(base_path: Path) -> pl.DataFrame:
 @pytest.fixture()
 def base_path() -> Path:
     return Path("tests/data_for_testing")
+
+
+@pytest.fixture(scope="session")
+def exported_learner(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    rng = np.random.default_rng(42)
+    df = pl.DataFrame(
+        {
+            "politician name": rng.choice(["a", "b", "c"], 200),
+            "poll_id": rng.integers(0, 10, 200),
+            "vote": rng.choice(["yes", "no", "abstain"], 200),
+        }
+    )
+    to = TabularPandas(
+        df.to_pandas(),
+        cat_names=["politician name", "poll_id"],
+        y_names=["vote"],
+        procs=[Categorify],
+        y_block=CategoryBlock,
+        splits=(list(range(150)), list(range(150, 200))),
+    )
+    learn = tabular_learner(to.dataloaders(bs=64))
+    file = tmp_path_factory.mktemp("learner") / "export.pkl"
+    learn.export(file)
+    return file
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bundestag.ml.embeddings import (
+    NA_CATEGORY,
+    SCHEMA_EMBEDDING_NEIGHBOURS,
+    EmbeddingIndex,
+    get_embedding_indices,
+    get_embeddings_path,
+    load_embeddings,
+    save_embeddings,
+)
+from bundestag.ml.vote_prediction import load_learner
+
+
+@pytest.fixture()
+def index() -> EmbeddingIndex:
+    vectors = np.array(
+        [[1.0, 0.0], [2.0, 0.1], [0.0, 1.0], [-1.0, 0.0]], dtype=np.float64
+    )
+    return EmbeddingIndex(name="poll_id", labels=["a", "b", "c", "d"], vectors=vectors)
+
+
+def test_query(index: EmbeddingIndex):
+    # line to test
+    res = index.query("a", k=2)
+
+    assert res.schema == SCHEMA_EMBEDDING_NEIGHBOURS
+    assert res["neighbour"].to_list() == ["b", "c"]
+    assert res["rank"].to_list() == [1, 2]
+    assert res["similarity"].to_list() == pytest.approx(
+        [2 / np.sqrt(4.01), 0.0], abs=1e-6
+    )
+    assert index.vectors.dtype == np.float32
+    # k is capped at the number of other labels
+    assert len(index.query("a", k=10)) == 3
+
+
+def test_query_unknown(index: EmbeddingIndex):
+    with pytest.raises(ValueError):
+        index.query("wup")
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 1024])
+def test_get_all_neighbours(index: EmbeddingIndex, block_size: int):
+    # line to test
+    res = index.get_all_neighbours(k=1, block_size=block_size)
+
+    assert res.schema == SCHEMA_EMBEDDING_NEIGHBOURS
+    assert res["label"].to_list() == ["a", "b", "c", "d"]
+    assert res["neighbour"].to_list() == ["b", "a", "b", "c"]
+
+
+def test_save_and_load_embeddings(index: EmbeddingIndex, tmp_path: Path):
+    # line to test
+    files = save_embeddings({index.name: index}, tmp_path)
+
+    assert files == [get_embeddings_path(tmp_path, "poll_id")]
+    loaded = load_embeddings(files[0])
+    assert loaded.name == index.name
+    assert loaded.labels == index.labels
+    assert loaded.vectors.dtype == np.float32
+    np.testing.assert_array_equal(loaded.vectors, index.vectors)
+    assert loaded.query("a", k=3).equals(index.query("a", k=3))
+
+
+def test_get_embedding_indices(exported_learner: Path, tmp_path: Path):
+    learn = load_learner(exported_learner)
+
+    # line to test
+    indices = get_embedding_indices(learn)
+
+    assert list(indices) == ["politician name", "poll_id"]
+    politicians = indices["politician name"]
+    classes = [str(c) for c in learn.dls.classes["politician name"]]
+    assert NA_CATEGORY in classes
+    assert politicians.labels == [c for c in classes if c != NA_CATEGORY]
+    assert politicians.vectors.shape[0] == len(politicians.labels)
+    assert len(politicians.query("a", k=2)) == 2
+    for index in indices.values():
+        neighbours = index.get_all_neighbours(k=len(index.labels))
+        assert NA_CATEGORY not in neighbours["neighbour"].to_list()
+
+    files = save_embeddings(indices, tmp_path)
+    assert [f.name for f in files] == [
+        "embeddings_politician_name.parquet",
+        "embeddings_poll_id.parquet",
+    ]
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from bundestag.ml.mdb_similarity import (
+    SCHEMA_MDB_NEIGHBOURS,
+    get_mdb_neighbours,
+    get_mdb_vote_matrix,
+    get_most_similar_mdbs,
+    load_or_compute_mdb_neighbours,
+)
+
+
+@pytest.fixture(scope="module")
+def df() -> pl.DataFrame:
+    votes = {
+        "A": ["ja", "nein", "ja"],
+        "B": ["ja", "nein", "nein"],
+        "C": ["nein", "ja", "nein"],
+        "D": ["ja", "nein", "ja"],
+    }
+    return pl.DataFrame(
+        {
+            "Bezeichnung": [m for m in votes for _ in range(3)],
+            "vote": [v for vs in votes.values() for v in vs],
+            "date": ["2022-01-01", "2022-02-01", "2022-03-01"] * 4,
+            "title": ["x", "y", "z"] * 4,
+        }
+    )
+
+
+def test_get_mdb_vote_matrix(df: pl.DataFrame):
+    # line to test
+    vote_matrix = get_mdb_vote_matrix(df)
+
+    assert vote_matrix.mdbs == ["A", "B", "C", "D"]
+    assert vote_matrix.polls["title"].to_list() == ["x", "y", "z"]
+    assert vote_matrix.matrix.shape == (4, 3 * 5)
+    assert vote_matrix.matrix.nnz == 12
+    norms = np.sqrt(vote_matrix.matrix.multiply(vote_matrix.matrix).sum(axis=1))
+    assert np.allclose(norms, 1.0)
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 256])
+def test_get_mdb_neighbours(df: pl.DataFrame, block_size: int):
+    vote_matrix = get_mdb_vote_matrix(df)
+
+    # line to test
+    neighbours = get_mdb_neighbours(vote_matrix, k=2, block_size=block_size, n_jobs=2)
+
+    assert neighbours.schema == SCHEMA_MDB_NEIGHBOURS
+    assert len(neighbours) == 8
+    top = get_most_similar_mdbs(neighbours, "A", k=1)
+    assert top["Bezeichnung_b"].to_list() == ["D"]
+    assert top["similarity"].item() == pytest.approx(1.0)
+    assert get_most_similar_mdbs(neighbours, "A")["Bezeichnung_b"].to_list() == [
+        "D",
+        "B",
+    ]
+    assert get_most_similar_mdbs(neighbours, "B")["similarity"].to_list() == (
+        pytest.approx([2 / 3, 2 / 3])
+    )
+    # no MdB is its own neighbour
+    assert (neighbours["Bezeichnung"] != neighbours["Bezeichnung_b"]).all()
+
+
+def test_get_mdb_neighbours_k_larger_than_mdbs(df: pl.DataFrame):
+    neighbours = get_mdb_neighbours(get_mdb_vote_matrix(df), k=10)
+    assert len(neighbours) == 4 * 3
+
+
+def test_get_most_similar_mdbs_unknown(df: pl.DataFrame):
+    neighbours = get_mdb_neighbours(get_mdb_vote_matrix(df), k=2)
+    with pytest.raises(ValueError):
+        get_most_similar_mdbs(neighbours, "wup")
+
+
+def test_load_or_compute_mdb_neighbours(df: pl.DataFrame, tmp_path: Path):
+    # line to test
+    neighbours = load_or_compute_mdb_neighbours(df, tmp_path, k=2)
+
+    files = list(tmp_path.glob("mdb_neighbours_*_k2.parquet"))
+    assert len(files) == 1
+    mtime = files[0].stat().st_mtime_ns
+
+    # cache hit
+    cached = load_or_compute_mdb_neighbours(df, tmp_path, k=2)
+    assert cached.equals(neighbours)
+    assert files[0].stat().st_mtime_ns == mtime
+
+    # changed votes get a new cache file
+    load_or_compute_mdb_neighbours(df.with_columns(vote=pl.lit("ja")), tmp_path, k=2)
+    assert len(list(tmp_path.glob("mdb_neighbours_*_k2.parquet"))) == 2
@@ -0,0 +1,56 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from bundestag.ml.neighbours import get_blocks, get_top_k, neighbours_to_frame
+
+SCHEMA = pl.Schema(
+    {
+        "label": pl.String(),
+        "neighbour": pl.String(),
+        "rank": pl.UInt32(),
+        "similarity": pl.Float32(),
+    }
+)
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 5, 10])
+def test_get_blocks(block_size: int):
+    # line to test
+    blocks = get_blocks(5, block_size)
+
+    assert all(len(b) <= block_size for b in blocks)
+    np.testing.assert_array_equal(np.concatenate(blocks), np.arange(5))
+
+
+def test_get_top_k():
+    similarity = np.array([[1.0, 0.2, 0.5], [0.2, 1.0, 0.9]])
+
+    # line to test
+    neighbours, similarities = get_top_k(similarity.copy(), k=2)
+
+    np.testing.assert_array_equal(neighbours, [[0, 2], [1, 2]])
+    np.testing.assert_array_equal(similarities, [[1.0, 0.5], [1.0, 0.9]])
+
+    # excluding the query itself caps k at the remaining candidates
+    neighbours, similarities = get_top_k(
+        similarity.copy(), k=5, exclude=np.array([0, 1])
+    )
+    np.testing.assert_array_equal(neighbours, [[2, 1], [2, 0]])
+    np.testing.assert_array_equal(similarities, [[0.5, 0.2], [0.9, 0.2]])
+
+
+def test_neighbours_to_frame():
+    # line to test
+    res = neighbours_to_frame(
+        ["a", "b", "c"],
+        np.array([0, 2]),
+        np.array([[2, 1], [0, 1]]),
+        np.array([[0.5, 0.2], [0.9, 0.1]]),
+        SCHEMA,
+    )
+
+    assert res.schema == SCHEMA
+    assert res["label"].to_list() == ["a", "a", "c", "c"]
+    assert res["neighbour"].to_list() == ["c", "b", "a", "b"]
+    assert res["rank"].to_list() == [1, 2, 1, 2]
@@ -1,4 +1,6 @@
 from functools import partial
+from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import polars as pl
@@ -6,9 +8,14 @@ import pytest
 import spacy
 
 from bundestag.ml.poll_clustering import (
+    SCHEMA_CLEANED_TEXTS_CACHE,
+    ParquetDocuments,
     SpacyTransformer,
     clean_text,
+    clean_texts,
+    clean_texts_cached,
     compare_word_frequencies,
+    get_model_id,
     get_word_frequencies,
     make_topic_scores_dense,
     remove_numeric_and_empty,
@@ -73,6 +80,26 @@ def test_make_topic_scores_dense():
     np.testing.assert_array_equal(result, expected)
 
 
+@pytest.mark.parametrize("sparse", [True, False])
+def test_make_topic_scores_dense_ragged(sparse: bool):
+    scores = [[(2, 0.7)], [], [(0, 0.5), (1, 0.5)]]
+    expected = np.array([[0.0, 0.0, 0.7, 0.0], [0.0] * 4, [0.5, 0.5, 0.0, 0.0]])
+
+    # line to test
+    result = make_topic_scores_dense(scores, num_topics=4, sparse=sparse)
+
+    if sparse:
+        assert result.nnz == 3
+        result = result.toarray()
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("topic_id", [1.5, 1.0, "a"])
+def test_make_topic_scores_dense_non_int_topic_ids(topic_id):
+    with pytest.raises(ValueError, match="non-int topic ids"):
+        make_topic_scores_dense([[(0, 0.1), (topic_id, 0.9)]])
+
+
 def test_clean_text(nlp: spacy.language.Language):
     texts = [
         "Das ist ein Test\nmit Zeilenumbrüchen.",
@@ -91,6 +118,20 @@ def test_clean_text(nlp: spacy.language.Language):
         assert r == e
 
 
+@pytest.mark.parametrize("batch_size", [1, 2, 256])
+def test_clean_texts(batch_size: int, nlp: spacy.language.Language):
+    texts = [
+        "Das ist ein Test\nmit Zeilenumbrüchen.",
+        "Und hier ist noch einer mit Zahlen 123 und Satzzeichen!",
+        "Ein Text\xa0mit geschütztem Leerzeichen.",
+    ]
+
+    # line to test
+    result = clean_texts(texts, nlp, batch_size=batch_size)
+
+    assert result == [clean_text(t, nlp) for t in texts]
+
+
 @pytest.fixture()
 def spacy_transformer() -> SpacyTransformer:
     return SpacyTransformer()
@@ -151,6 +192,18 @@ class TestSpacyTransformer:
         mask = [len(v) == 0 for v in res]
         assert not any(mask)
 
+    def test_clean_texts(
+        self, df_polls: pl.DataFrame, spacy_transformer: SpacyTransformer
+    ):
+        texts = pl.concat([df_polls[self.col], pl.Series([None], dtype=pl.String)])
+
+        # line to test
+        res = spacy_transformer.clean_texts(texts, batch_size=4)
+
+        assert res.name == self.col
+        assert res.dtype == pl.List(pl.String)
+        assert res.to_list() == df_polls[self.nlp_col].to_list() + [None]
+
     def test_fit(self, df_polls: pl.DataFrame, spacy_transformer: SpacyTransformer):
         spacy_transformer.fit_lda(
             df_polls[self.nlp_col].to_list(),
@@ -195,7 +248,7 @@ class TestSpacyTransformer:
         assert isinstance(df_lda, pl.DataFrame)
         assert df_lda.shape == (
             df_polls.shape[0],
-            self.num_topics + 1 + df_polls.shape[1],
+            self.num_topics + df_polls.shape[1],
         )
         assert all([c in df_lda.columns for c in self.expected_nlp_cols])
 
@@ -235,3 +288,169 @@ def test_compare_word_frequencies():
 
     # line to test
     p = compare_word_frequencies(df, col0="c", col1="d")
+
+
+@pytest.fixture(scope="module")
+def blank_nlp() -> spacy.language.Language:
+    # stopwords and punctuation are lexical, the tokenizer suffices
+    return spacy.blank("de")
+
+
+def test_clean_texts_cached(blank_nlp: spacy.language.Language, tmp_path: Path):
+    cache_file = tmp_path / "cleaned_poll_texts.parquet"
+    df = pl.DataFrame(
+        {
+            "poll_id": [1, 2, 3],
+            "poll_title": ["Das ist ein Test", None, "Noch ein Test 123"],
+        }
+    )
+
+    # line to test
+    res = clean_texts_cached(df, "poll_title", blank_nlp, cache_file)
+
+    expected = [["Test"], None, ["Test"]]
+    assert res.to_list() == expected
+    cache = pl.read_parquet(cache_file)
+    assert cache.schema == SCHEMA_CLEANED_TEXTS_CACHE
+    assert cache.height == 2
+    assert cache["model"].unique().to_list() == [get_model_id(blank_nlp)]
+
+    # cache hit, the texts are not processed again
+    with patch("bundestag.ml.poll_clustering.clean_texts", side_effect=AssertionError):
+        res = clean_texts_cached(df.reverse(), "poll_title", blank_nlp, cache_file)
+    assert res.to_list() == expected[::-1]
+
+    # changed and new texts are processed, stale entries replaced
+    df_changed = pl.DataFrame(
+        {"poll_id": [1, 4], "poll_title": ["Ein anderer Titel", "Neu"]}
+    )
+    res = clean_texts_cached(df_changed, "poll_title", blank_nlp, cache_file)
+    assert res.to_list() == [["anderer", "Titel"], ["Neu"]]
+    cache = pl.read_parquet(cache_file)
+    assert sorted(cache["poll_id"].to_list()) == [1, 3, 4]
+
+    # other columns of the same polls get their own entries
+    df_description = df.select("poll_id", poll_description=pl.lit("Eine Beschreibung"))
+    clean_texts_cached(df_description, "poll_description", blank_nlp, cache_file)
+    assert pl.read_parquet(cache_file).height == 3 + 3
+
+
+@pytest.fixture(scope="module")
+def documents() -> list[list[str]]:
+    words = ["Bundeswehr", "Mali", "Klima", "Gesetz", "Änderung", "Kosovo"]
+    return [[words[(i + j) % len(words)] for j in range(i % 4 + 1)] for i in range(20)]
+
+
+def test_parquet_documents(documents: list[list[str]], tmp_path: Path):
+    files = [tmp_path / "a.parquet", tmp_path / "b.parquet"]
+    pl.DataFrame({"tokens": documents[:7]}).write_parquet(files[0])
+    pl.DataFrame({"tokens": documents[7:]}).write_parquet(files[1])
+
+    # line to test
+    docs = ParquetDocuments(files, "tokens", batch_size=3)
+
+    assert list(docs) == documents
+    # re-iterable
+    assert list(docs) == documents
+
+
+def test_fit_lda_streaming(documents: list[list[str]], tmp_path: Path):
+    file = tmp_path / "docs.parquet"
+    pl.DataFrame({"tokens": documents}).write_parquet(file)
+    corpus_file = tmp_path / "corpus" / "bow.mm"
+    st = SpacyTransformer("blank:de")
+
+    # line to test
+    st.fit_lda(
+        ParquetDocuments(file, "tokens", batch_size=4),
+        num_topics=3,
+        corpus_file=corpus_file,
+        workers=1,
+        chunksize=5,
+        passes=2,
+    )
+
+    assert corpus_file.exists()
+    assert len(st.corpus) == len(documents)
+    assert st.lda_model.passes == 2
+    assert st.lda_model.chunksize == 5
+
+    scores = st.get_topic_scores(documents, chunksize=3)
+    assert scores.shape == (len(documents), 3)
+    # topics below gensim's minimum_probability are dropped
+    assert np.all(scores.sum(axis=1) <= 1 + 1e-6)
+    assert np.all(scores.sum(axis=1) > 0.9)
+    df_lda = st.transform_documents(
+        pl.DataFrame({"tokens": documents}), "tokens", chunksize=7
+    )
+    assert df_lda.columns == ["topic_0", "topic_1", "topic_2"]
+
+
+@pytest.mark.parametrize("corpus_file", [None, "bow.mm"])
+def test_fit_lda_rejects_generator(
+    documents: list[list[str]], tmp_path: Path, corpus_file: str | None
+):
+    st = SpacyTransformer("blank:de")
+    with pytest.raises(TypeError, match="re-iterable"):
+        st.fit_lda(
+            (doc for doc in documents),
+            num_topics=2,
+            corpus_file=None if corpus_file is None else tmp_path / corpus_file,
+            workers=1,
+        )
+
+
+def test_save_and_load(documents: list[list[str]], tmp_path: Path):
+    st = SpacyTransformer("blank:de")
+    st.fit_lda(documents, num_topics=3, workers=1)
+    path = tmp_path / "topic_model"
+
+    # line to test
+    assert st.save(path) == path / "v1"
+    assert st.save(path) == path / "v2"
+
+    loaded = SpacyTransformer.load(path)
+
+    assert loaded._nlp is None
+    assert loaded.language == "blank:de"
+    assert loaded.lda_topics == st.lda_topics
+    assert loaded.dictionary.token2id == st.dictionary.token2id
+    np.testing.assert_allclose(
+        loaded.get_topic_scores(documents), st.get_topic_scores(documents)
+    )
+    assert SpacyTransformer.load(path, version=1).lda_topics == st.lda_topics
+
+
+def test_save_and_load_errors(documents: list[list[str]], tmp_path: Path):
+    st = SpacyTransformer("blank:de")
+    with pytest.raises(ValueError, match="fit_lda"):
+        st.save(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        SpacyTransformer.load(tmp_path)
+
+    st.fit_lda(documents, num_topics=2, workers=1)
+    version_path = st.save(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        SpacyTransformer.load(tmp_path, version=2)
+
+    meta_file = version_path / "meta.json"
+    meta_file.write_text(
+        meta_file.read_text().replace('"format_version": 1', '"format_version": 99')
+    )
+    with pytest.raises(ValueError, match="format 99"):
+        SpacyTransformer.load(tmp_path)
+
+
+@pytest.mark.parametrize("chunksize", [None, 3, 100])
+def test_transform_chunked(documents: list[list[str]], chunksize: int | None):
+    st = SpacyTransformer("blank:de")
+    st.fit_lda(documents, num_topics=3, workers=1)
+    df = pl.DataFrame({"poll_id": range(len(documents)), "tokens": documents})
+
+    # line to test
+    res = st.transform(df, col="tokens", chunksize=chunksize)
+
+    assert res.columns == ["poll_id", "tokens", "topic_0", "topic_1", "topic_2"]
+    assert st.nlp_cols == ["topic_0", "topic_1", "topic_2"]
+    assert res.select(df.columns).equals(df)
+    assert res.select(st.nlp_cols).sum_horizontal().min() > 0.9
@@ -0,0 +1,89 @@
+import datetime
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from bundestag.ml.render import (
+    aggregate_similarity_over_time,
+    bin_overall_similarity,
+    draw_similarity_figure,
+    get_mdb_render_jobs,
+    prepare_render_job,
+    render_jobs,
+)
+
+
+@pytest.fixture(scope="module")
+def df_similarity() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "date": [
+                datetime.date(2020, 1, 1),
+                datetime.date(2020, 6, 1),
+                datetime.date(2021, 1, 1),
+            ]
+            * 2,
+            "Fraktion/Gruppe_party": ["A"] * 3 + ["B"] * 3,
+            "similarity": [0.0, 0.01, 1.0, 0.5, 0.5, float("nan")],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def df_votes() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "Bezeichnung": ["Alice", "Bob", "Carol"] * 2,
+            "Fraktion/Gruppe": ["A", "A", "B"] * 2,
+            "date": [datetime.date(2020, 1, 1)] * 3 + [datetime.date(2021, 1, 1)] * 3,
+            "title": ["Poll X"] * 3 + ["Poll Y"] * 3,
+            "vote": ["ja", "nein", "ja", "nein", "nein", "ja"],
+        }
+    )
+
+
+def test_bin_overall_similarity(df_similarity: pl.DataFrame):
+    # line to test
+    binned = bin_overall_similarity(df_similarity, "Fraktion/Gruppe_party", n_bins=10)
+
+    assert binned["Fraktion/Gruppe_party"].to_list() == ["A", "A", "B"]
+    assert binned["similarity"].to_list() == pytest.approx([0.05, 0.95, 0.55])
+    assert binned["count"].to_list() == [2, 1, 2]
+
+
+def test_aggregate_similarity_over_time(df_similarity: pl.DataFrame):
+    # line to test
+    agg = aggregate_similarity_over_time(df_similarity, "Fraktion/Gruppe_party")
+
+    a = agg.filter(pl.col("Fraktion/Gruppe_party") == "A")
+    assert a["date"].to_list() == [datetime.date(2020, 1, 1), datetime.date(2021, 1, 1)]
+    assert a["similarity"].to_list() == pytest.approx([0.005, 1.0])
+    assert a["count"].to_list() == [2, 1]
+
+
+def test_draw_similarity_figure(df_similarity: pl.DataFrame):
+    job = prepare_render_job(df_similarity, "x", "Fraktion/Gruppe_party")
+
+    # line to test
+    fig = draw_similarity_figure(job, palette={"A": "red"})
+
+    ax_overall, _ = fig.axes
+    assert [t.get_text() for t in ax_overall.get_xticklabels()] == ["A", "B"]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_render_jobs(df_votes: pl.DataFrame, tmp_path: Path, n_jobs: int):
+    jobs = get_mdb_render_jobs(df_votes)
+    assert [job.name for job in jobs] == ["Alice", "Bob", "Carol"]
+
+    # line to test
+    files = render_jobs(jobs, tmp_path, n_jobs=n_jobs)
+
+    assert len(files) == 3
+    assert all(f.exists() and f.suffix == ".png" for f in files)
+    mtimes = [f.stat().st_mtime_ns for f in files]
+
+    # cached images are not rendered again
+    assert render_jobs(jobs, tmp_path, n_jobs=n_jobs) == files
+    assert [f.stat().st_mtime_ns for f in files] == mtimes
@@ -1,3 +1,4 @@
+import datetime
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -10,15 +11,25 @@ from bundestag.ml.similarity import (
     align_mdb_with_parties,
     align_party_with_all_parties,
     align_party_with_party,
+    batch_cosine_similarity,
+    batched_metric,
+    build_mdb_index,
+    build_vote_cube,
+    compute_party_similarity_matrix,
     compute_similarity,
     cosine_similarity,
+    get_date_slice,
+    get_mdb_party_similarity,
     get_party_party_similarity,
+    get_pivoted_votes_by_party,
+    get_rolling_similarity,
     get_votes_by_party,
     pivot_party_votes_df,
     plot,
     plot_overall_similarity,
     plot_similarity_over_time,
     prepare_votes_of_mdb,
+    update_rolling_similarity,
 )
 
 
@@ -128,6 +139,56 @@ def test_compute_similarity(df: pl.DataFrame):
     assert res["similarity"].is_between(0, 1).all()
 
 
+def test_batch_cosine_similarity():
+    rng = np.random.default_rng(42)
+    A = rng.integers(0, 2, size=(50, 5)).astype(float)
+    B = rng.random(size=(50, 5))
+    A[0] = 0.0  # zero vector -> nan, as for the scalar version
+
+    # line to test
+    res = batch_cosine_similarity(A, B)
+
+    expected = np.array(
+        [cosine_similarity(a, b) if a.any() else np.nan for a, b in zip(A, B)]
+    )
+    assert np.allclose(res, expected, equal_nan=True)
+
+
+def test_compute_similarity_metrics(df: pl.DataFrame):
+    votes = get_votes_by_party(df)
+    pivoted = pivot_party_votes_df(votes)
+    mdb_votes = prepare_votes_of_mdb(df, "A")
+    mdb_vs_parties = align_mdb_with_parties(mdb_votes, pivoted)
+
+    calls = []
+
+    def scalar_metric(a, b):
+        calls.append(a)
+        return 0.5
+
+    @batched_metric
+    def batch_metric(A, B):
+        calls.append(A)
+        return np.full(len(A), 0.5)
+
+    # lines to test
+    res_default = compute_similarity(mdb_vs_parties, suffix="_party")
+    res_scalar = compute_similarity(
+        mdb_vs_parties, suffix="_party", similarity_metric=cosine_similarity
+    )
+    assert res_default["similarity"].equals(res_scalar["similarity"])
+
+    compute_similarity(mdb_vs_parties, suffix="_party", similarity_metric=scalar_metric)
+    assert len(calls) == len(mdb_vs_parties)
+
+    calls.clear()
+    res = compute_similarity(
+        mdb_vs_parties, suffix="_party", similarity_metric=batch_metric
+    )
+    assert len(calls) == 1
+    assert (res["similarity"] == 0.5).all()
+
+
 def test_align_party_with_party(df: pl.DataFrame):
     votes = get_votes_by_party(df)
     pivoted = pivot_party_votes_df(votes)
@@ -238,3 +299,292 @@ def test_plot():
         assert isinstance(axs, np.ndarray)
         _plot_overall.assert_called_once()
         _plot_time.assert_called_once()
+
+
+def test_compute_party_similarity_matrix():
+    df = pl.DataFrame(
+        {
+            "Fraktion/Gruppe": ["A", "A", "B", "B", "C", "A", "B", "C", "C"],
+            "vote": ["ja", "nein", "ja", "ja", "nein", "ja", "nein", "ja", "ja"],
+            "date": [datetime.date(2020, 1, 1)] * 5 + [datetime.date(2021, 6, 1)] * 4,
+            "title": ["x"] * 5 + ["y"] * 4,
+            "Bezeichnung": list("abcdefghi"),
+        }
+    )
+    pivoted = pivot_party_votes_df(get_votes_by_party(df))
+
+    # line to test
+    res = compute_party_similarity_matrix(pivoted)
+
+    assert res.parties == ["A", "B", "C"]
+    assert res.matrix.shape == (1, 3, 3)
+    assert np.allclose(np.diagonal(res.matrix[0]), 1.0)
+
+    # same as the pairwise pipeline averaged over polls
+    expected = (
+        align_party_with_all_parties(pivoted, party_a="A")
+        .pipe(compute_similarity, suffix="_b")
+        .group_by("Fraktion/Gruppe_b")
+        .agg(pl.col("similarity").mean(), pl.len().alias("# polls"))
+    )
+    actual = res.frame.filter(
+        (pl.col("Fraktion/Gruppe") == "A") & (pl.col("Fraktion/Gruppe_b") != "A")
+    )
+    joined = expected.join(actual, on="Fraktion/Gruppe_b")
+    assert len(joined) == 2
+    assert np.allclose(joined["similarity"], joined["similarity_right"])
+    assert (joined["# polls"] == joined["# polls_right"]).all()
+
+    # per year
+    res = compute_party_similarity_matrix(pivoted, every="1y")
+    assert res.windows == [datetime.date(2020, 1, 1), datetime.date(2021, 1, 1)]
+    assert res.matrix.shape == (2, 3, 3)
+    assert res.frame["window"].n_unique() == 2
+    assert (
+        res.n_polls.sum(axis=0).tolist()
+        == compute_party_similarity_matrix(pivoted).n_polls[0].tolist()
+    )
+
+
+def test_get_pivoted_votes_by_party(df: pl.DataFrame):
+    # line to test
+    pivoted = get_pivoted_votes_by_party(df)
+
+    expected = pivot_party_votes_df(get_votes_by_party(df))
+    assert pivoted.height == expected.height
+    joined = pivoted.join(expected, on=["Fraktion/Gruppe", "date", "title"])
+    for c in transform_bs.VOTE_COLS:
+        assert np.allclose(joined[c], joined[f"{c}_right"])
+    assert pivoted["# votes"].to_list() == [3, 3]
+    assert pivoted["# ja"].to_list() == [1, 1]
+
+
+@pytest.mark.parametrize("as_string", [False, True])
+@pytest.mark.parametrize(
+    "start_date,end_date,expected",
+    [
+        (None, None, slice(0, 5)),
+        (datetime.date(2020, 1, 2), datetime.date(2020, 1, 3), slice(1, 4)),
+        (datetime.date(2020, 1, 3), None, slice(2, 5)),
+        (None, datetime.date(2019, 1, 1), slice(0, 0)),
+        (datetime.date(2020, 1, 4), datetime.date(2020, 1, 2), slice(4, 4)),
+    ],
+)
+def test_get_date_slice(
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+    expected: slice,
+    as_string: bool,
+):
+    dates = pl.Series(
+        "date",
+        [
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 1, 2),
+            datetime.date(2020, 1, 3),
+            datetime.date(2020, 1, 3),
+            datetime.date(2020, 1, 5),
+        ],
+    )
+    if as_string:
+        dates = dates.dt.to_string("%Y-%m-%d")
+
+    # line to test
+    assert get_date_slice(dates, start_date, end_date) == expected
+
+
+def test_build_vote_cube():
+    df = pl.DataFrame(
+        {
+            "Bezeichnung": ["A", "B", "A", "B", "C", "A"],
+            "Fraktion/Gruppe": ["X", "Y", "X", "Y", "Y", "X"],
+            "vote": ["ja", "nein", "nein", "nein", "ja", "Enthaltung"],
+            "date": [
+                datetime.date(2021, 1, 1),
+                datetime.date(2021, 1, 1),
+                datetime.date(2020, 1, 1),
+                datetime.date(2020, 1, 1),
+                datetime.date(2020, 1, 1),
+                datetime.date(2022, 1, 1),
+            ],
+            "title": ["b", "b", "a", "a", "a", "c"],
+        }
+    )
+
+    # line to test
+    cube = build_vote_cube(df)
+
+    assert cube.votes["date"].is_sorted()
+    assert cube.party_votes["date"].is_sorted()
+    assert set(cube.mdb_index.offsets) == {"A", "B", "C"}
+
+    start, end = datetime.date(2020, 6, 1), datetime.date(2022, 1, 1)
+    in_range = pl.col("date").is_between(start, end)
+    assert cube.get_votes(start, end).height == df.filter(in_range).height
+    assert cube.get_party_votes(start, end).height == 3
+
+    mdb_votes = cube.get_mdb_votes("A", start, end)
+    expected = prepare_votes_of_mdb(df.filter(in_range), "A").sort("date")
+    assert mdb_votes.select(transform_bs.VOTE_COLS).equals(
+        expected.select(transform_bs.VOTE_COLS).cast(pl.UInt8)
+    )
+    assert cube.get_mdb_votes("A", None, None).height == 3
+
+    with pytest.raises(ValueError):
+        cube.get_mdb_votes("wup", None, None)
+
+
+def test_mdb_index(df: pl.DataFrame):
+    # line to test
+    index = build_mdb_index(df)
+
+    assert set(index.offsets) == set(df["Bezeichnung"])
+    for mdb in ["A", "D"]:
+        expected = prepare_votes_of_mdb(df, mdb)
+        actual = index.get(mdb)
+        assert actual.select(transform_bs.VOTE_COLS).equals(
+            expected.select(transform_bs.VOTE_COLS).cast(pl.UInt8)
+        )
+
+    batch = index.get_many(["D", "A"])
+    assert batch["Bezeichnung"].to_list() == ["D", "A"]
+    assert index.get_many([]).height == 0
+
+    with pytest.raises(ValueError):
+        index.get("wup")
+    with pytest.raises(ValueError):
+        index.get_many(["A", "wup"])
+
+
+def test_mdb_index_matches_prepare_votes_of_mdb():
+    df = pl.DataFrame(
+        {
+            "Fraktion/Gruppe": ["A", "B", "A", "A", "B"],
+            "vote": ["nein", "ja", "ja", "nichtabgegeben", "ja"],
+            "date": [
+                "2022-02-02",
+                "2021-01-01",
+                "2020-01-01",
+                "2023-03-03",
+                "2020-05-05",
+            ],
+            "title": ["bla", "blub", "blub", "bla", "blub"],
+            "Bezeichnung": ["A", "B", "A", "A", "C"],
+        }
+    )
+
+    # line to test
+    index = build_mdb_index(df)
+
+    for mdb in ["A", "B", "C"]:
+        actual = index.get(mdb)
+        expected = prepare_votes_of_mdb(df, mdb)
+        assert actual.columns == [
+            "Fraktion/Gruppe",
+            *transform_bs.VOTE_COLS,
+            "date",
+            "title",
+            "Bezeichnung",
+        ]
+        assert actual.equals(
+            expected.select(actual.columns).with_columns(
+                pl.col(transform_bs.VOTE_COLS).cast(pl.UInt8)
+            )
+        )
+
+
+def test_mdb_index_unknown_vote():
+    df = pl.DataFrame(
+        {"vote": ["ja", "wup"], "date": ["2022-02-02"] * 2, "Bezeichnung": ["A", "A"]}
+    )
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        prepare_votes_of_mdb(df, "A")
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        build_mdb_index(df)
+
+
+def test_get_mdb_party_similarity(df: pl.DataFrame):
+    # line to test
+    res = get_mdb_party_similarity(df)
+
+    assert res.height == df["Bezeichnung"].n_unique() * 2
+    pivoted = pivot_party_votes_df(get_votes_by_party(df))
+    for mdb in ["A", "E"]:
+        expected = (
+            align_mdb_with_parties(prepare_votes_of_mdb(df, mdb), pivoted)
+            .pipe(compute_similarity, suffix="_party")
+            .group_by("Fraktion/Gruppe_party")
+            .agg(pl.col("similarity").mean())
+            .sort("Fraktion/Gruppe_party")
+        )
+        actual = res.filter(pl.col("Bezeichnung") == mdb).sort("Fraktion/Gruppe_party")
+        assert np.allclose(actual["similarity"], expected["similarity"])
+        assert actual["# polls"].to_list() == [1, 1]
+
+
+@pytest.fixture(scope="module")
+def per_poll_similarity() -> pl.DataFrame:
+    rng = np.random.default_rng(42)
+    n = 40
+    dates = sorted(
+        datetime.date(2020, 1, 1) + datetime.timedelta(days=int(d))
+        for d in rng.integers(0, 400, n)
+    )
+    return pl.DataFrame(
+        {
+            "date": dates * 2,
+            "title": [f"poll {i}" for i in range(n)] * 2,
+            "Fraktion/Gruppe_b": ["B"] * n + ["C"] * n,
+            "similarity": rng.uniform(0, 1, 2 * n),
+        }
+    )
+
+
+def test_get_rolling_similarity(per_poll_similarity: pl.DataFrame):
+    # line to test
+    res = get_rolling_similarity(per_poll_similarity, "Fraktion/Gruppe_b", n_polls=3)
+
+    b = per_poll_similarity.filter(pl.col("Fraktion/Gruppe_b") == "B")
+    res_b = res.filter(pl.col("Fraktion/Gruppe_b") == "B")
+    assert res_b["similarity"][4] == pytest.approx(b["similarity"][2:5].mean())
+    assert res_b["# polls"].to_list()[:4] == [1, 2, 3, 3]
+
+    # line to test
+    res = get_rolling_similarity(per_poll_similarity, "Fraktion/Gruppe_b", period="30d")
+
+    last = res.filter(pl.col("Fraktion/Gruppe_b") == "C").row(-1, named=True)
+    in_window = per_poll_similarity.filter(
+        (pl.col("Fraktion/Gruppe_b") == "C")
+        & (pl.col("date") > last["date"] - datetime.timedelta(days=30))
+    )
+    assert last["similarity"] == pytest.approx(in_window["similarity"].mean())
+    assert last["# polls"] == in_window.height
+
+    with pytest.raises(ValueError):
+        get_rolling_similarity(per_poll_similarity, "Fraktion/Gruppe_b")
+
+
+@pytest.mark.parametrize("kwargs", [{"n_polls": 5}, {"period": "60d"}])
+@pytest.mark.parametrize("as_string", [False, True])
+def test_update_rolling_similarity(
+    per_poll_similarity: pl.DataFrame, kwargs: dict, as_string: bool
+):
+    df = per_poll_similarity
+    if as_string:
+        df = df.with_columns(pl.col("date").dt.to_string("%Y-%m-%d"))
+    cutoff = df.sort("date")["date"][25]
+    df_history = df.filter(pl.col("date") < cutoff)
+    df_new = df.filter(pl.col("date") >= cutoff)
+
+    # line to test
+    res = update_rolling_similarity(df_history, df_new, "Fraktion/Gruppe_b", **kwargs)
+
+    full = get_rolling_similarity(df, "Fraktion/Gruppe_b", **kwargs)
+    key = ["Fraktion/Gruppe_b", "title"]
+    expected = full.join(df_new.select(key), on=key, how="semi").sort(key)
+    res = res.sort(key)
+    assert res.drop("similarity").equals(expected.drop("similarity"))
+    assert np.allclose(res["similarity"], expected["similarity"])
+
+    with pytest.raises(ValueError):
+        update_rolling_similarity(df_new, df_history, "Fraktion/Gruppe_b", **kwargs)
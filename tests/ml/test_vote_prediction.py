@@ -1,19 +1,28 @@
+import warnings
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import polars as pl
 import pytest
 from fastai.tabular.all import (
     TabularLearner,
 )
+from plotnine import scale_color_manual
 from sklearn import decomposition
 
 from bundestag.ml.vote_prediction import (
     get_embeddings,
     get_poll_proponents,
+    get_prediction_schema,
+    kfold_splitter,
+    load_learner,
     plot_politician_embeddings,
     plot_poll_embeddings,
     plot_predictions,
     poll_splitter,
-    scale_color_manual,
+    predict_votes,
+    predict_votes_parquet,
 )
 
 
@@ -24,7 +33,7 @@ def test_plot_predictions_smoke(
     df_mandates: pl.DataFrame,
     df_polls: pl.DataFrame,
     y_col: str,
-    splits: tuple[list[int], list[int]],
+    splits: tuple[np.ndarray, np.ndarray],
 ):
     """Smoke test for plot_predictions.
 
@@ -169,9 +178,66 @@ def test_poll_splitter(seed: int, shuffle: bool):
     assert len(splits0) == 2
 
     if not shuffle and seed == 42:
-        assert splits0 == splits1
+        for ix0, ix1 in zip(splits0, splits1, strict=True):
+            np.testing.assert_array_equal(ix0, ix1)
     else:
-        assert splits0 != splits1
+        assert not all(
+            np.array_equal(ix0, ix1) for ix0, ix1 in zip(splits0, splits1, strict=True)
+        )
+
+
+def test_poll_splitter_groups():
+    df = pl.DataFrame({"poll_id": np.repeat(np.arange(10), 3)})
+
+    # line to test
+    ix_train, ix_valid = poll_splitter(df, valid_pct=0.2, seed=1)
+
+    assert ix_train.dtype == np.int64
+    np.testing.assert_array_equal(
+        np.sort(np.concatenate([ix_train, ix_valid])), np.arange(30)
+    )
+    polls_train = set(df["poll_id"].gather(ix_train).to_list())
+    polls_valid = set(df["poll_id"].gather(ix_valid).to_list())
+    assert len(polls_valid) == 2
+    assert polls_train.isdisjoint(polls_valid)
+
+
+@pytest.mark.parametrize("group_col", ["poll_id", None])
+@pytest.mark.parametrize("shuffle", [True, False])
+def test_kfold_splitter(group_col: str | None, shuffle: bool):
+    df = pl.DataFrame({"poll_id": np.repeat(np.arange(7), 2)})
+
+    # line to test
+    folds = list(
+        kfold_splitter(df, n_splits=3, group_col=group_col, shuffle=shuffle, seed=0)
+    )
+
+    assert len(folds) == 3
+    valid = np.concatenate([ix_valid for _, ix_valid in folds])
+    np.testing.assert_array_equal(np.sort(valid), np.arange(df.height))
+    for ix_train, ix_valid in folds:
+        assert len(np.intersect1d(ix_train, ix_valid)) == 0
+        assert len(ix_train) + len(ix_valid) == df.height
+        if group_col is not None:
+            polls_train = set(df["poll_id"].gather(ix_train).to_list())
+            polls_valid = set(df["poll_id"].gather(ix_valid).to_list())
+            assert polls_train.isdisjoint(polls_valid)
+
+
+def test_kfold_splitter_too_few_groups():
+    df = pl.DataFrame({"poll_id": [1, 1, 2]})
+    with pytest.raises(ValueError):
+        list(kfold_splitter(df, n_splits=3))
+
+
+@pytest.mark.parametrize("group_col", ["poll_id", None])
+@pytest.mark.parametrize("n_splits", [0, 1, 4])
+def test_kfold_splitter_invalid_n_splits(group_col: str | None, n_splits: int):
+    df = pl.DataFrame({"poll_id": [1, 1, 2]})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with pytest.raises(ValueError):
+            list(kfold_splitter(df, n_splits=n_splits, group_col=group_col))
 
 
 @pytest.mark.parametrize("transform", [None, "pca"])
@@ -208,3 +274,54 @@ def test_get_poll_proponents(df_all_votes: pl.DataFrame, df_mandates: pl.DataFra
     assert proponents["total"].min() >= 0
     assert proponents["yesses"].min() >= 0
     assert (proponents["yesses"] <= proponents["total"]).all()
+
+
+@pytest.mark.parametrize("keep_cols", [None, ["poll_id"]])
+def test_predict_votes_parquet(
+    exported_learner: Path, tmp_path: Path, keep_cols: list[str] | None
+):
+    learn = load_learner(exported_learner, n_threads=1)
+    df = pl.DataFrame(
+        {"politician name": ["a", "b", "c", "d"] * 10, "poll_id": list(range(40))}
+    )
+    input_file = tmp_path / "votes.parquet"
+    df.write_parquet(input_file)
+    output_file = tmp_path / "out" / "predictions.parquet"
+
+    # line to test
+    n = predict_votes_parquet(
+        learn, input_file, output_file, chunk_size=7, batch_size=4, keep_cols=keep_cols
+    )
+
+    assert n == df.height
+    res = pl.read_parquet(output_file)
+    prob_cols = [f"vote_prob_{v}" for v in learn.dls.vocab]
+    assert res.columns == (keep_cols or df.columns) + ["vote_pred"] + prob_cols
+    np.testing.assert_allclose(res.select(prob_cols).sum_horizontal(), 1.0, rtol=1e-5)
+    # chunking does not change the predictions
+    expected = predict_votes(learn, df)
+    np.testing.assert_allclose(
+        res.select(prob_cols).to_numpy(), expected.select(prob_cols).to_numpy()
+    )
+    assert res["vote_pred"].to_list() == expected["vote_pred"].to_list()
+
+
+def test_predict_votes_parquet_empty(exported_learner: Path, tmp_path: Path):
+    learn = load_learner(exported_learner, n_threads=1)
+    df = pl.DataFrame(
+        {"politician name": ["a"], "poll_id": [1]},
+        schema_overrides={"poll_id": pl.Int32},
+    ).clear()
+    input_file = tmp_path / "votes.parquet"
+    df.write_parquet(input_file)
+    output_file = tmp_path / "predictions.parquet"
+
+    # line to test
+    n = predict_votes_parquet(learn, input_file, output_file)
+
+    assert n == 0
+    res = pl.read_parquet(output_file)
+    assert res.height == 0
+    assert res.schema == pl.Schema(
+        {**df.schema, **get_prediction_schema(learn, y_col="vote")}
+    )
@@ -3,7 +3,8 @@ import datetime
 import polars as pl
 import pytest
 
-from bundestag.gui import MdBGUI, PartyGUI
+from bundestag.gui import LRUCache, MdBGUI, PartyGUI
+from bundestag.ml import render
 
 
 @pytest.fixture(autouse=True)
@@ -26,7 +27,7 @@ def use_matplotlib_agg():
 
 
 def test_init_and_filter():
-    # Build synthetic sheet-like data so get_votes_by_party can run normally.
+    # Build synthetic sheet-like data so get_pivoted_votes_by_party can run normally.
     # We create two voters in the same poll (same date/title) with complementary votes.
     df = pl.DataFrame(
         {
@@ -39,7 +40,7 @@ def test_init_and_filter():
         }
     )
 
-    # No mocking here: allow get_votes_by_party to compute fractions from the synthetic data
+    # No mocking here: allow get_pivoted_votes_by_party to compute fractions from the synthetic data
     gui = MdBGUI(df)
 
     # name widget must contain MdB names
@@ -51,8 +52,10 @@ def test_init_and_filter():
     df_filtered, party_filtered = gui.filter_dfs(start, end)
     # two voters in the same poll -> original df filtered has 2 rows
     assert df_filtered.height == 2
-    # get_votes_by_party will produce one row per vote outcome (ja/nein) for the party
-    assert party_filtered.height == 2
+    # party votes are in the wide layout: one row per party and poll
+    assert party_filtered.height == 1
+    assert party_filtered["ja"].item() == pytest.approx(0.5)
+    assert party_filtered["# votes"].item() == 2
 
 
 def test_mdb_on_click_triggers_plot(monkeypatch):
@@ -113,3 +116,85 @@ def test_party_on_click_triggers_plot(monkeypatch):
     gui.on_click(None)
 
     assert "Selected: Party = A" in gui.selection_widget.value
+
+
+@pytest.mark.parametrize(
+    "gui_class,name,party_col",
+    [(MdBGUI, "Alice", "Fraktion/Gruppe_party"), (PartyGUI, "A", "Fraktion/Gruppe_b")],
+)
+def test_on_click_draws_render_job(
+    monkeypatch: pytest.MonkeyPatch, gui_class, name: str, party_col: str
+):
+    df = pl.DataFrame(
+        {
+            "Bezeichnung": ["Alice", "Bob", "Carol"],
+            "Fraktion/Gruppe": ["A", "A", "B"],
+            "date": [datetime.date(2020, 1, 1)] * 3,
+            "title": ["Poll X"] * 3,
+            "vote": ["ja", "nein", "ja"],
+        }
+    )
+    jobs = []
+    draw = render.draw_similarity_figure
+    monkeypatch.setattr(
+        "bundestag.ml.render.draw_similarity_figure",
+        lambda job: jobs.append(job) or draw(job),
+    )
+    gui = gui_class(df)
+    gui.name_widget.value = name
+
+    # line to test
+    gui.on_click(None)
+
+    assert len(jobs) == 1
+    assert jobs[0].name == name
+    assert jobs[0].party_col == party_col
+    assert "count" in jobs[0].overall.columns
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    a, b, c = (pl.DataFrame({"x": [i]}) for i in range(3))
+
+    assert cache.get_or_compute("a", lambda: a) is a
+    assert cache.get_or_compute("b", lambda: b) is b
+    # hit, makes "a" the most recently used
+    assert cache.get_or_compute("a", lambda: c) is a
+    # evicts "b"
+    cache.get_or_compute("c", lambda: c)
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.get_or_compute("b", lambda: c) is c
+    assert (cache.hits, cache.misses) == (1, 4)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+@pytest.mark.parametrize("gui_class,name", [(MdBGUI, "Alice"), (PartyGUI, "A")])
+def test_get_similarity_is_cached(gui_class, name: str):
+    df = pl.DataFrame(
+        {
+            "Bezeichnung": ["Alice", "Bob", "Carol"],
+            "Fraktion/Gruppe": ["A", "A", "B"],
+            "date": [datetime.date(2020, 1, 1)] * 3,
+            "title": ["Poll X"] * 3,
+            "vote": ["ja", "nein", "ja"],
+        }
+    )
+    gui = gui_class(df, cache_size=4)
+    start, end = datetime.date(2020, 1, 1), datetime.date(2020, 1, 1)
+
+    first = gui.get_similarity(name, start, end)
+    second = gui.get_similarity(name, start, end)
+
+    assert "similarity" in first.columns
+    assert second is first
+    assert (gui.cache.hits, gui.cache.misses) == (1, 1)
+
+    # a single missing date means no date filter, same as filter_dfs
+    gui.get_similarity(name, None, end)
+    gui.get_similarity(name, start, None)
+    assert (gui.cache.hits, gui.cache.misses) == (2, 2)
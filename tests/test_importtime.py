@@ -0,0 +1,60 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = [
+    "fastai",
+    "gensim",
+    "matplotlib.pyplot",
+    "plotnine",
+    "seaborn",
+    "sklearn",
+    "spacy",
+    "torch",
+]
+
+
+def get_imported_modules(module: str) -> dict[str, int]:
+    """Imports `module` in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        dict[str, int]: The imported modules and their cumulative import time in microseconds.
+    """
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imported[name.strip()] = int(cumulative)
+    return imported
+
+
+@pytest.mark.parametrize(
+    "module,heavy_modules",
+    [
+        ("bundestag.cli.__main__", HEAVY_MODULES + ["scipy"]),
+        ("bundestag.gui", HEAVY_MODULES),
+        ("bundestag.ml.embeddings", HEAVY_MODULES + ["scipy"]),
+        ("bundestag.ml.mdb_similarity", HEAVY_MODULES + ["scipy"]),
+        ("bundestag.ml.poll_clustering", HEAVY_MODULES),
+        ("bundestag.ml.render", HEAVY_MODULES),
+        ("bundestag.ml.similarity", HEAVY_MODULES + ["scipy"]),
+        ("bundestag.ml.vote_prediction", HEAVY_MODULES),
+    ],
+)
+def test_heavy_modules_are_imported_lazily(module: str, heavy_modules: list[str]):
+    # line to test
+    imported = get_imported_modules(module)
+
+    assert module in imported
+    seconds = imported[module] / 1e6
+    eager = [m for m in heavy_modules if m in imported]
+    assert eager == [], f"{module} ({seconds:.2f}s) eagerly imports {eager}"